@@ -21,7 +21,7 @@ import queue
 import threading
 import requests
 from io import BytesIO
-from os import path, system
+from os import path, system, makedirs, listdir, remove, utime
 import time
 import subprocess
 from datetime import timedelta
@@ -34,12 +34,27 @@ import freetype
 import asyncio
 from aiohttp import ClientSession, ClientTimeout, ClientConnectorError
 from unidecode import unidecode
+from collections import OrderedDict
+import hashlib
 
 #print("Main thread:", threading.current_thread())
 
 class Coverplayer:
     _instance = None
     _queue = queue.Queue()
+    _cover_cache = OrderedDict() # covers already scaled to the display size (key: url), most recently used last
+    _cover_cache_size = 12 # max covers in memory (720x720 RGB = 1.5MB each)
+    _cover_cache_dir = None # folder of the disk cache, None: memory only
+    _cover_cache_disk_size = 50 * 1024 * 1024 # max bytes of the disk cache, least recently used covers are removed first
+    _cover_cache_lock = threading.Lock()
+    _cover_prefetching = set() # urls which are downloaded by the prefetcher
+    _paused_layer = None # (maxpx, icon_path, layer)
+    _text_layers = OrderedDict() # rendered text overlays (key: text lines, maxpx), most recently used last
+    _text_layers_size = 8
+    _glyph_fonts = {} # font of each codepoint: latin, cjk, emoji or None (no glyph in any font)
+    _text_sizes = OrderedDict() # measured text sizes (key: font, text), most recently used last
+    _text_sizes_size = 1024
+    _measure_draw = None
 
     def flexprint(self, str, objStr = None):
         if self.log is True:
@@ -65,9 +80,9 @@ class Coverplayer:
         cls._queue.put(('set_keyboard_codes', keyb_list, alternative_layout, None, None, None, None, None, None, None, None, None, None, None, None, None))
 
     @classmethod
-    def config(cls, lang, webserver_url_request_timeout, display_auto_wakeup):
+    def config(cls, lang, webserver_url_request_timeout, display_auto_wakeup, cover_cache_dir = None):
         cls._ensure_running()
-        cls._queue.put(('config', lang, webserver_url_request_timeout, display_auto_wakeup, None, None, None, None, None, None, None, None, None, None, None, None))
+        cls._queue.put(('config', lang, webserver_url_request_timeout, display_auto_wakeup, cover_cache_dir, None, None, None, None, None, None, None, None, None, None, None))
 
     @classmethod
     def disable_spotify(cls, disabled):
@@ -104,6 +119,30 @@ class Coverplayer:
         cls._ensure_running()
         cls._queue.put(('setZones', None, None, None, None, None, None, None, None, None, text, buttons or [], zone_callback, None, None, None))
 
+    @classmethod
+    def prefetch(cls, urls, maxpx = 720, timeout = 8):
+        # download and scale the covers of the next tracks in the background, the track change is a cover cache hit then
+        with cls._cover_cache_lock:
+            urls = [url for url in urls if url and url.startswith('http') and url not in cls._cover_cache and url not in cls._cover_prefetching]
+            cls._cover_prefetching.update(urls)
+        if len(urls) > 0:
+            threading.Thread(target = cls._prefetch_covers, args = (urls, maxpx, timeout), daemon = True).start()
+
+    @classmethod
+    def _prefetch_covers(cls, urls, maxpx, timeout):
+        for url in urls:
+            try:
+                if cls._get_cached_cover(url, maxpx) is None: # not on disk
+                    response = requests.get(url, timeout = timeout)
+                    response.raise_for_status()
+                    cls._set_cached_cover(url, cls._scale_cover(Image.open(BytesIO(response.content)), maxpx))
+                    if cls._instance is not None: cls._instance.flexprint('cover prefetched: ' + url)
+            except Exception as e:
+                if cls._instance is not None and cls._instance.errorlog is True: cls._instance.flexprint('[red]cover prefetch error: ' + str(e) + '[/red]')
+            finally:
+                with cls._cover_cache_lock:
+                    cls._cover_prefetching.discard(url)
+
     @classmethod
     def _ensure_running(cls):
         if cls._instance is None:
@@ -112,8 +151,36 @@ class Coverplayer:
             threading.Thread(target = cls._instance._gui_loop, daemon = True).start()
 
     @classmethod
-    def _wrap_text(cls, text, font, max_width):
-        """wraps text if its too long."""
+    def _font_key_for_char(cls, ch, faces):
+        codepoint = ord(ch)
+        key = cls._glyph_fonts.get(codepoint, False)
+        if key is False:
+            key = None
+            for font_key in ["latin", "cjk", "emoji"]:
+                if faces[font_key].get_char_index(codepoint) != 0:  # Glyph exist
+                    key = font_key
+                    break
+            cls._glyph_fonts[codepoint] = key
+        return key
+
+    @classmethod
+    def _text_size(cls, font, text):
+        key = (font, text)
+        size = cls._text_sizes.get(key)
+        if size is None:
+            if cls._measure_draw is None:
+                cls._measure_draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+            size = cls._measure_draw.textsize(text, font)
+            cls._text_sizes[key] = size
+            while len(cls._text_sizes) > cls._text_sizes_size:
+                cls._text_sizes.popitem(last = False)
+        else:
+            cls._text_sizes.move_to_end(key)
+        return size
+
+    @classmethod
+    def _wrap_text(cls, text, measure, max_width):
+        """wraps text if its too long, measure returns the width of a line."""
         lines = []
         
         try:
@@ -122,7 +189,7 @@ class Coverplayer:
 
             for word in words:
                 test_line = current_line + " " + word if current_line else word
-                test_width, _ = ImageDraw.Draw(Image.new('RGB', (1, 1))).textsize(test_line, font)
+                test_width = measure(test_line)
 
                 if test_width <= max_width:
                     current_line = test_line
@@ -134,25 +201,110 @@ class Coverplayer:
             if current_line:
                 lines.append(current_line)
         except Exception as e:
-            if cls.errorlog is True: cls.flexprint('[red]wrap text error: ' + str(e) + '[/red]')
+            if cls._instance is not None and cls._instance.errorlog is True: cls._instance.flexprint('[red]wrap text error: ' + str(e) + '[/red]')
         return lines
 
     @classmethod
-    def _load_image(cls, obj, errorlog, debug, log, lang, flexprint, maxpx, paused, icon_path, fonts, faces, font_size, webserver_url_request_timeout, path_or_url = None, text = None):
-        font = fonts["latin"]
+    def _set_cover_cache_dir(cls, cache_dir):
+        try:
+            if cache_dir is not None:
+                makedirs(cache_dir, exist_ok = True)
+            cls._cover_cache_dir = cache_dir
+        except Exception as e:
+            cls._cover_cache_dir = None
+            if cls._instance is not None and cls._instance.errorlog is True: cls._instance.flexprint('[red]set cover cache dir error: ' + str(e) + '[/red]')
 
-        def get_font_for_char(ch):
-            try:
-                font_order = ["latin", "cjk", "emoji"]
-                codepoint = ord(ch)
+    @classmethod
+    def _cover_cache_file(cls, key):
+        return path.join(cls._cover_cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.jpg')
 
-                for key in font_order:
-                    face = faces[key]
-                    if face.get_char_index(codepoint) != 0:  # Glyph exist
-                        return fonts[key]
-            except Exception as e:
-                if errorlog is True: flexprint('[red]get font for char error: ' + str(e) + '[/red]')
-            return fonts["latin"]
+    @classmethod
+    def _get_cached_cover(cls, key, maxpx):
+        # scaled cover from memory or disk cache, None if not cached
+        with cls._cover_cache_lock:
+            img = cls._cover_cache.get(key)
+            if img is not None:
+                cls._cover_cache.move_to_end(key)
+                return img
+        if cls._cover_cache_dir is None:
+            return None
+        try:
+            filename = cls._cover_cache_file(key)
+            if not path.isfile(filename):
+                return None
+            img = Image.open(filename)
+            img.load()
+            if img.size != (maxpx, maxpx):
+                return None
+            utime(filename) # mark as recently used
+        except Exception:
+            return None
+        cls._remember_cover(key, img)
+        return img
+
+    @classmethod
+    def _remember_cover(cls, key, img):
+        with cls._cover_cache_lock:
+            cls._cover_cache[key] = img
+            cls._cover_cache.move_to_end(key)
+            while len(cls._cover_cache) > cls._cover_cache_size:
+                cls._cover_cache.popitem(last = False)
+
+    @classmethod
+    def _set_cached_cover(cls, key, img):
+        cls._remember_cover(key, img)
+        if cls._cover_cache_dir is None:
+            return
+        try:
+            filename = cls._cover_cache_file(key)
+            img.save(filename, 'JPEG', quality = 92)
+            files = [path.join(cls._cover_cache_dir, name) for name in listdir(cls._cover_cache_dir) if name.endswith('.jpg')]
+            files = sorted(((path.getmtime(file), path.getsize(file), file) for file in files if file != filename), reverse = True)
+            total = path.getsize(filename)
+            for mtime, size, file in files:
+                total += size
+                if total > cls._cover_cache_disk_size:
+                    remove(file)
+        except Exception as e:
+            if cls._instance is not None and cls._instance.errorlog is True: cls._instance.flexprint('[red]cover cache error: ' + str(e) + '[/red]')
+
+    @classmethod
+    def _scale_cover(cls, img, maxpx):
+        # the size of the display, cached and used for all overlays (paused icon, text)
+        img = img.convert("RGB")
+        if img.size != (maxpx, maxpx):
+            img = img.resize((maxpx, maxpx), Image.ANTIALIAS)
+        return img
+
+    @classmethod
+    def _get_paused_layer(cls, maxpx, icon_path):
+        # white veil (alpha 160) with the play icon in the middle
+        if cls._paused_layer is None or cls._paused_layer[0] != maxpx or cls._paused_layer[1] != icon_path:
+            layer = Image.new("RGBA", (maxpx, maxpx), (255, 255, 255, 160))
+            size = round(maxpx / 5)
+            icon_img = Image.open(icon_path).convert("RGBA")
+            icon_img = icon_img.resize((size, size), Image.ANTIALIAS)
+            pos = round((maxpx - size) / 2)
+            layer.alpha_composite(icon_img, (pos, pos))
+            cls._paused_layer = (maxpx, icon_path, layer)
+        return cls._paused_layer[2]
+
+    @classmethod
+    def _get_text_layer(cls, text, maxpx, build):
+        key = (text, maxpx)
+        layer = cls._text_layers.get(key)
+        if layer is None:
+            layer = build()
+            cls._text_layers[key] = layer
+            while len(cls._text_layers) > cls._text_layers_size:
+                cls._text_layers.popitem(last = False)
+        else:
+            cls._text_layers.move_to_end(key)
+        return layer
+
+    @classmethod
+    def _load_image(cls, obj, errorlog, debug, log, lang, flexprint, maxpx, paused, icon_path, fonts, faces, font_size, webserver_url_request_timeout, path_or_url = None, text = None):
+        emoji_scale = font_size / 109 # the emoji font has bitmaps of size 109 only, scaled to the text size
 
         def convert_special_chars(str):
             try:
@@ -160,38 +312,48 @@ class Coverplayer:
             except Exception as e:
                 if errorlog is True: flexprint('[red]convert special chars error: ' + str(e) + '[/red]')
 
-        def get_right_font(text):
-            count_latin = 0
-            count_cjk = 0
-            count_emoji = 0
-            notfound = 0
-            notfound_flag = False
-            try:
-                for ch in text:
-                    found = False
-                    font = get_font_for_char(ch)
-                    if font == fonts["latin"]:
-                        count_latin += 1
-                        found = True
-                    if font == fonts["cjk"]:
-                        count_cjk += 1
-                        found = True
-                    if font == fonts["emoji"]:
-                        count_emoji += 1
-                        found = True
-                    if found == False:
-                        notfound += 1                    
-                    
-                if debug is True: flexprint('latin: ' + str(count_latin) + ', cjk: ' + str(count_cjk) + ', emoji: ' + str(count_emoji) + ', notfound: ' + str(notfound) + ' ('+text+')')
-                if notfound >= count_latin and notfound >= count_cjk and notfound >= count_emoji:
-                    notfound_flag = True
-                if count_cjk >= count_latin and count_cjk >= count_emoji and count_cjk >= notfound:
-                    return [fonts["cjk"], notfound_flag]
-                if count_emoji >= count_latin and count_emoji >= count_cjk and count_emoji >= notfound:
-                    return [fonts["emoji"], notfound_flag]
-            except Exception as e:
-                if errorlog is True: flexprint('[red]get right font error: ' + str(e) + '[/red]')
-            return [fonts["latin"], notfound_flag]
+        def has_missing_glyphs(text):
+            # true if most chars have no glyph in any font (the text is converted to ascii then)
+            chars = [ch for ch in text if not ch.isspace()]
+            missing = sum(1 for ch in chars if cls._font_key_for_char(ch, faces) is None)
+            return missing > 0 and missing * 2 >= len(chars)
+
+        def get_runs(line):
+            # split line into runs of chars with the same font (chars without glyph are drawn with the latin font)
+            runs = []
+            for ch in line:
+                key = cls._font_key_for_char(ch, faces) or "latin"
+                if len(runs) > 0 and runs[-1][0] == key:
+                    runs[-1][1] += ch
+                else:
+                    runs.append([key, ch])
+            return runs
+
+        def get_run_size(key, run):
+            width, height = cls._text_size(fonts[key], run)
+            if key == "emoji":
+                return round(width * emoji_scale), round(height * emoji_scale)
+            return width, height
+
+        def get_line_size(line):
+            width = 0
+            height = 0
+            for key, run in get_runs(line):
+                run_width, run_height = get_run_size(key, run)
+                width += run_width
+                height = max(height, run_height)
+            return width, height
+
+        def draw_line(overlay, overlay_draw, x, y, line):
+            for key, run in get_runs(line):
+                width, height = get_run_size(key, run)
+                if key == "emoji":
+                    run_img = Image.new("RGBA", cls._text_size(fonts[key], run), (0, 0, 0, 0))
+                    ImageDraw.Draw(run_img).text((0, 0), run, font = fonts[key], embedded_color = True)
+                    overlay.alpha_composite(run_img.resize((max(width, 1), max(height, 1)), Image.ANTIALIAS), (x, y))
+                else:
+                    overlay_draw.text((x, y), run, font = fonts[key], fill = "white")
+                x += width
 
         async def fetch_url(session, reqobj):
             # Helper function to fetch a single URL asynchronously
@@ -267,101 +429,65 @@ class Coverplayer:
             else:
                 draw.rectangle([x2 - radius, y2 - radius, x2, y2], fill=fill)
         
+        def build_text_overlay():
+            overlay = Image.new("RGBA", (maxpx, maxpx), (0, 0, 0, 0))
+            overlay_draw = ImageDraw.Draw(overlay)
+
+            line_space = 5
+
+            max_width = maxpx - 40  # max width of text
+            max_width_found = 0
+            max_height_found = 0
+
+            lines = []
+            for text_part in text:
+                if has_missing_glyphs(text_part):
+                    text_part = convert_special_chars(text_part)
+                lines += cls._wrap_text(text_part, lambda line: get_line_size(line)[0], max_width)
+            lines_all_items = len(lines)	# number of text lines
+            for line in lines:
+                text_width, text_height = get_line_size(line)
+                if text_width > max_width_found:
+                    max_width_found = text_width
+                if text_height > max_height_found:
+                    max_height_found = text_height
+            
+            border_space = 20
+            text_x = border_space
+            text_y = maxpx - border_space - lines_all_items * (max_height_found + line_space) + 4
+        
+            background = (0, 0, 0, 255)  # RGB + Alpha (0-255)
+            linecount = 0
+        
+            for line in lines:
+                linecount += 1
+                try:
+                    if linecount == 1:
+                       rounded_rectangle_corners(overlay_draw, [text_x - 5, text_y - line_space, text_x + max_width_found + 5, text_y + max_height_found + line_space], radius=8, fill=background, top_left=True, top_right=True, bottom_left=False, bottom_right=False)
+                    elif linecount == lines_all_items:
+                        rounded_rectangle_corners(overlay_draw, [text_x - 5, text_y - line_space, text_x + max_width_found + 5, text_y + max_height_found + line_space], radius=8, fill=background, top_left=False, top_right=False, bottom_left=True, bottom_right=True)
+                    else:
+                        overlay_draw.rectangle([text_x - 5, text_y - line_space, text_x + max_width_found + 5, text_y + max_height_found + line_space], fill = background)
+                except Exception as e:
+                    if errorlog is True: flexprint('draw.rectangle error: ' + str(e))
+                draw_line(overlay, overlay_draw, text_x, text_y, line)
+                text_y += max_height_found + line_space  # line spacing
+
+            # set alpha-channel of overlay
+            opacity = 170  # 0 = completely transparent, 255 = opaque
+            r, g, b, a = overlay.split()
+            a = a.point(lambda v: int(v * (opacity / 255)))
+            return Image.merge("RGBA", (r, g, b, a))
+
         def prepare_image(img):
+            # layers: scaled cover (cover cache), paused layer (white veil with play icon) and text overlay, only changed layers are rendered
             try:
-                img = img.resize((maxpx, maxpx), Image.ANTIALIAS)
-            
-                if paused is True:
-                    canvas = Image.new("RGB", (maxpx,maxpx))
-                    mask   = Image.new('L',   (maxpx,maxpx))
-                    canvasDraw = ImageDraw.Draw(canvas)
-                    maskDraw   = ImageDraw.Draw(mask)
-                    canvasDraw.rectangle((0,0,maxpx - 1,maxpx - 1), 'white')
-                    maskDraw.rectangle((0,0,maxpx - 1,maxpx - 1), 160)
-                    img.paste(canvas, mask)
-                    size = round(maxpx / 5)
-                    icon_img = Image.open(icon_path)
-                    icon_img = icon_img.resize((size, size), Image.ANTIALIAS)
-                    pos = round((maxpx - size) / 2)
-                    img.paste(icon_img, (pos, pos), mask = icon_img)
-                
                 img = img.convert("RGBA") # convert img to RGBA mode
-                draw = ImageDraw.Draw(img)
-
-                overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-
+                if paused is True:
+                    img = Image.alpha_composite(img, cls._get_paused_layer(maxpx, icon_path))
                 if text:
-                    line_space = 5
+                    img = Image.alpha_composite(img, cls._get_text_layer(tuple(text), maxpx, build_text_overlay))
 
-                    max_width = img.width - 40  # max width of text
-                    lines_all_items = 0
-                    max_width_found = 0
-                    max_height_found = 0
-                
-                    for text_part in text:
-                        sep = text_part.split(':')
-                        props = get_right_font(sep[1].strip() if len(sep) > 1 else text_part)
-                        font = props[0]
-                        notfound = props[1]
-                        if notfound is True:
-                            text_part = convert_special_chars(text_part)                
-                        lines = cls._wrap_text(text_part, font, max_width)
-                        lines_all_items += len(lines)	# number of text lines
-                        for line in lines:
-                            text_width, text_height = draw.textsize(line, font = font)
-                            if text_width > max_width_found:
-                                max_width_found = text_width
-                            if text_height > max_height_found:
-                                max_height_found = text_height
-                    
-                    border_space = 20
-                    text_x = border_space
-                    text_y = img.height - border_space - lines_all_items * (max_height_found + line_space) + 4
-                
-                    background = (0, 0, 0, 255)  # RGB + Alpha (0-255)
-                    linecount = 0
-                
-                    for text_part in text:
-                        sep = text_part.split(':')
-                        props = get_right_font(sep[1].strip() if len(sep) > 1 else text_part)
-                        font = props[0]
-                        notfound = props[1]
-                        if notfound is True:
-                            lines = cls._wrap_text(convert_special_chars(text_part), font, max_width)
-                        else:
-                            lines = cls._wrap_text(text_part, font, max_width)
-                        for line in lines:
-                            linecount += 1
-                            text_width, text_height = draw.textsize(line, font = font)
-                            try:
-                                if linecount == 1:
-                                   rounded_rectangle_corners(overlay_draw, [text_x - 5, text_y - line_space, text_x + max_width_found + 5, text_y + max_height_found + line_space], radius=8, fill=background, top_left=True, top_right=True, bottom_left=False, bottom_right=False)
-                                elif linecount == lines_all_items:
-                                    rounded_rectangle_corners(overlay_draw, [text_x - 5, text_y - line_space, text_x + max_width_found + 5, text_y + max_height_found + line_space], radius=8, fill=background, top_left=False, top_right=False, bottom_left=True, bottom_right=True)
-                                else:
-                                    overlay_draw.rectangle([text_x - 5, text_y - line_space, text_x + max_width_found + 5, text_y + max_height_found + line_space], fill = background)
-                            except Exception as e:
-                                try:
-                                    flexprint('=> draw.rectangle fallback for grayscale image')
-                                    if linecount == 1:
-                                        rounded_rectangle_corners(overlay_draw, [text_x - 5, text_y - line_space, text_x + max_width_found + 5, text_y + max_height_found + line_space], radius=8, fill=0, top_left=True, top_right=True, bottom_left=False, bottom_right=False)
-                                    elif linecount == lines_all_items:
-                                        rounded_rectangle_corners(overlay_draw, [text_x - 5, text_y - line_space, text_x + max_width_found + 5, text_y + max_height_found + line_space], radius=8, fill=0, top_left=False, top_right=False, bottom_left=True, bottom_right=True)
-                                    else:
-                                        overlay_draw.rectangle([text_x - 5, text_y - line_space, text_x + max_width_found + 5, text_y + max_height_found + line_space], fill = 0) # fallback for grayscale images (not true color)
-                                except Exception as e:
-                                    if errorlog is True: flexprint('draw.rectangle error: ' + str(e))
-                            overlay_draw.text((text_x, text_y), line, font = font, fill = "white")
-                            text_y += max_height_found + line_space  # line spacing
-
-                # set alpha-channel of overlay
-                opacity = 170  # 0 = completely transparent, 255 = opaque
-                r, g, b, a = overlay.split()
-                a = a.point(lambda v: int(v * (opacity / 255)))
-                overlay = Image.merge("RGBA", (r, g, b, a))
-
-                img = Image.alpha_composite(img, overlay)
                 image = ImageTk.PhotoImage(img)
                 if image:
                     obj.config(image = image)
@@ -401,29 +527,31 @@ class Coverplayer:
         try:
             if path_or_url is None or path_or_url == '':
             	path_or_url = path.dirname(__file__) + '/cover_fallback.png'
-            if path_or_url.startswith("http"):
+            is_url = path_or_url.startswith("http")
+            cache_key = path_or_url if is_url else path_or_url + '|' + str(path.getmtime(path_or_url)) # a changed local file gets a new key
+            img = cls._get_cached_cover(cache_key, maxpx)
+            if img is not None:
+                if debug is True: flexprint('cover cache hit: ' + path_or_url)
+                if obj is not None:
+                    prepare_image(img)
+            elif is_url:
                 requestlist = [{'name':'imageSource','url':path_or_url}]
                 
                 def image_callback(async_web_response):
                     if async_web_response is not None and 'error' not in async_web_response:
                         flexprint('async_web_response (image) => len: ' + str(async_web_response['length'] if 'length' in async_web_response else 'unknown'))
-                        img = Image.open(BytesIO(async_web_response['content']))
+                        img = cls._scale_cover(Image.open(BytesIO(async_web_response['content'])), maxpx)
+                        cls._set_cached_cover(async_web_response['url'], img)
                     else:
                         if errorlog is True: flexprint('coverplayer load_image request failed => take fallback image')
-                        path_or_url = path.dirname(__file__) + '/cover_fallback.png'
-                        img = Image.open(path_or_url)
+                        img = cls._scale_cover(Image.open(path.dirname(__file__) + '/cover_fallback.png'), maxpx) # not cached, the next request tries the url again
                     if obj is not None:
                         prepare_image(img)
                         
-                async_web_response = async_web_requests_with_timing(requestlist, image_callback)
-                if len(async_web_response) > 0 and 'error' not in async_web_response[0]:
-                    img = Image.open(BytesIO(async_web_response[0]['content']))
-                else:
-                    if errorlog is True: flexprint('coverplayer load_image request failed => take fallback image')
-                    path_or_url = path.dirname(__file__) + '/cover_fallback.png'
-                    img = Image.open(path_or_url)                        
+                async_web_requests_with_timing(requestlist, image_callback)
             else:
-                img = Image.open(path_or_url)
+                img = cls._scale_cover(Image.open(path_or_url), maxpx)
+                cls._remember_cover(cache_key, img) # local files are kept in memory only
                 if obj is not None:
                     prepare_image(img)
                 
@@ -529,8 +657,12 @@ class Coverplayer:
             self.playpos_text = None
             self.playlen_text = None
             self.playlen_canvas = None
+            self.playpos_debug_text = None
             self.canvas = None
             self.canvas_clear = None
+            self.progress_bg = None # background line item of the progressbar canvas
+            self.progress_fg = None # foreground line item of the progressbar canvas
+            self.progress_width = None
             self.text = []
             self.zone = None
             self.zone_off = True
@@ -545,6 +677,8 @@ class Coverplayer:
             self.searchtype = ''
             self.search_callback = None
             self.itemclick_callback = None
+            self.list_generation = 0 # incremented on every new search or closed list, cancels the streaming of further result pages
+            self.search_lock = threading.Lock() # one search at a time, the roon browse session is shared
             self.is_playing = True
             self.sourcetype = 'local'
             self.alternative_layout = False
@@ -772,19 +906,45 @@ class Coverplayer:
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]set tracklist button error:[/red] {e}")
 
-    def draw_progressbar(self, playpos, playlen):
+    def set_progressbar(self, width, w):
+        # the canvas and its two lines are created once per overlay, updates only change the coords (no new canvas items)
+        if self.canvas is None:
+            self.canvas = Canvas(self.overlay, width = width, height = 5)
+            self.canvas.place(x = 120, y = self.overlay_height - self.control_button_height - self.extra_space_height + 15)
+            self.progress_bg = self.canvas.create_line(0, 0, width, 0, fill = "white", width = 14)
+            self.progress_fg = self.canvas.create_line(1, 1, w, 1, fill = "green", width = 12)
+        else:
+            if self.progress_width != width:
+                self.canvas.config(width = width)
+                self.canvas.coords(self.progress_bg, 0, 0, width, 0)
+            self.canvas.coords(self.progress_fg, 1, 1, w, 1)
+        self.progress_width = width
+
+    def set_label_text(self, label, text, x):
+        # reuse the label of the overlay if it exists
+        if label is None:
+            label = Label(self.overlay, text = text, bg = self.overlay_bgcolor, font = "Arial 20 bold", fg = 'white')
+            label.place(x = x, y = self.overlay_height - self.control_button_height - self.extra_space_height)
+        else:
+            label.config(text = text)
+        return label
+
+    def show_endless_symbol(self):
+        if self.playlen_canvas is None:
+            self.playlen_canvas = Canvas(self.overlay, width = 40, height = 36, bg = self.overlay_bgcolor, bd = 0, highlightthickness = 0)
+            self.playlen_canvas.place(x = self.playlen_pos_disabled, y = self.overlay_height - self.control_button_height - self.extra_space_height)   
+            self.playlen_canvas.create_text(0, -15, text='\u221E', fill="white", font=('Arial', 40), anchor='nw')
+        else:
+            self.playlen_canvas.lift()
+
+    def draw_progressbar(self, playpos, playlen, width = None):
         try:
-            if self.canvas is not None:
-                self.canvas.config(width = self.progressbar_width_std)
-            else:
-                self.canvas=Canvas(self.overlay, width = self.progressbar_width_std, height = 5)
-                self.canvas.place(x = 120, y = self.overlay_height - self.control_button_height - self.extra_space_height + 15)
-            self.canvas.create_line(0, 0, self.progressbar_width_std,0, fill = "white", width = 14)
+            width = self.progressbar_width_std if width is None else width
             if playpos > 0:
-                w = (self.progressbar_width_std - 3) / ((playlen / playpos) if playlen is not None and playlen > 0 else 1)
+                w = (width - 3) / ((playlen / playpos) if playlen is not None and playlen > 0 else 1)
             else:
                 w = 0
-            self.canvas.create_line(1, 1, w, 1, fill = "green", width = 12)
+            self.set_progressbar(width, w)
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]draw progressbar error:[/red] {e}")
 
@@ -890,22 +1050,15 @@ class Coverplayer:
             #back_btn.place(relx = 1.0, rely = 1.0, anchor = "se", x = 0, y = 0)
         
             if self.playpos is not None and self.playpos != -1:
-                self.playpos_text = Label(self.overlay, text = timedelta(seconds=self.playpos), bg = self.overlay_bgcolor, font = "Arial 20 bold", fg = 'white')
-                self.playpos_text.place(x = 10, y = self.overlay_height - self.control_button_height - self.extra_space_height)
+                self.playpos_text = self.set_label_text(self.playpos_text, timedelta(seconds=self.playpos), 10)
                 self.draw_progressbar(self.playpos, self.playlen)
 
             if self.playlen is not None and self.playlen > 0:
-                self.playlen_text = Label(self.overlay, text = timedelta(seconds=self.playlen), bg = self.overlay_bgcolor, font = "Arial 20 bold", fg = 'white')
-                self.playlen_text.place(x = self.playlen_pos_std, y = self.overlay_height - self.control_button_height - self.extra_space_height)
+                self.playlen_text = self.set_label_text(self.playlen_text, timedelta(seconds=self.playlen), self.playlen_pos_std)
             else:
                 if self.playpos is not None and self.playpos != -1:
-                    self.canvas=Canvas(self.overlay, width = self.progressbar_width_disabled, height = 5)
-                    self.canvas.place(x = 120, y = self.overlay_height - self.control_button_height - self.extra_space_height + 15)
-                    self.canvas.create_line(0, 0, self.progressbar_width_disabled,0, fill = "white", width = 14)
-                    self.canvas.create_line(1, 1, self.progressbar_width_disabled - 3, 1, fill = "green", width = 12)
-                    playlen_canvas = Canvas(self.overlay, width = 40, height = 36, bg = self.overlay_bgcolor, bd = 0, highlightthickness = 0)
-                    playlen_canvas.place(x = self.playlen_pos_disabled, y = self.overlay_height - self.control_button_height - self.extra_space_height)   
-                    txtid = playlen_canvas.create_text(0, -15, text='\u221E', fill="white", font=('Arial', 40), anchor='nw')             
+                    self.set_progressbar(self.progressbar_width_disabled, self.progressbar_width_disabled - 3)
+                    self.show_endless_symbol()
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]show overlay error:[/red] {e}")
 
@@ -920,20 +1073,8 @@ class Coverplayer:
                 if self.is_radio is False and (self.playlen is None or self.playpos < self.playlen):
                     self.playpos += 1
                 if self.in_menu_mode is True:
-                    if self.playpos_text is None:
-                        self.playpos_text = Label(self.overlay, text = timedelta(seconds=self.playpos), bg = self.overlay_bgcolor, font = "Arial 20 bold", fg = 'white')
-                    else:
-                        self.playpos_text.config(text=timedelta(seconds=self.playpos))
-                    self.playpos_text.place(x = 10, y = self.overlay_height - self.control_button_height - self.extra_space_height)
-                    if self.canvas is None:
-                        self.canvas=Canvas(self.overlay, width = self.progressbar_width_std if switch_enabled else self.progressbar_width_disabled, height = 5)
-                        self.canvas.place(x = 120, y = self.overlay_height - self.control_button_height - self.extra_space_height + 15)
-                    self.canvas.create_line(0, 0, self.progressbar_width_std if switch_enabled else self.progressbar_width_disabled,0, fill = "white", width = 14)
-                    if self.playpos > 0:
-                        w = ((self.progressbar_width_std if switch_enabled else self.progressbar_width_disabled) - 3) / ((self.playlen / self.playpos) if self.playlen is not None and self.playlen > 0 else 1)
-                    else:
-                        w = 0
-                    self.canvas.create_line(1, 1, w, 1, fill = "green", width = 12)
+                    self.playpos_text = self.set_label_text(self.playpos_text, timedelta(seconds=self.playpos), 10)
+                    self.draw_progressbar(self.playpos, self.playlen, self.progressbar_width_std if switch_enabled else self.progressbar_width_disabled)
             if self.debug is True:
                 self.flexprint('CoverPlayer: classfunc update_playpos: ' + str(self.playpos))
         except Exception as e:
@@ -1084,9 +1225,11 @@ class Coverplayer:
                 self.playpos_text = None
                 self.playlen_text = None
                 self.playlen_canvas = None
+                self.playpos_debug_text = None
                 if self.canvas is not None:
                     self.canvas.destroy()
                     self.canvas = None
+                    self.progress_width = None
                 if self.canvas_clear is not None:
                     self.canvas_clear.destroy()
                     self.canvas_clear = None
@@ -1105,6 +1248,7 @@ class Coverplayer:
 
     def close_list(self):
         try:
+            self.list_generation += 1
             self.root.deiconify()
             self._hide_overlay()
         except Exception as e:
@@ -1113,9 +1257,10 @@ class Coverplayer:
     def unescape_quotes(self, str):
         return str.replace('\\"',"\"")
 
-    def filter_list_to_unique_id(self, items):
+    def filter_list_to_unique_id(self, items, idlist = None):
         filtered_items = []
-        idlist = []
+        if idlist is None:
+            idlist = []
         try:
             for item in items:
                 if item['id'] not in idlist:
@@ -1125,16 +1270,35 @@ class Coverplayer:
             if self.errorlog is True: self.flexprint(f"[red]filter list to unique id error:[/red] {e}")
         return filtered_items
     
-    def on_search(self, is_stream, type, key):
+    def query_search(self, is_stream, type, key, is_stale = None):
+        # search as you type query of the keyboard (worker thread), the result is passed to on_search on enter
+        # is_stale: true if a newer query exists, the search is skipped then (before and after waiting for the running search)
+        try:
+            if self.search_callback is not None and self.zone is not None:
+                if is_stale is not None and is_stale() is True:
+                    return None
+                with self.search_lock:
+                    if is_stale is not None and is_stale() is True:
+                        return None
+                    return self.search_callback(is_stream, key, self.zone, type)
+        except Exception as e:
+            if self.errorlog is True: self.flexprint(f"[red]query search error:[/red] {e}")
+        return None
+
+    def on_search(self, is_stream, type, key, data = None):
         try:
-            self.flexprint('coverplayer => on_search, zone: ' + str(self.zone) + ', is_stream:' + str(is_stream) + ', type: ' + str(type) + ', key: ' + str(key))
+            self.flexprint('coverplayer => on_search, zone: ' + str(self.zone) + ', is_stream:' + str(is_stream) + ', type: ' + str(type) + ', key: ' + str(key) + ', prefetched: ' + str(data is not None))
+            self.list_generation += 1
             if self.search_callback is not None and self.zone is not None:
-                data = self.search_callback(is_stream, key, self.zone, type)
+                if data is None:
+                    with self.search_lock:
+                        data = self.search_callback(is_stream, key, self.zone, type)
                 if isinstance(data, str):
                     self.vkeyb.error_message(data)
                     return
                 if len(data) > 0:
                     meta = data[0]
+                    pages = data[2] if len(data) > 2 else None # generator of further result pages
                     if self.searchlog is True: self.flexprint("coverplayer => on_search, meta:" + str(meta))
                     if 'zonetype' in meta and meta['zonetype']=='':
                         self.vkeyb.error_message(self.lang['Zone'] + ' ' + self.lang['inactive'].upper())
@@ -1150,24 +1314,24 @@ class Coverplayer:
                                 self.flexprint_list(album_names)
                             meta['label'] = self.lang['select_album'].title()
                             meta['listname'] = self.unescape_quotes(meta['artist'])
-                            self._open_list(meta, albums)
+                            self._open_list(meta, albums, pages)
                         elif albums is not None and isinstance(albums, str) is True:
                             self.vkeyb.error_message(albums)
                         else:
                             self.vkeyb.error_message(self.lang['notfound'].upper())
-                    if meta['type'] == 'artists' and len(data) == 2:
+                    if meta['type'] == 'artists' and len(data) >= 2:
                         self.search = meta['search']
                         artists = data[1]
                         if artists is not None and isinstance(artists, str) is False and len(artists) > 0:
                             self.flexprint_list(artists)
                             meta['label'] = self.lang['select_artist'].title()
                             meta['listname'] = None
-                            self._open_list(meta, artists)
+                            self._open_list(meta, artists, pages)
                         elif artists is not None and isinstance(artists, str) is True:
                             self.vkeyb.error_message(artists)
                         else:
                             self.vkeyb.error_message(self.lang['notfound'].upper())
-                    if meta['type'] == 'genres' and len(data) == 2:
+                    if meta['type'] == 'genres' and len(data) >= 2:
                         self.search = meta['search']
                         genres = data[1]
                         if genres is not None and isinstance(genres, str) is False and len(genres) > 0:
@@ -1179,26 +1343,29 @@ class Coverplayer:
                             self.vkeyb.error_message(genres)
                         else:
                             self.vkeyb.error_message(self.lang['notfound'].upper())
-                    if meta['type'] == 'tracks' and len(data) == 2:
+                    if meta['type'] == 'tracks' and len(data) >= 2:
                         self.search = meta['search']
                         tracks = data[1]
                         if tracks is not None and isinstance(tracks, str) is False and len(tracks) > 0:
+                            map_page = None
                             if meta['zonetype'] == 'Apple Music':
                                 if is_stream is False:
                                     tracks = list(map(lambda name: {"name": (name.split('|')[0] + ' [' + name.split('|')[1] + ']') if len(name.split('|')) == 2 else name, "id": name.split('|')[0]}, tracks))
-                                tracks = self.filter_list_to_unique_id(tracks)
+                                idlist = []
+                                tracks = self.filter_list_to_unique_id(tracks, idlist)
+                                map_page = lambda items: self.filter_list_to_unique_id(items, idlist)
                                 if 'playlist' in meta:
                                     tracks.insert(0, {"name": self.lang['play_playlist'].title(), "id": "[FULLPLAYLIST]"})
                             self.flexprint_list(tracks)
                             meta['label'] = self.lang['select_track'].title()
                             meta['listname'] = self.unescape_quotes(meta['search'])
                             if self.searchlog is True: self.flexprint('coverplayer applemusic playlist tracks: ' + str(tracks))
-                            self._open_list(meta, tracks)
+                            self._open_list(meta, tracks, pages, map_page)
                         elif tracks is not None and isinstance(tracks, str) is True:
                             self.vkeyb.error_message(tracks)
                         else:
                             self.vkeyb.error_message(self.lang['notfound'].upper())
-                    if meta['type'] == 'playlists' and len(data) == 2:
+                    if meta['type'] == 'playlists' and len(data) >= 2:
                         self.search = meta['search']
                         playlists = data[1]
                         if playlists is not None and isinstance(playlists, str) is False and len(playlists) > 0:
@@ -1207,19 +1374,19 @@ class Coverplayer:
                             meta['listname'] = None
                             if meta['zonetype']=='Apple Music' and meta['stream'] is True:
                                 meta['playlists'] = playlists
-                            self._open_list(meta, playlists)
+                            self._open_list(meta, playlists, pages)
                         elif playlists is not None and isinstance(playlists, str) is True:
                             self.vkeyb.error_message(playlists)
                         else:
                             self.vkeyb.error_message(self.lang['notfound'].upper())
-                    if meta['type'] == 'radios' and len(data) == 2:
+                    if meta['type'] == 'radios' and len(data) >= 2:
                         self.search = meta['search']
                         radios = data[1]
                         if radios is not None and isinstance(radios, str) is False and len(radios) > 0:
                             self.flexprint_list(radios)
                             meta['label'] = self.lang['select_radio'].title()
                             meta['listname'] = None
-                            self._open_list(meta, radios)
+                            self._open_list(meta, radios, pages)
                         elif radios is not None and isinstance(radios, str) is True:
                             self.vkeyb.error_message(radios)
                         else:
@@ -1275,6 +1442,7 @@ class Coverplayer:
                     if result_type == 'albums':
                         self.search = data[1]
                         albums = data[2]
+                        pages = data[3] if len(data) > 3 else None # generator of further result pages
                         if albums is not None and len(albums) > 0:
                             if isinstance(albums[0], str) is True:
                                 self.flexprint_list(albums)
@@ -1287,7 +1455,7 @@ class Coverplayer:
                             meta['label'] = self.lang['select_album'].title()
                             meta['listname'] = self.unescape_quotes(self.search)
                             if self.searchlog is True: self.flexprint('on_itemclick before _open_list (albums), meta: ' + str(meta))
-                            self._open_list(meta, albums)
+                            self._open_list(meta, albums, pages)
                         else:
                             self.itemlistclass.error_message(self.lang['notfound'].upper())
                     if self.searchlog is True: self.flexprint('#### coverplayer on_itemclick result_type: ' + result_type + ', meta: ' + str(meta))                 
@@ -1390,35 +1558,48 @@ class Coverplayer:
                 if (zonetype.startswith('Spotify') is False):
                     self.hasRadioSearch = True
                 self.flexprint('********* _open_keyb, type: ' + str(type) + ', zonetype: ' + str(zonetype) + ', hasRadioSearch: ' + str(self.hasRadioSearch))
-                self.vkeyb.start(type, [], self.keyb_list, self.lang, self.hasRadioSearch, zonetype, self.sourcetype, self.alternative_layout, self.on_search, self.close_keyb)
+                self.vkeyb.start(type, [], self.keyb_list, self.lang, self.hasRadioSearch, zonetype, self.sourcetype, self.alternative_layout, self.on_search, self.close_keyb, self.query_search)
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]open keyb error:[/red] {e}")
 
-    def _open_list(self, meta, items):
+    def _open_list(self, meta, items, pages = None, map_page = None):
         try:
             self.flexprint('coverplayer => open_list, meta: ' + str(meta) + ', items: ' + str(len(items)))
             #self.root.withdraw()
+            self.list_generation += 1
             self.itemlistclass.start(meta, items, self.lang, self.on_itemclick, self.close_list)
+            if pages is not None:
+                threading.Thread(target = self._stream_list_pages, args = (self.list_generation, pages, map_page), daemon = True).start()
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]open list error:[/red] {e}")
 
+    def _stream_list_pages(self, generation, pages, map_page):
+        # adds the further result pages to the open list, stops when the list is closed or a new search is started
+        try:
+            for items in pages:
+                if generation != self.list_generation:
+                    self.flexprint('coverplayer => stream list pages cancelled')
+                    break
+                if map_page is not None:
+                    items = map_page(items)
+                if len(items) > 0:
+                    self.itemlistclass.add_items(items)
+        except Exception as e:
+            if self.errorlog is True: self.flexprint(f"[red]stream list pages error:[/red] {e}")
+        finally:
+            pages.close()
+
     def draw_progressbar_with_endless_symbol(self, playpos, playlen):
         try:
-            if self.canvas is not None:
-                self.canvas.config(width = self.progressbar_width_disabled)
-            else:
-                self.canvas=Canvas(self.overlay, width = self.progressbar_width_disabled, height = 5)
-                self.canvas.place(x = 120, y = self.overlay_height - self.control_button_height - self.extra_space_height + 15)
             if playlen == -1 and playpos == -1:
+                if self.canvas is not None:
+                    self.canvas.config(width = self.progressbar_width_disabled)
                 if self.playlen_canvas != None:
                     self.playlen_canvas.destroy()
                     self.playlen_canvas = None
             else:
-                self.canvas.create_line(0, 0, self.progressbar_width_disabled,0, fill = "white", width = 14)
-                self.canvas.create_line(1, 1, self.progressbar_width_disabled - 3, 1, fill = "green", width = 12)
-                self.playlen_canvas = Canvas(self.overlay, width = 40, height = 36, bg = self.overlay_bgcolor, bd = 0, highlightthickness = 0)
-                self.playlen_canvas.place(x = self.playlen_pos_disabled, y = self.overlay_height - self.control_button_height - self.extra_space_height)   
-                txtid = self.playlen_canvas.create_text(0, -15, text='\u221E', fill="white", font=('Arial', 40), anchor='nw')             
+                self.set_progressbar(self.progressbar_width_disabled, self.progressbar_width_disabled - 3)
+                self.show_endless_symbol()
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]draw progressbar with endless symbol error:[/red] {e}")
 
@@ -1464,12 +1645,15 @@ class Coverplayer:
         try:
             if self.in_menu_mode is True and playlen is not None and self.playlen != playlen:
                 if playlen == -1:
-                    self.canvas_clear = Canvas(self.overlay, width = self.maxpx_x, height = 40, bd = 0, highlightthickness = 0, relief = 'ridge', bg = self.overlay_bgcolor)
-                    self.canvas_clear.place(x = 0, y = self.overlay_height - self.control_button_height - self.extra_space_height)
+                    if self.canvas_clear is None:
+                        self.canvas_clear = Canvas(self.overlay, width = self.maxpx_x, height = 40, bd = 0, highlightthickness = 0, relief = 'ridge', bg = self.overlay_bgcolor)
+                        self.canvas_clear.place(x = 0, y = self.overlay_height - self.control_button_height - self.extra_space_height)
+                    else:
+                        self.canvas_clear.lift()
                 else:
                     self.draw_progressbar(self.playpos, self.playlen)
-                    self.playlen_text = Label(self.overlay, text = timedelta(seconds=playlen), bg = self.overlay_bgcolor, font = "Arial 20 bold", fg = 'white')
-                    self.playlen_text.place(x = self.playlen_pos_std, y = self.overlay_height - self.control_button_height - self.extra_space_height)
+                    self.playlen_text = self.set_label_text(self.playlen_text, timedelta(seconds=playlen), self.playlen_pos_std)
+                    self.playlen_text.lift()
                     if self.canvas_clear is not None:
                         self.canvas_clear.destroy()
                         self.canvas_clear = None
@@ -1483,8 +1667,11 @@ class Coverplayer:
             if self.in_menu_mode is True and self.debug is True:
                 self.count += 1
                 upd_pos_text = str(timedelta(seconds=playpos)) + ' / ' + str(self.count) if (playpos is not None and playpos != -1) else str(playpos) + ' / ' + str(self.count)
-                upd_pos = Label(self.overlay, text = upd_pos_text, bg = self.overlay_bgcolor, font = "Arial 20 bold", fg = 'white')
-                upd_pos.place(x = 10, y = self.overlay_height - self.control_button_height - self.extra_space_height + 40)
+                if self.playpos_debug_text is None:
+                    self.playpos_debug_text = Label(self.overlay, text = upd_pos_text, bg = self.overlay_bgcolor, font = "Arial 20 bold", fg = 'white')
+                    self.playpos_debug_text.place(x = 10, y = self.overlay_height - self.control_button_height - self.extra_space_height + 40)
+                else:
+                    self.playpos_debug_text.config(text = upd_pos_text)
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]set playpos error:[/red] {e}")
 
@@ -1582,6 +1769,7 @@ class Coverplayer:
                     self.lang = playpos
                     self.webserver_url_request_timeout = playlen 
                     self.display_auto_wakeup = path
+                    self._set_cover_cache_dir(is_playing)
                 if func == 'disable_spotify':
                     self.spotify_disabled = playpos
                 if func == 'disable_applemusic':
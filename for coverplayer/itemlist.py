@@ -19,6 +19,7 @@ from os import system, path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import math
 import time
+import queue
 from rich import print
 import sys
 import logging
@@ -34,6 +35,7 @@ class TouchTreeview(ttk.Treeview):
         self._moved = False
         self._tap_item = None
         self.ignore_select = False
+        self.on_scroll = None # called after each scroll step (used to insert the next rows)
         self.maxRowCount = 7 # too much rows and maxsize too big results in a exception: BadAlloc (insufficient resources for operation)
         self.rowheight = 90 # maxsize, for bigger height exception throws: BadAlloc (insufficient resources for operation)
         self.scroll_speed = 1.0 / ((self.rowheight * self.maxRowCount) / 0.7)
@@ -43,7 +45,9 @@ class TouchTreeview(ttk.Treeview):
         self.bind("<ButtonRelease-1>", self.on_touch_end)
         self.bind("<<TreeviewSelect>>", self.on_select_event)
 
-    def setItems(self, items):
+    def setItems(self, items, previous = 0):
+        if previous > 0 and items > previous:
+            self._scroll_start = self._scroll_start * previous / items # rows were added while scrolling, keep the position
         self.scroll_speed = 1.0 / self.rowheight / items
 
     def on_touch_start(self, event):
@@ -59,6 +63,8 @@ class TouchTreeview(ttk.Treeview):
         delta_fraction = -dy * self.scroll_speed
         new_view = min(max(self._scroll_start + delta_fraction, 0.0), 1.0)
         self.yview_moveto(new_view)
+        if self.on_scroll is not None:
+            self.on_scroll()
 
         if abs(dy) > 5:
             self._moved = True
@@ -91,6 +97,9 @@ class ItemList:
         self.debug = False		# log debug messages (variable information)
         
         self.on_close = None
+        self.row_buffer = 14 # rows inserted in advance below the visible rows, further rows are inserted while scrolling
+        self.rendered = 0 # number of items inserted into the treeview
+        self.pending_items = queue.Queue() # items added after the list was opened (add_items)
 
     def flexprint(self, str, objStr = None):
         if self.log is True:
@@ -205,20 +214,62 @@ class ItemList:
             if self.errorlog is True: self.flexprint(f"[red]get dot coords error:[/red] {e}")
             return 0, 0, 0, 0
 
-    def refresh_row_tags(self):
+    def row_tags(self, index, item):
+        # stripes and enabled state from the index, set once on insert
+        colortag = 'enabled_row'
+        if isinstance(item, str) is False and 'playable' in item:
+            colortag = 'enabled_row' if item['playable'] is True else 'disabled_row'
+        rowtag = 'evenrow' if index % 2 == 0 else 'oddrow'
+        return (rowtag, colortag,)
+
+    def insert_rows(self, count):
+        # insert the next rows of the items into the treeview, only the visible rows and a buffer are inserted
+        start = self.rendered
+        end = min(len(self.items), start + count)
+        for index in range(start, end):
+            item = self.items[index]
+            tags = self.row_tags(index, item)
+            try:
+                if isinstance(item, str) is True:
+                    self.listbox.insert('', END, text=item, tags = tags)
+                elif self.meta['type']=='tracks' and 'artist' in item and item['artist'] is not None:
+                    self.listbox.insert('', END, text=item['name'] + ' [' + item['artist'] + ']', iid = item['id'], tags = tags)
+                else:
+                    self.listbox.insert('', END, text=item['name'], iid = item['id'], tags = tags)
+            except TclError as e:
+                if self.errorlog is True: self.flexprint(f"[red]insert row error:[/red] {e}")
+        if end > start:
+            self.rendered = end
+            self.listbox.setItems(end, start)
+
+    def on_list_scroll(self):
+        try:
+            if self.rendered < len(self.items) and self.listbox.yview()[1] >= 0.8:
+                self.insert_rows(self.row_buffer)
+        except Exception as e:
+            if self.errorlog is True: self.flexprint(f"[red]on list scroll error:[/red] {e}")
+
+    def add_items(self, items):
+        # thread safe, for results which arrive after the list is opened
+        self.pending_items.put(items)
+
+    def poll_items(self):
         try:
-            children = self.listbox.get_children()
-            for index, item in enumerate(children):
-                colortag = 'enabled_row'
-                obj = self.items[index]
-                if isinstance(obj, str) is False and 'playable' in obj:
-                    enabled = obj['playable']
-                    colortag = 'enabled_row' if enabled is True else 'disabled_row'
-
-                rowtag = 'evenrow' if index % 2 == 0 else 'oddrow'
-                self.listbox.item(item, tags=(rowtag,colortag,))
+            while True:
+                items = self.pending_items.get_nowait()
+                self.items += items
+                self.flexprint('itemlist ==> add items: ' + str(len(items)) + ', items: ' + str(len(self.items)))
+                if self.rendered < self.maxRowCount + self.row_buffer:
+                    self.insert_rows(self.maxRowCount + self.row_buffer - self.rendered)
+                self.on_list_scroll()
+        except queue.Empty:
+            pass
         except Exception as e:
-            if self.errorlog is True: self.flexprint(f"[red]refresh row tags error:[/red] {e}")
+            if self.errorlog is True: self.flexprint(f"[red]poll items error:[/red] {e}")
+        try:
+            self.master.after(100, self.poll_items)
+        except TclError:
+            pass # list is closed
 
     def engine(self):
         try:
@@ -253,27 +304,12 @@ class ItemList:
             self.listbox.tag_configure('evenrow', background='#f0f0f0')
             self.listbox.tag_configure('oddrow', background='white')
 
-            for index, item in enumerate(self.items):
-                colortag = 'enabled_row'
-                rowtag = 'evenrow' if index % 2 == 0 else 'oddrow'
-                if isinstance(item, str) is True:
-                    self.listbox.insert('', END, text=item, tags = (rowtag,colortag,))
-                else:
-                    if self.meta['type']=='tracks' and 'artist' in item and item['artist'] is not None:
-                        self.listbox.insert('', END, text=item['name'] + ' [' + item['artist'] + ']', iid = item['id'], tags=(rowtag,colortag,))
-                    else:
-                        if 'playable' in item:
-                            enabled = item['playable']
-                            colortag = 'enabled_row' if enabled is True else 'disabled_row'
-                        self.listbox.insert('', END, text=item['name'], iid = item['id'], tags=(rowtag,colortag,))
-
-            self.listbox.setItems(len(self.items))
+            self.rendered = 0
+            self.insert_rows(self.maxRowCount + self.row_buffer)
+            self.listbox.on_scroll = self.on_list_scroll
     
             self.listbox.bind('<<TreeviewSelect>>', self.on_select)
-
-            self.listbox.bind("<Visibility>", lambda e: self.refresh_row_tags())
-            #self.listbox.bind("<<TreeviewSelect>>", self.on_select)
-            self.listbox.bind("<Motion>", lambda e: self.refresh_row_tags())
+            self.master.after(100, self.poll_items)
 
             # add the frames to the main window
             labelField.grid(row=0, sticky="NSEW", padx=9, pady=1)
@@ -310,7 +346,6 @@ class ItemList:
             if self.listbox.ignore_select:
                 return
 
-            self.refresh_row_tags()
             selected_item = self.listbox.focus()  # ID of selected element
             playable = True
             items = [e for e in self.items if isinstance(e, str) is False and e["id"] == selected_item]
@@ -387,7 +422,8 @@ class ItemList:
             self.flexprint('itemlist ==> start, meta' + str(meta) + ', items: ' + str(len(items)))
 
             self.meta = meta
-            self.items = items
+            self.items = list(items)
+            self.pending_items = queue.Queue()
             self.lang = lang
             self.on_list_selection = itemclick_callback
             self.on_close = close_callback
@@ -19,6 +19,7 @@ from os import path, system
 import math
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
 from rich import print
 import sys
 import logging
@@ -48,6 +49,11 @@ class TouchFriendlyButton(Button):
         #self.invoke()  # calls the command
 
 class VirtualKeyboard:
+    executor = ThreadPoolExecutor(max_workers=4) # search as you type queries
+    progress_executor = ThreadPoolExecutor(max_workers=1) # progress spinner, not queued behind the queries
+    query_delay = 250 # ms after the last keystroke until the search query is started (search as you type)
+    query_cache_size = 32 # number of query results kept per keyboard session
+
     def __init__(self,log,maxpx_x,maxpx_y):
         self.log = log			# log infos on or off
         self.maxpx_x = maxpx_x  # screen width in px
@@ -58,6 +64,11 @@ class VirtualKeyboard:
         self.debug = False		# log debug messages (variable information)
 
         self.on_close = None
+        self.on_query = None
+        self.queries = OrderedDict() # (searchtype, stream, value) => future of the search result
+        self.query_generations = {} # (searchtype, stream, value) => generation of the query, only the latest generation is wanted
+        self.query_generation = 0
+        self.query_after_id = None
 
     def flexprint(self, str, objStr = None):
         if self.log is True:
@@ -274,6 +285,7 @@ class VirtualKeyboard:
                     self.inp.delete(0, END) #deletes the current value
                     self.inp.insert(0, value) #inserts new value assigned by 2nd parameter
                     self.inp.icursor(cursor_pos - 1)
+                    self.schedule_query()
                     return
             elif x == 'del':
                 if len(actualValue) > 0:
@@ -286,6 +298,7 @@ class VirtualKeyboard:
                     self.inp.delete(0, END) #deletes the current value
                     self.inp.insert(0, value) #inserts new value assigned by 2nd parameter
                     self.inp.icursor(cursor_pos)
+                    self.schedule_query()
                     return
             elif x == 'left':
                 self.shift_cursor_left()
@@ -294,6 +307,7 @@ class VirtualKeyboard:
                 self.shift_cursor_right()
                 value = None
             elif x == 'close':
+                self.cancel_queries()
                 self.on_close()
                 value = None
                 self.master.destroy()
@@ -326,12 +340,15 @@ class VirtualKeyboard:
                 self.inp.insert(0, value) #inserts new value assigned by 2nd parameter
                 self.inp.icursor(cursor_pos + 1)
                 self.search = value
+                if x != 'enter':
+                    self.schedule_query()
             if x == 'enter' and len(value) >= (0 if (self.zonetype!='Apple Music' and (self.searchtype=='playlist' or self.searchtype=='genre' or self.searchtype=='radio')) else self.minLength):
                 self.showSpinner = True
+                query = self.take_query(value)
                 self.master.destroy()
-                executor = ThreadPoolExecutor(max_workers=1)
-                job = executor.submit(self.circleProgress)
-                self.on_search(self.stream_on, self.searchtype, value)
+                self.progress_executor.submit(self.circleProgress)
+                data = self.query_result(query)
+                self.on_search(self.stream_on, self.searchtype, value, data)
                 self.showSpinner = False
             else:
                 self.master.after(10, self.master.wm_deiconify())
@@ -344,6 +361,82 @@ class VirtualKeyboard:
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]vpresskey error:[/red] {e}")
 
+    def query_key(self, value):
+        return (self.searchtype, self.stream_on, value)
+
+    def schedule_query(self):
+        # debounce the keystrokes, the search is started query_delay ms after the last key press
+        try:
+            if self.on_query is None:
+                return
+            if self.query_after_id is not None:
+                self.master.after_cancel(self.query_after_id)
+            self.query_after_id = self.master.after(self.query_delay, self.start_query)
+        except Exception as e:
+            if self.errorlog is True: self.flexprint(f"[red]schedule query error:[/red] {e}")
+
+    def start_query(self):
+        try:
+            self.query_after_id = None
+            value = str(self.inpstr.get())
+            if len(value) < self.minLength or self.searchtype == 'radio': # a single radio search result starts playing
+                return
+            key = self.query_key(value)
+            self.query_generation += 1
+            self.query_generations[key] = self.query_generation
+            future = self.queries.get(key)
+            if future is not None and future.cancelled() is False and (future.done() is False or future.result() is not None):
+                self.queries.move_to_end(key)
+                return
+            # cancel the superseded queries which are not running yet, running ones skip the search if they still wait for it (stale)
+            for other_key, future in list(self.queries.items()):
+                if future.done() is False and future.cancel() is True:
+                    del self.queries[other_key]
+            if self.debug is True: self.flexprint('vkeyboard ==> start query: ' + str(key))
+            self.queries[key] = self.executor.submit(self.on_query, self.stream_on, self.searchtype, value, lambda: self.query_is_stale(key))
+            while len(self.queries) > self.query_cache_size:
+                self.query_generations.pop(self.queries.popitem(last = False)[0], None)
+        except Exception as e:
+            if self.errorlog is True: self.flexprint(f"[red]start query error:[/red] {e}")
+
+    def query_is_stale(self, key):
+        # a query is superseded by a newer one (called by the worker threads, they skip the search then)
+        return self.query_generations.get(key) != self.query_generation
+
+    def take_query(self, value):
+        # takes the search as you type query of value and cancels the others
+        try:
+            key = self.query_key(value)
+            future = self.queries.pop(key, None)
+            self.cancel_queries()
+            self.query_generations[key] = self.query_generation # the taken query is the only wanted one
+            return future
+        except Exception as e:
+            if self.errorlog is True: self.flexprint(f"[red]take query error:[/red] {e}")
+            return None
+
+    def query_result(self, future):
+        # waits for the query if it is still running, None if there is no result (on_search queries again)
+        try:
+            if future is None or future.cancelled():
+                return None
+            return future.result()
+        except Exception as e:
+            if self.errorlog is True: self.flexprint(f"[red]query result error:[/red] {e}")
+            return None
+
+    def cancel_queries(self):
+        try:
+            self.query_generation += 1 # running queries which wait for the search are stale now
+            if self.query_after_id is not None:
+                self.master.after_cancel(self.query_after_id)
+                self.query_after_id = None
+            for future in self.queries.values():
+                if future.done() is False:
+                    future.cancel()
+        except Exception as e:
+            if self.errorlog is True: self.flexprint(f"[red]cancel queries error:[/red] {e}")
+
     def shift_cursor_left(self):
         try:
             position = self.inp.index(INSERT)
@@ -425,7 +518,7 @@ class VirtualKeyboard:
             if self.errorlog is True: self.flexprint(f"[red]Icon loading error:[/red] {e}")
         
     # start keyboard
-    def start(self, type, data, keyb_list, lang, hasRadioSearch, zonetype, sourcetype, alternative_layout, kp_callback, close_callback):
+    def start(self, type, data, keyb_list, lang, hasRadioSearch, zonetype, sourcetype, alternative_layout, kp_callback, close_callback, query_callback = None):
         try:
             self.flexprint('vkeyboard ==> start, zonetype: ' + str(zonetype) + ', sourcetype: ' + str(sourcetype))
             self.type = type
@@ -452,6 +545,10 @@ class VirtualKeyboard:
             self.alternative_layout = alternative_layout
             self.on_search = kp_callback
             self.on_close = close_callback
+            self.on_query = query_callback
+            self.queries = OrderedDict()
+            self.query_generations = {}
+            self.query_after_id = None
             self.scriptpath = path.dirname(__file__) + '/'
 
             self.init()
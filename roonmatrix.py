@@ -52,6 +52,7 @@ from urllib import parse
 import configparser
 import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Queue
 import asyncio
 import threading
 from math import ceil
@@ -65,9 +66,11 @@ from rich import print
 import traceback
 import logging
 from logging.handlers import RotatingFileHandler
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from copy import deepcopy
 from operator import is_not
 from functools import partial, wraps
+from itertools import count
 from pathlib import Path
 import hashlib
 import zlib
@@ -158,19 +161,21 @@ else:
 
 if is_app_embedded is True or is_raspberry_pi is False:
     from cp437_font import CP437_FONT_PROPORTIONAL
+    text_font = CP437_FONT_PROPORTIONAL
     import certifi
     ssl_ctx = ssl.create_default_context(cafile=certifi.where())
     if is_app_embedded is False and is_raspberry_pi is False:
-        from aiohttp import ClientSession, ClientTimeout, ClientConnectorError
+        from aiohttp import ClientSession, ClientTimeout, ClientConnectorError, TCPConnector
 else:
     from luma.led_matrix.device import max7219 # (luma missing on app-embedded)
+    from luma.led_matrix.const import max7219 as max7219_const
     from luma.core.interface.serial import spi, noop
-    from luma.core.legacy import text, textsize
+    from luma.core.legacy import text
     from luma.core.legacy.font import proportional, CP437_FONT
+    text_font = proportional(CP437_FONT) # shared instance, so its glyph width table is built only once
     from luma.core.render import canvas
     from luma.core.virtual import viewport
-    from luma.core.sprite_system import framerate_regulator
-    from aiohttp import ClientSession, ClientTimeout, ClientConnectorError # (codesign problem on app-embedded)
+    from aiohttp import ClientSession, ClientTimeout, ClientConnectorError, TCPConnector # (codesign problem on app-embedded)
     ssl_ctx = None
 
 if with_restserver_fastapi is True:
@@ -209,6 +214,13 @@ prepared_vert_strlines = [] # string lines of new generated playout message prep
 audio_playing = '' # string of new generated audio message part prepared to get info about all audio zones which are playing
 weather_fetch_count = 0 # count number of weather api fetches (free acount has a limited number of fetches for a day. for weatherbit its limited to 50 fetches per day)
 build_seconds = 0 # time in seconds to fetch and build output data
+output_segments = {} # cached output segments of build_output (key: source => roon, web, rss), a missing segment is dirty and will be rebuilt
+output_segment_settings = None # display settings the cached output segments were built with (all segments are rebuilt if they change)
+output_segment_max_age = 60 # max age in seconds of a cached roon or webserver segment, to catch changes without a callback
+output_segment_generations = {} # generation of each output segment source, incremented if it is marked dirty (a segment built before is not stored then)
+output_segment_lock = threading.Lock()
+roon_connected_last = None # roon core connection state of the last build_output, the roon segment is rebuilt if it changes
+rss_update_interval = 300 # max age in seconds of the cached rss segment
 interrupt_message = False # flag: set true to interrupt message output
 fetch_output_in_progress = False # flag: set to true if data fetching and output generation is in progress
 output_in_progress = False # flag: set to true if output to led matrix is in progress
@@ -220,10 +232,13 @@ playmode = {} # playmode is a dictionary of play state of each roon- or webserve
 shufflemode = {} # shufflemode is a dictionary of shuffle state of each webserver zone (key = control_id, value = shuffle mode (shuffle,noshuffle)
 repeatmode = {} # repeatmode is a dictionary of repeat state of each webserver zone (key = control_id, value = repeat mode (repeat,norepeat)
 channels = {} # channels is a dictionary of control_id (key) and zone name (value)
-roon_playouts_raw = {} # zone name and their raw jsonString variant of three_line data (track,artist,album) of played song
-roon_playouts = {} # zone name and their json variant of three_line data (track,artist,album) of played song
+roon_zone_states = {} # zone name and their ZoneState of the played song (serialized as roon_playouts_raw and roon_playouts of the info data)
+roon_zone_reduced = {} # zone_id and (fingerprint, ZoneState) of the last roon zone event processed by reduce_roon_zone
+roon_zone_subscribers = [] # callbacks (zone, zone_state, last_zone_state), called once per processed roon zone event
+roon_zone_lock = threading.Lock()
 web_playouts_raw = {} # webserver zone name and their raw jsonString variant of data (track,artist,album) of played song
 web_playouts = {} # webserver zone name and their json variant of data (track,artist,album) of played song
+web_playouts_time = {} # time.monotonic() of the last update of web_playouts (key: zone name), to predict the end of the playing tracks
 jobs = {} # map of running threads
 jobcount = 0
 playcount = 0 # number of playouts
@@ -246,16 +261,45 @@ last_cover_text_line_parts = [] # list of coverplayer text line parts (backup to
 playpos_last = -1 # play position of active zone (backup to check for changes)
 playlen_last = -1 # play length of active zone (backup to check for changes)
 roon_zones = [] # list of actual roon zones
+glyph_width_tables = {} # advance width of each character code, per font (key: id of font)
+matrix_renderer = None # render thread which exclusively owns the led matrix device (roonmatrix device only)
 spotify_auth_url = ''
 spotify_auth_redirect_url = ''
 spotify_connect_authorized = False
 active_spotify_connect_zone = None
 spotify_devices = []
 webcheck_timer = None
+webcheck_polling = False # true if the last webserver check has polled the webserver and spotify connect zones (only while output is in progress)
+webcheck_drift = 1.5 # seconds after the predicted end of a track the webserver and spotify connect zones are checked again
+webcheck_idle_factor = 3 # the webcheck interval is multiplied by this factor while nothing is playing (slow heartbeat)
+web_request_loop = None # shared event loop with pooled http session for all async webserver requests
+web_request_loop_lock = threading.Lock()
+webserver_health = {} # online state of each webserver (key: name), webservers which are down are only probed again after an exponential backoff
+webserver_backoff_max = 300 # max seconds between two probes of a webserver which is down
+webserver_pushes = {} # last playout pushed by the now_playing agent of a webserver (key: name), a webserver with a recent push is not polled
+webserver_push_changes = set() # webserver names with a pushed playout change, which the next webserver check handles like a polled change (interrupt message)
+webserver_push_max_age = 90 # seconds a pushed playout is valid (now_playing agent sends a heartbeat every 30 seconds)
+roon_queues = {} # image keys of the queue items of the roon zones with a queue subscription (key: zone_id), used to prefetch the next covers
+query_cache = OrderedDict() # results of the roon, spotify and apple music browse calls (key: backend, function, normalized args), least recently used first
+query_cache_lock = threading.Lock()
+query_cache_size = 256 # max number of cached query results
+query_cache_ttl = {'search': 300, 'albums': 1800, 'tracks': 1800, 'playlists': 7200, 'genres': 21600} # seconds a query result of each type is valid
+applemusic_client = None # shared apple music client with pooled http session (applemusic_init)
+applemusic_client_key = None # credentials and expiration time of the developer token of applemusic_client
+applemusic_client_lock = threading.Lock()
+applemusic_token_seconds = 11 * 3600 # the developer token is valid for 12 hours, a new client is created one hour before
+applemusic_workers = 4 # independent apple music requests of one search run in parallel (applemusic_executor)
+applemusic_executor = ThreadPoolExecutor(max_workers=applemusic_workers)
 weather_timer = None
 callbacks_initialized = False
 reboot_python = False
-ws_update_queue = {}
+ws_clients = {} # connected websocket clients (key: connection id), each one is woken up in the event loop of its server (WebsocketClient)
+ws_client_ids = count(1)
+ws_ping_seconds = 15 # seconds between two pings of a websocket client
+ws_send_timeout = 5 # seconds, a client which does not take a message in time is dropped
+ws_ack_timeout = 10 # seconds, a client which does not acknowledge an info state version in time only gets a snapshot on its next answer
+ws_client_buffer = 16 # max pending notifications of a client, a client with a full buffer is dropped
+info_state = None # versioned info state for the websocket clients (InfoStateStore)
 ws_notification_queue = [];
 test_roon_discover = False # true: call RoonDiscovery to check for roon servers
 translation_hash = ''
@@ -369,12 +413,12 @@ def load_selected_zone_state():
     except:
         return None
 
-async def head_url(session, reqobj):
+async def head_url(session, reqobj, timeout=None):
    # Helper function to fetch a single URL asynchronously
     try:
         name = reqobj['name']
         url = reqobj['url']
-        async with session.head(url) as response:
+        async with session.head(url, timeout=timeout) as response:
             text = await response.text()
             return {
                 'url': url,
@@ -398,13 +442,13 @@ async def head_url(session, reqobj):
             'error': str(e)
         }
 
-async def fetch_url(session, reqobj):
+async def fetch_url(session, reqobj, timeout=None):
    # Helper function to fetch a single URL asynchronously
     try:
         name = reqobj['name']
         url = reqobj['url']
         if 'data' in reqobj:
-            async with session.post(url, data=reqobj['data']) as response:
+            async with session.post(url, data=reqobj['data'], timeout=timeout) as response:
                 text = await response.text()
                 return {
                     'url': url,
@@ -414,7 +458,7 @@ async def fetch_url(session, reqobj):
                     'text': text
                 }
         else:
-            async with session.get(url) as response:
+            async with session.get(url, timeout=timeout) as response:
                 text = await response.text()
                 return {
                     'url': url,
@@ -423,13 +467,14 @@ async def fetch_url(session, reqobj):
                     'length': len(text),
                     'text': text
                 }
-    except ClientConnectorError as e:
+    except (ClientConnectorError, asyncio.TimeoutError) as e:
         if errorlog is True:
             flexprint('aiohttp.ClientConnectorError', str(e))
         return {
             'url': url,
             'name': name,
-            'error': str(e)
+            'error': str(e) or 'timeout',
+            'unreachable': True # webserver is down (sleeping mac), not retried
         }
     except Exception as e:
         return {
@@ -439,14 +484,47 @@ async def fetch_url(session, reqobj):
         }
 
 async def async_web_requests(requestlist, get_head, timeout):
-    # Non-blocking implementation that fetches URLs concurrently
+    # Non-blocking implementation that fetches URLs concurrently (runs in the shared web request loop)
     timeout_obj = ClientTimeout(total = timeout)
-    async with ClientSession(timeout = timeout_obj) as session:
-        if get_head is True:
-            tasks = [head_url(session, reqobj) for reqobj in requestlist]
-        else:
-            tasks = [fetch_url(session, reqobj) for reqobj in requestlist]
-        return await asyncio.gather(*tasks)
+    session = await get_web_request_loop().get_session()
+    if get_head is True:
+        tasks = [head_url(session, reqobj, timeout_obj) for reqobj in requestlist]
+    else:
+        tasks = [fetch_url(session, reqobj, ClientTimeout(total = reqobj['timeout']) if 'timeout' in reqobj else timeout_obj) for reqobj in requestlist]
+    return await asyncio.gather(*tasks)
+
+class WebRequestLoop:
+    # one long-lived event loop in a background thread with a pooled http session (keep-alive connections and cached dns lookups), instead of a new loop, session and handshake per request
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.session = None
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    async def get_session(self):
+        # session is created inside the loop, as aiohttp requires
+        if self.session is None or self.session.closed:
+            connector = TCPConnector(limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=60)
+            self.session = ClientSession(connector=connector, timeout=ClientTimeout(total=webserver_url_request_timeout))
+        return self.session
+
+    def submit(self, coro):
+        # thread-safe: schedule a coroutine in the shared loop, returns a concurrent.futures.Future
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        return self.submit(coro).result(timeout)
+
+    def close(self):
+        if self.session is not None and self.session.closed is False:
+            self.run(self.session.close(), 5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+def get_web_request_loop():
+    global web_request_loop
+    with web_request_loop_lock:
+        if web_request_loop is None:
+            web_request_loop = WebRequestLoop()
+    return web_request_loop
 
 def sync_web_requests(requestlist, timeout):
     #blocking implementation that fetches multiple URLs
@@ -458,7 +536,7 @@ def sync_web_requests(requestlist, timeout):
         try:
             data = (parse.urlencode(reqobj['data']).encode()) if 'data' in reqobj else None
             req = Request(url, headers={'User-Agent': 'Mozilla/5.0'}, data=data)
-            response = urlopen(req, context=ssl_ctx, timeout=timeout)
+            response = urlopen(req, context=ssl_ctx, timeout=reqobj.get('timeout', timeout))
             text = response.read().decode('utf8')
             obj = {
                 'url': url,
@@ -473,17 +551,38 @@ def sync_web_requests(requestlist, timeout):
                 'name': name,
                 'error': str(e)
             }
+            if isinstance(e, OSError) and not isinstance(e, HTTPError):
+                obj['unreachable'] = True # connection error or timeout: webserver is down (sleeping mac), not retried
         finally:
             responses.append(obj)
     return responses
 
+def get_web_requests_to_retry(requestlist, results):
+    # indexes of requests to send (again): all on first try, then only failed ones. probes of webservers which are down and unreachable webservers
+    # (connection error or timeout) are not retried, they are marked down by update_webserver_health after the first try
+    if results is None:
+        return list(range(len(requestlist)))
+    return [idx for idx,data in enumerate(results) if 'error' in data and data.get('unreachable') is not True and requestlist[idx].get('probe') is not True]
+
+def merge_web_request_results(results, retry_idx, retry_results):
+    if results is None:
+        return retry_results
+    if retry_results is None or not isinstance(retry_results, list):
+        return results
+    for idx,data in zip(retry_idx, retry_results):
+        results[idx] = data
+    return results
+
 def async_web_requests_with_timing(requestlist):
     max_retry = 5
+    async_results = None
     
     for retry in range(1, max_retry + 1):
         err = ''
         req_start_time = time.time()
-        async_results = asyncio.run(async_web_requests(requestlist, False, webserver_url_request_timeout))
+        retry_idx = get_web_requests_to_retry(requestlist, async_results)
+        retry_results = get_web_request_loop().run(async_web_requests([requestlist[idx] for idx in retry_idx], False, webserver_url_request_timeout))
+        async_results = merge_web_request_results(async_results, retry_idx, retry_results)
         req_end_time = time.time()
         req_time = req_end_time - req_start_time
         if debug is True:
@@ -505,18 +604,21 @@ def async_web_requests_with_timing(requestlist):
         else:
             flexprint('[red]async_web_requests: lost response[/red]')
             async_results = []
-        if err == '':
+        if err == '' or len(get_web_requests_to_retry(requestlist, async_results)) == 0:
             break
     
     return [async_results,req_time]
 
 def sync_web_requests_with_timing(requestlist):
     max_retry = 5
+    sync_results = None
     
     for retry in range(1, max_retry + 1):
         err = ''
         req_start_time = time.time()
-        sync_results = sync_web_requests(requestlist, webserver_url_request_timeout)
+        retry_idx = get_web_requests_to_retry(requestlist, sync_results)
+        retry_results = sync_web_requests([requestlist[idx] for idx in retry_idx], webserver_url_request_timeout)
+        sync_results = merge_web_request_results(sync_results, retry_idx, retry_results)
         req_end_time = time.time()
         req_time = req_end_time - req_start_time
         if debug is True:
@@ -538,7 +640,7 @@ def sync_web_requests_with_timing(requestlist):
         else:
             flexprint('[red]sync_web_requests: lost response[/red]')
             sync_results = []
-        if err == '':
+        if err == '' or len(get_web_requests_to_retry(requestlist, sync_results)) == 0:
             break
     
     flexprint('sync_results: ' + str(sync_results))
@@ -801,9 +903,11 @@ def setGlobalVarsFromConfigData():
     #var['ipv4_only'] = eval(config['SYSTEM']['ipv4_only']) if 'ipv4_only' in config['SYSTEM'] else True # true: use only IPv4 (set to True if you have DSlite or IPv6 problems on web requests)
     var['alternative_layout'] = eval(config['SYSTEM']['alternative_layout']) if 'alternative_layout' in config['SYSTEM'] else False # true: use alternative keyboard layout (special buttons like lock, shift, BS, enter, moved to spacebar row to get more width for buttons), false: standard keyboard layout 
     var['searchresult_maxlength'] = int(config['SYSTEM']['searchresult_maxlength']) if 'searchresult_maxlength' in config['SYSTEM'] else 100 # max number of search results (Roon, Webserver, Spotify, Apple Music)
+    var['search_page_size'] = int(config['SYSTEM']['search_page_size']) if 'search_page_size' in config['SYSTEM'] else 10 # number of search results of the first page, further pages are added to the open list (Spotify, Apple Music)
 
     var['screensaver_seconds'] = int(config['SYSTEM']['screensaver_seconds']) if display_cover is True else 0 # screensaver timeout in seconds (0 = screensaver off)
     var['display_auto_wakeup'] = eval(config['SYSTEM']['display_auto_wakeup']) if display_cover is True else False # wakeup display on track updates
+    var['cover_prefetch_count'] = (int(config['SYSTEM']['cover_prefetch_count']) if 'cover_prefetch_count' in config['SYSTEM'] else 2) if display_cover is True else 0 # number of next tracks in the roon or spotify connect queue to prefetch the cover for (0 = off)
 
     var['playing_headline'] = config['LANGUAGE']['playing_headline'] # headline text to display in front of audio informations
     conversions = literal_eval(config['LANGUAGE']['conversions']) # language specific special utf-8 code char replacing to ascii code
@@ -964,8 +1068,8 @@ def getInfoData():
         "custom_message": custom_message,
         "custom_message_option": custom_message_option,
         "channels": channels,
-        "roon_playouts_raw": roon_playouts_raw,
-        "roon_playouts": roon_playouts,
+        "roon_playouts_raw": {name: zone_state.to_json() for name, zone_state in roon_zone_states.items()},
+        "roon_playouts": {name: zone_state.to_dict() for name, zone_state in roon_zone_states.items()},
         "web_playouts_raw": web_playouts_raw,
         "web_playouts": web_playouts,
         "jobs": len(jobs),
@@ -990,36 +1094,90 @@ def getInfoData():
         "config_updated_at": updated_at
     }
 
+class InfoStateStore:
+    # versioned info state for the websocket clients: each change gets a sequence number and a delta (changed keys) to the version before,
+    # so all changes since the last version a client acknowledged are sent coalesced in one small message
+    def __init__(self, max_deltas=32):
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.state = {}
+        self.deltas = deque(maxlen=max_deltas) # (seq, changed keys), clients with an older version get a snapshot
+
+    def update(self, data, force=False):
+        data = json.loads(json.dumps(data)) # decouple from the global dicts and lists, which are changed in place
+        with self.lock:
+            if force is False and self.seq > 0 and all(self.state.get(prop) == data.get(prop) for prop in infodata_props_to_check):
+                return None
+            changed = {key: value for key, value in data.items() if key not in self.state or self.state[key] != value}
+            self.seq += 1
+            self.state = data
+            self.deltas.append((self.seq, changed))
+            return self.seq
+
+    def get_message(self, client_seq, delta_protocol):
+        # message to bring a client from version client_seq to the actual version: delta, or snapshot (on first connect, resync or if the client is too far behind)
+        with self.lock:
+            if client_seq >= self.seq:
+                return None
+            if delta_protocol is True and client_seq > 0 and len(self.deltas) > 0 and self.deltas[0][0] <= client_seq + 1:
+                changed = {}
+                for seq, delta in self.deltas:
+                    if seq > client_seq:
+                        changed.update(delta)
+                return self.seq, {"type": "delta", "seq": self.seq, "base": client_seq, "changed": changed}
+            if delta_protocol is True:
+                return self.seq, {"type": "snapshot", "seq": self.seq, "data": self.state}
+            return self.seq, dict(self.state, seq=self.seq) # clients without delta protocol get the full info data, but only of the latest version
+
 def add_changed_data_to_websocket_queue():
-    global ws_update_queue
     data = getInfoData()
-    keys = list(ws_update_queue.keys())
-    flexprint('[bold magenta]websocket add_changed_data_to_websocket_queue, keys: ' + str(keys) + '[/bold magenta]')
-    for ip in keys:
+    if data['app_displaystr'] == '':
+        flexprint('[bold magenta]websocket ignore info state update[/bold magenta] => app_displaystr is empty')
+        return
+    seq = info_state.update(data)
+    if seq is None:
+        flexprint('[bold magenta]websocket ignore info state update[/bold magenta] => no change, app_displaystr: ' + data['app_displaystr'])
+    else:
+        flexprint('[bold magenta]websocket info state update to version ' + str(seq) + '[/bold magenta], app_displaystr: ' + data['app_displaystr'])
+        wake_websocket_clients()
+
+class WebsocketClient:
+    # state of one websocket connection, the handler waits in its event loop until it is woken up by a new info state version or a notification
+    def __init__(self, address, delta_protocol):
+        self.loop = asyncio.get_running_loop()
+        self.id = next(ws_client_ids)
+        self.address = address
+        self.delta_protocol = delta_protocol
+        self.seq = 0 # last info state version acknowledged by the client, 0: send a snapshot
+        self.wakeup = asyncio.Event()
+        self.notifications = asyncio.Queue(maxsize=ws_client_buffer)
+        self.error = None
+
+    def wake(self, notification=None):
+        # thread safe, called by the threads which change the info state or the notifications
         try:
-            queue = list(ws_update_queue[ip])
-            flexprint('[bold magenta]websocket add_changed_data_to_websocket_queue, ip: ' + str(ip) + ', len: ' + str(len(queue)) + '[/bold magenta]')
-            matched = False
-            for item in queue:
-                matched = True
-                for prop in infodata_props_to_check:
-                    if item[prop] != data[prop]:
-                        matched = False
-                        break
-                if matched == True:
-                    break
-    
-            if matched == False and data['app_displaystr'] != '':
-                flexprint('[bold magenta]websocket add item to queue for device with ip ' + str(ip) + '[/bold magenta], app_displaystr: ' + data['app_displaystr'])
-                queue.append(data)
-                if len(queue) > 3:
-                    ws_update_queue[ip] = queue[-3:]
-                else:
-                    ws_update_queue[ip] = queue
-            else:
-                flexprint('[bold magenta]websocket ignore item to add to ws_update_queue[/bold magenta] => ip: ' + str(ip) + ', matched: ' + str(matched) + ', queue length: ' + str(len(ws_update_queue[ip])) + ', app_displaystr: ' + data['app_displaystr'])
-        except Exception as e:
-            flexprint('[bold red]websocket error on update of ws_update_queue for device with ip ' + str(ip) + '[/bold red], error: ' + str(e))
+            self.loop.call_soon_threadsafe(self._wake, notification)
+        except RuntimeError:
+            pass # event loop of the websocket server is closed
+
+    def _wake(self, notification):
+        if notification is not None:
+            try:
+                self.notifications.put_nowait(notification)
+            except asyncio.QueueFull:
+                self.error = Exception('slow consumer, notification buffer is full')
+        self.wakeup.set()
+
+def wake_websocket_clients(notification=None):
+    for client in list(ws_clients.values()):
+        client.wake(notification)
+
+def publish_websocket_notification(notification):
+    # notifications are kept until the app removes them (remove_notification), clients which connect later get them on connect
+    if notification not in ws_notification_queue:
+        ws_notification_queue.append(notification)
+        flexprint('[bold red]send notification ' + str(notification) + ' to websocket clients...[/bold red]')
+        wake_websocket_clients(notification)
 
 def spotify_connect_web_auth(url):
     global spotify_auth_url
@@ -1039,6 +1197,8 @@ if with_restserver_fastapi is True:
             flexprint(f"[bold magenta]websocket ConnectionManager @ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] len: {len(self.active_connections)} , connections: {clients}")
 
         def disconnect(self, websocket: WebSocket):
+            if websocket not in self.active_connections:
+                return
             self.active_connections.remove(websocket)
             flexprint(f"[bold magenta]websocket ConnectionManager @ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] client disconnected: {websocket.client}")
 
@@ -1048,9 +1208,18 @@ if with_restserver_fastapi is True:
         async def send_text(self, message: str, websocket: WebSocket):
             await websocket.send_text(message)
 
+        async def receive_text(self, websocket: WebSocket):
+            return await websocket.receive_text()
+
+        async def close(self, websocket: WebSocket):
+            try:
+                await websocket.close()
+            except Exception:
+                pass # already closed
+
         async def broadcast(self, message: str):
-            for connection in self.active_connections:
-                await connection.send_text(message)
+            # concurrent fan-out, a slow client does not stall the others
+            await asyncio.gather(*[asyncio.wait_for(connection.send_text(message), ws_send_timeout) for connection in list(self.active_connections)], return_exceptions=True)
 else:
     class ConnectionManager:
         def __init__(self):
@@ -1062,6 +1231,8 @@ else:
             flexprint(f"[bold magenta]websocket ConnectionManager @ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] len: {len(self.active_connections)} , connections: {clients}")
 
         def disconnect(self, websocket):
+            if websocket not in self.active_connections:
+                return
             self.active_connections.remove(websocket)
             flexprint(f"[bold magenta]websocket ConnectionManager @ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] client disconnected: {websocket.remote_address}")
 
@@ -1071,9 +1242,76 @@ else:
         async def send_text(self, message: str, websocket):
             await websocket.send(message)
 
+        async def receive_text(self, websocket):
+            return await websocket.recv()
+
+        async def close(self, websocket):
+            try:
+                await websocket.close()
+            except Exception:
+                pass # already closed
+
         async def broadcast(self, message: str):
-            for connection in self.active_connections:
-                await connection.send(message)
+            # concurrent fan-out, a slow client does not stall the others
+            await asyncio.gather(*[asyncio.wait_for(connection.send(message), ws_send_timeout) for connection in list(self.active_connections)], return_exceptions=True)
+
+async def ping_websocket_client(websocket, client):
+    try:
+        while True:
+            await asyncio.sleep(ws_ping_seconds)
+            flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] ping client: {client.address}")
+            await asyncio.wait_for(ws_manager.send_text('ping', websocket), ws_send_timeout) # send ping every x seconds (ws_ping_seconds)
+    except Exception as e:
+        client.error = e # connection is lost or too slow, the handler raises it on wake up
+        client.wakeup.set()
+        await ws_manager.close(websocket) # ends a handler which waits for an answer of the client
+
+async def serve_websocket_client(websocket, client):
+    # sends the pending info state versions and notifications to the client, whenever it is woken up (instead of polling every second)
+    ws_clients[client.id] = client
+    ping_task = asyncio.create_task(ping_websocket_client(websocket, client))
+    try:
+        for notification in list(ws_notification_queue):
+            client.notifications.put_nowait(notification)
+        if info_state.seq == 0:
+            info_state.update(getInfoData()) # first version only, a new client (seq 0) gets a snapshot of the actual version without bumping it for all others
+        client.wakeup.set()
+        flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] client connected: {client.address}, delta protocol: {client.delta_protocol}, clients: {', '.join(str(c.address) for c in list(ws_clients.values()))}")
+
+        while True:
+            await client.wakeup.wait()
+            client.wakeup.clear()
+            if client.error is not None:
+                raise client.error
+            while not client.notifications.empty():
+                notification = client.notifications.get_nowait()
+                if notification in ws_notification_queue: # not removed in the meantime
+                    flexprint('[bold red]send notification ' + str(notification) + ' via websocket to: ' + str(client.address) + '[/bold red]')
+                    await asyncio.wait_for(ws_manager.send_text(notification, websocket), ws_send_timeout)
+            pending = info_state.get_message(client.seq, client.delta_protocol)
+            if pending is not None:
+                seq, data = pending
+                flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] sending info data version {seq} to: {client.address}")
+                await asyncio.wait_for(ws_manager.send_json(data, websocket), ws_send_timeout)
+                try:
+                    message = await asyncio.wait_for(ws_manager.receive_text(websocket), ws_ack_timeout)
+                except asyncio.TimeoutError:
+                    # slow client: no more pushes, wait for its (late) answer and send a snapshot then
+                    flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] no answer from {client.address}, switch to snapshot on demand")
+                    client.seq = 0
+                    message = await ws_manager.receive_text(websocket)
+                    client.wakeup.set()
+                    continue
+                flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] received from {client.address}: {message}")
+                if message == 'received':
+                    client.seq = seq
+                elif message == 'resync':
+                    client.seq = 0 # client lost track of the state, send a snapshot
+                client.wakeup.set() # check again, the state could have changed while waiting for the answer
+    finally:
+        ping_task.cancel()
+        ws_clients.pop(client.id, None)
+        await ws_manager.close(websocket)
 
 # --- REST SERVER START ---
 
@@ -1143,6 +1381,10 @@ if with_restserver_fastapi is True:
     async def rest_custom_message(payload: dict = Body(...)):
         return set_message(payload)
 
+    @app.post("/now_playing/")
+    async def rest_now_playing(payload: dict = Body(...)):
+        return set_now_playing(payload)
+
     @app.post("/livecontrol/")
     async def rest_live_control(payload: dict = Body(...)):
         return set_livecontrol(payload)
@@ -1153,44 +1395,17 @@ if with_restserver_fastapi is True:
 
     @wsapp.websocket("/ws")
     async def websocket_endpoint(websocket: WebSocket):
-        global ws_update_queue, ws_notification_queue
-        ws_ping_seconds = 15
-        last_ping = datetime.now()
         try:
             await ws_manager.connect(websocket)
-            ip = websocket.client.host
-            data = getInfoData()
-            ws_update_queue[ip] = [data]
-
-            flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] client connected: {websocket.client}, clients: {','.join(ws_update_queue.keys())}")
-        
-            while True:
-                await asyncio.sleep(1)
-                flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] clients: {','.join(ws_update_queue.keys())}, ")
-                if ip in ws_update_queue and len(ws_update_queue[ip]) > 0:
-                    data = ws_update_queue[ip][0]
-                    flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] sending info data to: {websocket.client}, app_displaystr: {data['app_displaystr']}")
-                    await ws_manager.send_json(data, websocket)
-                    message = await websocket.receive_text()
-                    flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] received from {websocket.client}: {message}")
-                    if message == 'received' and len(ws_update_queue[ip]) > 0:
-                        ws_update_queue[ip].pop(0)
-                        flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] pop queue from {websocket.client}, rest: {len(ws_update_queue[ip])}")
-                else:
-                    if (last_ping + timedelta(0,ws_ping_seconds)) < datetime.now():
-                        last_ping = datetime.now()
-                        flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] ping client: {websocket.client}")
-                        await ws_manager.send_text('ping', websocket) # send ping every x seconds (ws_ping_seconds)
-                    for notification in ws_notification_queue:
-                        flexprint('[bold red]send notification ' + str(notification) + ' via websocket broadcast...[/bold red]')
-                        await ws_manager.broadcast(notification) # send notification via broadcast
-                    
+            delta_protocol = websocket.query_params.get('protocol') == 'delta' # app opts in with: /ws?protocol=delta
+            await serve_websocket_client(websocket, WebsocketClient((websocket.client.host, websocket.client.port), delta_protocol))
         except WebSocketDisconnect:
-            ws_manager.disconnect(websocket)
+            pass
         except Exception as e:
             if errorlog is True:
                 flexprint(f"[bold red]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} websocket_endpoint error[/bold red]: {e}")
-                flexprint(str(data))
+        finally:
+            ws_manager.disconnect(websocket)
 else:
     # REST-Webserver without fastAPI plugin (for inapp server)
 
@@ -1289,6 +1504,10 @@ else:
                 self.send_json(set_message(payload))
                 return
 
+            if self.path == "/now_playing/":
+                self.send_json(set_now_playing(payload))
+                return
+
             if self.path == "/livecontrol/":
                 self.send_json(set_livecontrol(payload))
                 return
@@ -1315,48 +1534,23 @@ else:
     # ---------------------------------------------------------
 
     async def ws_handler(websocket):
-        global ws_update_queue, ws_notification_queue
-        if websocket.path != "/ws":
+        ws_path = parse.urlparse(websocket.path)
+        if ws_path.path != "/ws":
             flexprint("[bold magenta]websocket error: invalid path[/bold magenta]")
             await websocket.close()
             return
             
-        ws_ping_seconds = 15
-        last_ping = datetime.now()
         try:
             await ws_manager.connect(websocket)
-            ip = websocket.remote_address[0]
-            data = getInfoData()
-            ws_update_queue[ip] = [data]
-
-            flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] client connected: {websocket.remote_address}, clients: {','.join(ws_update_queue.keys())}")
-        
-            while True:
-                await asyncio.sleep(1)
-                flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] clients: {','.join(ws_update_queue.keys())}, ")
-                if ip in ws_update_queue and len(ws_update_queue[ip]) > 0:
-                    data = ws_update_queue[ip][0]
-                    flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] sending info data to: {websocket.remote_address}, app_displaystr: {data['app_displaystr']}")
-                    await ws_manager.send_json(data, websocket)
-                    message = await websocket.recv()
-                    flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] received from {websocket.remote_address}: {message}")
-                    if message == 'received' and len(ws_update_queue[ip]) > 0:
-                        ws_update_queue[ip].pop(0)
-                        flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] pop queue from {websocket.remote_address}, rest: {len(ws_update_queue[ip])}")
-                else:
-                    if (last_ping + timedelta(0,ws_ping_seconds)) < datetime.now():
-                        last_ping = datetime.now()
-                        flexprint(f"[bold magenta]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =>[/bold magenta] ping client: {websocket.remote_address}")
-                        await ws_manager.send_text('ping', websocket) # send ping every x seconds (ws_ping_seconds)
-                    for notification in ws_notification_queue:
-                        flexprint('[bold red]send notification ' + str(notification) + ' via websocket broadcast...[/bold red]')
-                        await ws_manager.broadcast(notification) # send messages via broadcast
+            delta_protocol = parse.parse_qs(ws_path.query).get('protocol') == ['delta'] # app opts in with: /ws?protocol=delta
+            await serve_websocket_client(websocket, WebsocketClient(websocket.remote_address[:2], delta_protocol))
         except websockets.exceptions.ConnectionClosedError:
-            ws_manager.disconnect(websocket)
+            pass
         except Exception as e:
             if errorlog is True:
                 flexprint(f"[bold red]websocket {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} websocket_endpoint error[/bold red]: {e}")
-                flexprint(str(data))
+        finally:
+            ws_manager.disconnect(websocket)
 
     def websocket_thread():
         global ws_loop
@@ -1394,7 +1588,7 @@ def start_restserver():
 def send_roon_activation_warning():
     if roon_show is True and core_ip is not None and core_ip.strip()!='' and core_port is not None and core_port.strip()!='' and str(core_port)!='0' and 'roon-activation-alert' not in ws_notification_queue:
         flexprint("[bold red]add roon activation warning to notifications queue[/bold red]")
-        ws_notification_queue.append('roon-activation-alert')
+        publish_websocket_notification('roon-activation-alert')
 
 # --- REST SERVER END ---
 
@@ -1680,6 +1874,55 @@ def init_matrix():
         if errorlog is True: flexprint('[red]init matrix error: ' + str(e) + '[/red]')
         return None
 
+class MatrixRenderer:
+    # single render thread which exclusively owns the led matrix device: all other threads submit frames or draw commands to a bounded queue, which are shown at the pace of their frame interval
+    def __init__(self, device, maxsize=8):
+        self.device = device
+        self.queue = Queue(maxsize=maxsize) # bounded: producers wait if they run ahead of the display
+        self.epoch = 0 # incremented on each interrupt, queued frames of an older epoch are dropped
+        self.epoch_changed = threading.Event()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        next_frame_time = time.monotonic()
+        last_epoch = self.epoch
+        while True:
+            epoch, command, interval = self.queue.get()
+            try:
+                if epoch != self.epoch:
+                    continue # frame of an interrupted playout
+                if epoch == last_epoch:
+                    delay = next_frame_time - time.monotonic()
+                    if delay > 0 and self.epoch_changed.wait(delay) is True and epoch != self.epoch:
+                        continue # interrupted while waiting for the frame time
+                last_epoch = epoch
+                self.epoch_changed.clear()
+                command(self.device)
+                next_frame_time = max(next_frame_time + interval, time.monotonic())
+            except Exception as e:
+                if errorlog is True: flexprint('[red]matrix renderer error: ' + str(e) + '[/red]')
+            finally:
+                self.queue.task_done()
+
+    def submit(self, command, interval=0, epoch=None):
+        # command is called with the device in the render thread, the next frame is shown after interval seconds
+        self.queue.put((self.epoch if epoch is None else epoch, command, interval))
+
+    def interrupt(self):
+        # drop all queued frames of the running playout
+        self.epoch += 1
+        self.epoch_changed.set()
+
+    def wait_until_shown(self):
+        self.queue.join()
+
+    def draw_text(self, xy, txt):
+        self.submit(lambda device: self.show_text(device, xy, txt))
+
+    def show_text(self, device, xy, txt):
+        with canvas(device) as draw:
+            text(draw, xy, txt, fill="white", font=text_font)
+
 def output():
     global output_in_progress, interrupt_message
 
@@ -1700,9 +1943,9 @@ def output():
 
             if is_raspberry_pi is True:
                 if vertical_output is True:
-                    show_message_vertical_interruptable(device, vert_strlines, fill="white", font=proportional(CP437_FONT))
+                    show_message_vertical_interruptable(device, vert_strlines, fill="white", font=text_font)
                 else:
-                    show_message_interruptable(device, displaystr, fill="white", font=proportional(CP437_FONT))
+                    show_message_interruptable(device, displaystr, fill="white", font=text_font)
             flexprint(datetime.now().strftime("%Y-%m-%d %H:%M:%S") + ' => playout done')
     except Exception as e:
         if errorlog is True: flexprint('[red]matrix output error: ' + str(e) + '[/red]')
@@ -1715,8 +1958,8 @@ def clear_display(type):
         return
 
     try:
-        with canvas(device) as draw:
-            text(draw, (0, 0), '', fill="white", font=proportional(CP437_FONT))
+        matrix_renderer.interrupt()
+        matrix_renderer.draw_text((0, 0), '')
     except Exception as e:
         if errorlog is True: flexprint('[red]clear display error: ' + str(e) + '[/red]')
 
@@ -2381,14 +2624,15 @@ def save_config(payload):
                     force_ipv4_only()
                 if spotify_connect is None:
                     try:
-                        spotify_connect = SpotifyConnect(is_app_embedded = is_app_embedded, display_cover = display_cover, log = log, force_ipv4_only = ipv4_only, enable_spotify_connect = enable_spotify_connect, client_id = spotify_client_id, client_secret = spotify_client_secret, spotify_connect_auth_url_callback = spotify_connect_web_auth)
+                        spotify_connect = SpotifyConnect(is_app_embedded = is_app_embedded, display_cover = display_cover, log = log, force_ipv4_only = ipv4_only, enable_spotify_connect = enable_spotify_connect, client_id = spotify_client_id, client_secret = spotify_client_secret, spotify_connect_auth_url_callback = spotify_connect_web_auth, cover_prefetch_callback = prefetch_covers, cover_prefetch_count = cover_prefetch_count)
                     except Exception as e:
                         flexprint("spotify_connect error:", e)
                 else:
                     spotify_connect_authorized = spotify_connect.get_spotify_connect_auth_state()
                     if spotify_connect_authorized is False:      
                         try:
-                            spotify_connect = SpotifyConnect(is_app_embedded = is_app_embedded, display_cover = display_cover, log = log, force_ipv4_only = ipv4_only, enable_spotify_connect = enable_spotify_connect, client_id = spotify_client_id, client_secret = spotify_client_secret, spotify_connect_auth_url_callback = spotify_connect_web_auth)
+                            spotify_connect.stop()
+                            spotify_connect = SpotifyConnect(is_app_embedded = is_app_embedded, display_cover = display_cover, log = log, force_ipv4_only = ipv4_only, enable_spotify_connect = enable_spotify_connect, client_id = spotify_client_id, client_secret = spotify_client_secret, spotify_connect_auth_url_callback = spotify_connect_web_auth, cover_prefetch_callback = prefetch_covers, cover_prefetch_count = cover_prefetch_count)
                         except Exception as e:
                             flexprint("spotify_connect error:", e)
                 if spotify_connect is not None:
@@ -2516,6 +2760,30 @@ def set_message(payload):
         if errorlog is True: flexprint('[red]set message error: ' + str(e) + '[/red]')
         return False
 
+def set_now_playing(payload):
+    # playout of a webserver zone, pushed by its now_playing agent on each state change (instead of waiting for the next poll)
+    try:
+        name = str(payload["name"])
+        zones = [data for data in webservers_zones if data['name'] == name]
+        flexprint('POST now_playing => name: ' + name)
+        if len(zones) == 0:
+            flexprint('[red]now_playing push of unknown webserver zone: ' + name + '[/red]')
+            return False
+
+        result = json.dumps(payload["playing"])
+        has_changed = name not in web_playouts_raw or compare_filtered_web_zonedata_is_equal(web_playouts_raw[name], result) is False
+        webserver_pushes[name] = {'text': result, 'time': datetime.now()}
+        update_webserver_health([{'name': name, 'status': 200}], True)
+        get_webserver_results_and_fast_updating_of_coverplayer_and_app(name, zones[0]['url'], result)
+        if has_changed is True:
+            webserver_push_changes.add(name)
+            if webcheck_timer is not None:
+                restart_webcheck_timer(0) # led matrix interrupt like a polled change, without waiting for the next check
+        return True
+    except Exception as e:
+        if errorlog is True: flexprint('[red]set now playing error: ' + str(e) + '[/red]')
+        return False
+
 def remove_notification(payload):
     global ws_notification_queue
 
@@ -2551,7 +2819,8 @@ def set_livecontrol(payload):
             if livecontrol_control == 'led_contrast':
                 led_contrast = int(livecontrol_value)
                 config['SYSTEM']['led_contrast'] = livecontrol_value
-                device.contrast(led_contrast)
+                if matrix_renderer is not None:
+                    matrix_renderer.submit(lambda device: device.contrast(led_contrast))
 
         config['SYSTEM']['password'] = '********' # set roonmatrix password placeholder with default value
         del config['SYSTEM']['password']
@@ -2583,8 +2852,7 @@ def get_next_fetch_output_time(msg, font=None, scroll_delay=0.03):
             if display_cover is True or is_raspberry_pi is False or is_app_embedded is True:
                 estimated_seconds = 20 # fake time to limit api calls in display_cover mode
             else:
-                with canvas(device) as draw:
-                    w, h = textsize(msg, font)
+                w = textsize_width(msg, font)
                 x = device.width
                 fullwidth = w + x
                 estimated_seconds = round(fullwidth/fps)
@@ -2598,6 +2866,62 @@ def get_next_fetch_output_time(msg, font=None, scroll_delay=0.03):
         if errorlog is True: flexprint('[red]get next fetch output time error: ' + str(e) + '[/red]')
         return None
 
+class ScrollBitmap:
+    # message pre-rendered once into a packed column bitmap (one byte per column, bit 0 = top led row), each scroll frame is only a slice of it written straight to the max7219 digit registers
+    bit_reverse = bytes(int('{:08b}'.format(i)[::-1], 2) for i in range(256)) # translation table to mirror the 8 rows of a register byte
+
+    def __init__(self, device, msg, font, y_offset=0):
+        self.device = device
+        self.width = device.width
+        self.cascaded = device.cascaded
+        self.digit_0 = max7219_const.DIGIT_0
+
+        columns = bytearray(self.width) # blank lead-in (message starts right outside the display)
+        for c in msg:
+            columns.extend((byte << y_offset) & 0xFF for byte in font[ord(c)])
+        self.text_width = len(columns) - self.width
+        columns.extend(bytes(self.width + 8)) # blank lead-out (plus one block to read full windows at the end)
+
+        # digit planes: plane[digit][x] is the register byte of a led block whose left column is at x
+        if led_block_orientation == 90 or led_block_orientation == -90:
+            rows = self.get_row_windows(columns)
+            if led_block_orientation == 90:
+                self.planes = [rows[digit].translate(self.bit_reverse) for digit in range(8)]
+            else:
+                self.planes = [rows[7 - digit] for digit in range(8)]
+        elif led_block_orientation == 180:
+            columns_reversed = columns.translate(self.bit_reverse)
+            self.planes = [columns_reversed[7 - digit:] for digit in range(8)]
+        else:
+            self.planes = [columns[digit:] for digit in range(8)]
+
+        self.buf = bytearray(2 * self.cascaded)
+
+    def get_row_windows(self, columns):
+        # rows[r][x]: led row r of the 8 columns starting at x (bit k = column x+k), needed for rotated led blocks
+        rows = []
+        for r in range(8):
+            bits = bytes((byte >> r) & 1 for byte in columns)
+            window = 0
+            for k in range(7, -1, -1):
+                window = (window << 1) | bits[k]
+            row = bytearray(len(columns) - 7)
+            for x in range(len(row) - 1):
+                row[x] = window
+                window = (window >> 1) | (bits[x + 8] << 7)
+            row[-1] = window
+            rows.append(row)
+        return rows
+
+    def show_frame(self, pos):
+        # max7219 chain expects the last block first, unless the blocks are arranged in reverse order
+        step = 8 * self.cascaded
+        for digit in range(8):
+            self.buf[0::2] = bytes([self.digit_0 + digit]) * self.cascaded
+            blocks = self.planes[digit][pos:pos + step:8]
+            self.buf[1::2] = blocks if led_inreverse else blocks[::-1]
+            self.device.data(list(self.buf))
+
 def show_message_interruptable(device, msg, y_offset=0, fill=None, font=None):
     global interrupt_message, fetch_output_time
 
@@ -2609,34 +2933,43 @@ def show_message_interruptable(device, msg, y_offset=0, fill=None, font=None):
         scroll_delay = led_scroll_delay/1000
         led_scroll_delay_active = led_scroll_delay
         fps = 0 if scroll_delay == 0 else (1.0 / scroll_delay)
-        regulator = framerate_regulator(fps)
+        epoch = matrix_renderer.epoch # frames are dropped by the renderer, if the playout gets interrupted
 
         font = font or DEFAULT_FONT
-        with canvas(device) as draw:
-            w, h = textsize(msg, font)
         x = device.width
-        fullwidth = w + x
 
-        virtual = viewport(device, width=fullwidth + x, height=device.height)
+        if led_rotate == 0 and device.height == 8:
+            bitmap = ScrollBitmap(device, msg, font, y_offset)
+            w = bitmap.text_width
+            show_frame = lambda device, i: bitmap.show_frame(i)
+        else:
+            # fallback for rotated displays: scroll a luma viewport
+            w = textsize_width(msg, font)
+            fullwidth = w + x
+
+            virtual = viewport(device, width=fullwidth + x, height=device.height)
 
-        with canvas(virtual) as draw:
-            text(draw, (x, y_offset), msg, font=font, fill=fill)
+            def draw_virtual(device):
+                with canvas(virtual) as draw:
+                    text(draw, (x, y_offset), msg, font=font, fill=fill)
+            matrix_renderer.submit(draw_virtual, epoch=epoch)
+            show_frame = lambda device, i: virtual.set_position((i, 0))
 
         i = 0
         while i <= w + x and interrupt_message is False and do_set_zone_control is False:
-            with regulator:
-                virtual.set_position((i, 0))
-                i += 1
+            # blocks while the frame queue is full, so the loop runs at the pace of the render thread
+            matrix_renderer.submit(partial(show_frame, i=i), scroll_delay, epoch)
+            i += 1
             
             if led_scroll_delay_active != led_scroll_delay:
                 led_scroll_delay_active = led_scroll_delay
                 scroll_delay = led_scroll_delay/1000
                 fps = 0 if scroll_delay == 0 else (1.0 / scroll_delay)
-                regulator = framerate_regulator(fps)
                 dots_rest = 1 + w + x - i
                 estimated_seconds = ceil(dots_rest/fps)
                 fetch_output_time = get_next_fetch_output_time_relative(estimated_seconds)
 
+        matrix_renderer.wait_until_shown()
         interrupt_message = False
 
         if do_set_zone_control is True:
@@ -2655,40 +2988,41 @@ def show_message_vertical_interruptable(device, lines, y_offset=0, fill=None, fo
         scroll_delay = led_vertical_scroll_delay/1000
         led_vertical_scroll_delay_active = led_vertical_scroll_delay
         fps = 0 if scroll_delay == 0 else (1.0 / scroll_delay)
-        regulator = framerate_regulator(fps)
+        epoch = matrix_renderer.epoch # frames are dropped by the renderer, if the playout gets interrupted
         
         font = font or DEFAULT_FONT
         virtual = viewport(device, width=device.width, height=device.height * (len(lines) + 2))
 
-        with canvas(virtual) as draw:
-            for idx,line in enumerate(lines):
-                w, h = textsize(line, font)
-                x_offset = 0
-                if w < device.width:
-                    x_offset = (device.width - w) / 2
-                text(draw, (x_offset, y_offset + device.height * (idx+1)), line, font=font, fill=fill)
+        def draw_virtual(device):
+            with canvas(virtual) as draw:
+                for idx,line in enumerate(lines):
+                    w = textsize_width(line, font)
+                    x_offset = 0
+                    if w < device.width:
+                        x_offset = (device.width - w) / 2
+                    text(draw, (x_offset, y_offset + device.height * (idx+1)), line, font=font, fill=fill)
+        matrix_renderer.submit(draw_virtual, epoch=epoch)
 
         y = 0
         for row in range(1, len(lines)+2):
             while y <= device.height * row and interrupt_message is False and do_set_zone_control is False:
-                with regulator:
-                    virtual.set_position((0, y))
-                    y += 1
+                matrix_renderer.submit(partial(lambda device, y: virtual.set_position((0, y)), y=y), scroll_delay, epoch)
+                y += 1
 
                 if led_vertical_scroll_delay_active != led_vertical_scroll_delay:
                     led_vertical_scroll_delay_active = led_vertical_scroll_delay
                     scroll_delay = led_vertical_scroll_delay/1000
                     fps = 0 if scroll_delay == 0 else (1.0 / scroll_delay)
-                    regulator = framerate_regulator(fps)
                     lines_rest = len(lines) + 1 - row
                     dots_rest = 1 + (len(lines) + 1) * device.height - y
                     estimated_seconds = lines_rest * vertical_scroll_delay + ceil(dots_rest/fps)
                     fetch_output_time = get_next_fetch_output_time_relative(estimated_seconds)
 
-            time.sleep(vertical_scroll_delay)
+            matrix_renderer.submit(lambda device: None, vertical_scroll_delay, epoch) # hold the line on the display
             if interrupt_message is True or do_set_zone_control is True:
                 break
 
+        matrix_renderer.wait_until_shown()
         interrupt_message = False
 
         if do_set_zone_control is True:
@@ -2752,24 +3086,71 @@ def moveActualPlayerToFirstPosInWebserverZoneList(webservers_zones):
     return webservers_zones
 
 def get_active_zones_from_webserver_onlinecheck(update):
+    # no separate online check: a webserver is online, if its last request was successful. webservers which are down are only requested again (as probe with a short timeout), if their backoff time is over
     active_zones = []
 
     try:
+        now = datetime.now()
         for idx,data in enumerate(webservers_zones,1):
             name = data['name']
-            url = data['url']
-            online = is_url_active(url,webserver_head_request_timeout)
-            if update is True:
-                update_webserver_channels(name, online)
-            if debug is True: flexprint('online check of webserver ' + name + ': ' + str(online))
-            if online is True:
+            health = webserver_health.get(name)
+            if health is None or health['online'] is True:
                 active_zones.append(data)
+            elif now >= health['next_check']:
+                if debug is True: flexprint('online check of webserver ' + name + ' (probe ' + str(health['failures']) + ')')
+                active_zones.append(dict(data, timeout=webserver_head_request_timeout, probe=True))
             else:
+                if update is True:
+                    update_webserver_channels(name, False)
                 flexprint('Webserver ' + name + ' is down')
     except Exception as e:
         if errorlog is True: flexprint('[red]get active zones from webserver onlinecheck error: ' + str(e) + '[/red]')                
     return active_zones
 
+def update_webserver_health(web_results, update):
+    try:
+        now = datetime.now()
+        for data in web_results:
+            name = data['name']
+            online = 'status' in data
+            health = webserver_health.get(name, {'online': True, 'failures': 0, 'next_check': now})
+            if online is True:
+                health = {'online': True, 'failures': 0, 'next_check': now}
+            else:
+                failures = health['failures'] + 1
+                backoff = min(webcheck_update_interval * 2 ** (failures - 1), webserver_backoff_max)
+                health = {'online': False, 'failures': failures, 'next_check': now + timedelta(0,backoff)}
+                flexprint('Webserver ' + name + ' is down, next check in ' + str(backoff) + ' seconds')
+            webserver_health[name] = health
+            if update is True:
+                update_webserver_channels(name, online)
+            if debug is True: flexprint('online check of webserver ' + name + ': ' + str(online))
+    except Exception as e:
+        if errorlog is True: flexprint('[red]update webserver health error: ' + str(e) + '[/red]')
+
+def get_webserver_zone_results(update):
+    # request all webserver zones concurrently, the response is the online check too. zones with a recent push of their now_playing agent are taken from the push
+    active_zones = get_active_zones_from_webserver_onlinecheck(update)
+    now = datetime.now()
+    pushed = {}
+    for data in active_zones:
+        push = webserver_pushes.get(data['name'])
+        if push is not None and (now - push['time']).total_seconds() <= webserver_push_max_age:
+            pushed[data['name']] = {'url': data['url'], 'name': data['name'], 'status': 200, 'length': len(push['text']), 'text': push['text']}
+    request_zones = [data for data in active_zones if data['name'] not in pushed]
+
+    if with_async_request is True:
+        web_response = async_web_requests_with_timing(request_zones)
+    else:
+        web_response = sync_web_requests_with_timing(request_zones)
+    update_webserver_health(web_response[0], update)
+
+    if len(pushed) > 0:
+        requested = iter(web_response[0])
+        web_results = [pushed[data['name']] if data['name'] in pushed else next(requested, None) for data in active_zones] # keep order of zones
+        web_response[0] = [data for data in web_results if data is not None]
+    return web_response
+
 def spotify_connect_enabled():
     return enable_spotify_connect is True and spotify_connect is not None and spotify_connect_authorized is True
 
@@ -2830,12 +3211,8 @@ def is_audioinfo_available():
 
     try:
         if check_audioinfo is True and webservers_show is True:
-            active_zones = get_active_zones_from_webserver_onlinecheck(False)
+            web_response = get_webserver_zone_results(False)
             active_spotify_connect_zone = get_active_zone_from_spotify_connect_onlinecheck(False)
-            if with_async_request is True:
-                web_response = async_web_requests_with_timing(active_zones)
-            else:
-                web_response = sync_web_requests_with_timing(active_zones)
             
             web_results = web_response[0]
             req_time = web_response[1]          
@@ -3207,8 +3584,7 @@ def pressed_left(channel):
                     if channels[control_id_update]=='webserver':
                         name = name.replace(' ','')
 
-                    with canvas(device) as draw:
-                        text(draw, (0, 0), get_message('control zone') + get_zone_control_shortname(': ') + get_zone_control_shortname(name), fill="white", font=proportional(CP437_FONT))
+                    matrix_renderer.draw_text((0, 0), get_message('control zone') + get_zone_control_shortname(': ') + get_zone_control_shortname(name))
             else:
                 play_previous(control_id)
             time.sleep(0.1)
@@ -3243,8 +3619,7 @@ def pressed_right(channel):
                     if channels[control_id_update]=='webserver':
                         name = name.replace(' ','')
 
-                    with canvas(device) as draw:
-                        text(draw, (0, 0), get_message('control zone') + get_zone_control_shortname(': ') + get_zone_control_shortname(name), fill="white", font=proportional(CP437_FONT))
+                    matrix_renderer.draw_text((0, 0), get_message('control zone') + get_zone_control_shortname(': ') + get_zone_control_shortname(name))
             else:
                 play_next(control_id)
             time.sleep(0.1)
@@ -3390,7 +3765,7 @@ def getPlaystateFromPlayouts():
                         break
         if control_id is not None and control_id in channels.keys() and channels[control_id]!='webserver' and channels[control_id]!='spotifyconnect':
             zoneName = channels[control_id]
-            idle = zoneName in roon_playouts and 'status' in roon_playouts[zoneName] and roon_playouts[zoneName]['status'] == 'not running'
+            idle = zoneName in roon_zone_states and roon_zone_states[zoneName].status == 'not running'
             playmode[control_id] = 'stop' if idle is True else 'play'
         return idle is False
     except Exception as e:
@@ -3413,7 +3788,7 @@ def getShufflestateFromPlayouts():
                         break
         if control_id is not None and control_id in channels.keys() and channels[control_id]!='webserver' and channels[control_id]!='spotifyconnect':
             zoneName = channels[control_id]
-            shuffle = zoneName in roon_playouts and 'shuffle' in roon_playouts[zoneName] and roon_playouts[zoneName]['shuffle'] == True
+            shuffle = zoneName in roon_zone_states and roon_zone_states[zoneName].shuffle == True
             shufflemode[control_id] = 'shuffle' if shuffle is True else 'noshuffle'
     except Exception as e:
         if errorlog is True: flexprint('[red]getShufflestateFromPlayouts error: ' + str(e) + '[/red]')            
@@ -3435,7 +3810,7 @@ def getRepeatstateFromPlayouts():
                         break
         if control_id is not None and control_id in channels.keys() and channels[control_id]!='webserver' and channels[control_id]!='spotifyconnect':
             zoneName = channels[control_id]
-            repeat = zoneName in roon_playouts and 'repeat' in roon_playouts[zoneName] and roon_playouts[zoneName]['repeat'] == True
+            repeat = zoneName in roon_zone_states and roon_zone_states[zoneName].repeat == True
             repeatmode[control_id] = 'repeat' if repeat is True else 'norepeat'
     except Exception as e:
         if errorlog is True: flexprint('[red]getRepeatstateFromPlayouts error: ' + str(e) + '[/red]')            
@@ -3636,6 +4011,32 @@ def on_control_click(action):
         if errorlog is True: flexprint('[red]on control click error: ' + str(e) + '[/red]')
     return [is_playing, shuffle_on, repeat_on, track_id]
 
+def cached_query(backend, type):
+    # caches the results of a browse function (search results for minutes, playlists and genres for hours)
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args):
+            normalized = tuple(arg.strip().casefold() if (type == 'search' and isinstance(arg, str)) else arg for arg in args)
+            key = (backend, func.__name__, normalized)
+            now = time.monotonic()
+            with query_cache_lock:
+                entry = query_cache.get(key)
+                if entry is not None and entry[0] > now:
+                    query_cache.move_to_end(key)
+                    return deepcopy(entry[1])
+            result = func(*args)
+            if result is None or isinstance(result, str) or len(result) == 0:
+                return result # errors (message or empty result) are not cached
+            with query_cache_lock:
+                query_cache[key] = (now + query_cache_ttl[type], deepcopy(result))
+                query_cache.move_to_end(key)
+                while len(query_cache) > query_cache_size:
+                    query_cache.popitem(last = False)
+            return result
+        return wrapper
+    return decorator
+
+@cached_query('roon', 'search')
 def roon_get_artists(output_id, name):
     try:
         artists = roonapi.list_media(output_id, ["Library", "Artists", name ])
@@ -3665,6 +4066,7 @@ def roon_get_artists(output_id, name):
     except Exception as e:
         return []
 
+@cached_query('roon', 'genres')
 def roon_get_genres(output_id, name):
     try:
         if name == '':
@@ -3687,6 +4089,7 @@ def roon_get_genres(output_id, name):
     except Exception as e:
         return []
 
+@cached_query('roon', 'genres')
 def roon_get_genre_artists(output_id, genre):
     try:
         artists = roonapi.list_media(output_id,["Genres", genre, "Artists", '__all__'])
@@ -3698,6 +4101,7 @@ def roon_get_genre_artists(output_id, genre):
     except Exception as e:
         return []
 
+@cached_query('roon', 'playlists')
 def roon_get_radios(output_id, name):
     try:
         if name == '':
@@ -3724,6 +4128,7 @@ def roon_get_radios(output_id, name):
     except Exception as e:
         return []
 
+@cached_query('roon', 'albums')
 def roon_get_artist_albums(output_id, artist):
     try:
         albums = roonapi.list_media(output_id, ["Library", "Artists", artist, '__all__'])
@@ -3743,6 +4148,7 @@ def roon_get_artist_albums(output_id, artist):
     except Exception as e:
         return []
 
+@cached_query('roon', 'tracks')
 def roon_get_artist_album_tracks(output_id, artist, album):
     try:
         tracks = roonapi.list_media(output_id, ["Library", "Artists", artist, album, '__all__'])
@@ -3752,6 +4158,7 @@ def roon_get_artist_album_tracks(output_id, artist, album):
     except Exception as e:
         return []
 
+@cached_query('roon', 'search')
 def roon_get_tracks(output_id, track):
     try:
         tracks = roonapi.list_media(output_id, ["Library", "Tracks", track])
@@ -3770,6 +4177,7 @@ def roon_get_tracks(output_id, track):
     except Exception as e:
         return []
 
+@cached_query('roon', 'playlists')
 def roon_get_playlists(output_id, name):
     try:
         if name == '':
@@ -3798,6 +4206,7 @@ def roon_get_playlists(output_id, name):
     except Exception as e:
         return []
 
+@cached_query('roon', 'playlists')
 def roon_get_playlist_tracks(output_id, playlist):
     try:
         tracks = roonapi.list_media(output_id, ["Playlists", playlist, '__all__'])
@@ -3810,33 +4219,47 @@ def roon_get_playlist_tracks(output_id, playlist):
         return []
 
 def applemusic_init():
+    global applemusic_client, applemusic_client_key
     if applemusic_team_id=='' or applemusic_key_id=='' or applemusic_secret_key=='':
         return coverplayer_lang['applemusic_no_credentials']
 
-    try:
-        am = applemusicpy.AppleMusic(
-            secret_key=applemusic_secret_key,
-            team_id=applemusic_team_id,
-            key_id=applemusic_key_id,
-            requests_timeout=10,
-            max_retries=3,
-            requests_session=False
-        )
-    except Exception as e:
-        flexprint("AppleMusic auth error:", e)
-        return coverplayer_lang['applemusic_auth_error']
+    credentials = (applemusic_team_id, applemusic_key_id, applemusic_secret_key)
+    with applemusic_client_lock:
+        # reuse the client (signed developer token and keep-alive connections) until the token expires or the credentials change
+        if applemusic_client is not None and applemusic_client_key[0] == credentials and applemusic_client_key[1] > time.time():
+            return applemusic_client
+
+        try:
+            am = applemusicpy.AppleMusic(
+                secret_key=applemusic_secret_key,
+                team_id=applemusic_team_id,
+                key_id=applemusic_key_id,
+                requests_timeout=10,
+                max_retries=3,
+                requests_session=True
+            )
+            if isinstance(getattr(am, '_session', None), requests.Session):
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=applemusic_workers)
+                am._session.mount('https://', adapter)
+        except Exception as e:
+            flexprint("AppleMusic auth error:", e)
+            return coverplayer_lang['applemusic_auth_error']
+
+        applemusic_client = am
+        applemusic_client_key = (credentials, time.time() + applemusic_token_seconds)
 
     flexprint('applemusic_init auth ok')
     return am
 
-def applemusic_search_artist(artist_name):
+@cached_query('applemusic', 'search')
+def applemusic_search_artist(artist_name, offset=0):
     try:
         am = applemusic_init()
         if isinstance(am, str):
             return am
 
         req_start_time = time.time()
-        results = am.search(artist_name, types=['artists'], limit=searchresult_maxlength)
+        results = am.search(artist_name, types=['artists'], limit=search_page_size, offset=offset)
         req_end_time = time.time()
         req_time = req_end_time - req_start_time
         flexprint(f"applemusic request time: {req_time:.2f} seconds")
@@ -3854,6 +4277,7 @@ def applemusic_search_artist(artist_name):
             flexprint('applemusic_search_artist error: ' + str(e))
         return []
 
+@cached_query('applemusic', 'genres')
 def applemusic_genres():
     try:
         am = applemusic_init()
@@ -3879,14 +4303,15 @@ def applemusic_genres():
             flexprint('applemusic_genres error: ' + str(e))
         return []
 
-def applemusic_station(stations_name):
+@cached_query('applemusic', 'search')
+def applemusic_station(stations_name, offset=0):
     try:
         am = applemusic_init()
         if isinstance(am, str):
             return am
 
         req_start_time = time.time()
-        results = am.search(stations_name, types=['stations'], limit=searchresult_maxlength)
+        results = am.search(stations_name, types=['stations'], limit=search_page_size, offset=offset)
         req_end_time = time.time()
         req_time = req_end_time - req_start_time
         flexprint(f"applemusic request time: {req_time:.2f} seconds")
@@ -3904,14 +4329,15 @@ def applemusic_station(stations_name):
             flexprint('applemusic_station error: ' + str(e))
         return []
 
-def applemusic_get_albums_by_artist_name(artist_name):
+@cached_query('applemusic', 'search')
+def applemusic_get_albums_by_artist_name(artist_name, offset=0, limit=None):
     try:
         am = applemusic_init()
         if isinstance(am, str):
             return am
 
         req_start_time = time.time()
-        results = am.search(artist_name, types=['albums'], limit=searchresult_maxlength)
+        results = am.search(artist_name, types=['albums'], limit=limit if limit is not None else search_page_size, offset=offset)
         req_end_time = time.time()
         req_time = req_end_time - req_start_time
         flexprint(f"applemusic request time: {req_time:.2f} seconds")
@@ -3931,6 +4357,7 @@ def applemusic_get_albums_by_artist_name(artist_name):
             flexprint('applemusic_get_albums_by_artist_name error: ' + str(e))
         return []
 
+@cached_query('applemusic', 'search')
 def applemusic_get_albums_by_albumname(album_name):
     try:
         am = applemusic_init()
@@ -3958,14 +4385,15 @@ def applemusic_get_albums_by_albumname(album_name):
             flexprint('applemusic_get_albums_by_albumname error: ' + str(e))
         return []
 
-def applemusic_get_artist_relationship(artist_id,relationship):
+@cached_query('applemusic', 'albums')
+def applemusic_get_artist_relationship(artist_id,relationship, offset=0):
     try:
         am = applemusic_init()
         if isinstance(am, str):
             return am
 
         req_start_time = time.time()
-        results = am.artist_relationship(artist_id, relationship=relationship, limit=searchresult_maxlength)
+        results = am.artist_relationship(artist_id, relationship=relationship, limit=search_page_size, offset=offset)
         req_end_time = time.time()
         req_time = req_end_time - req_start_time
         flexprint(f"applemusic request time: {req_time:.2f} seconds")
@@ -3985,6 +4413,7 @@ def applemusic_get_artist_relationship(artist_id,relationship):
             flexprint('applemusic_get_artist_relationship error: ' + str(e))
         return []
 
+@cached_query('applemusic', 'playlists')
 def applemusic_get_playlist_relationship(playlist_id, relationship):    
     try:
         am = applemusic_init()
@@ -4013,6 +4442,7 @@ def applemusic_get_playlist_relationship(playlist_id, relationship):
             flexprint('applemusic_get_playlist_tracks error: ' + str(e))
         return []
 
+@cached_query('applemusic', 'playlists')
 def applemusic_get_playlist_tracks(playlist_id):
     try:
         am = applemusic_init()
@@ -4043,6 +4473,7 @@ def applemusic_get_playlist_tracks(playlist_id):
             flexprint('applemusic_get_playlist_tracks error: ' + str(e))
         return []
 
+@cached_query('applemusic', 'tracks')
 def applemusic_get_album_tracks(album_id):
     try:
         am = applemusic_init()
@@ -4068,14 +4499,25 @@ def applemusic_get_album_tracks(album_id):
             flexprint('applemusic_get_album_tracks error: ' + str(e))
         return []
 
-def applemusic_search_track(track_name):
+def applemusic_prefetch_album_tracks(albums):
+    # the tracks of the first albums of a list are fetched in parallel into the query cache, a click on one of them is answered from the cache
+    try:
+        if isinstance(albums, list):
+            for album in albums[:applemusic_workers]:
+                if isinstance(album, dict) and 'id' in album:
+                    applemusic_executor.submit(applemusic_get_album_tracks, album['id'])
+    except Exception as e:
+        if errorlog is True: flexprint('[red]applemusic prefetch album tracks error: ' + str(e) + '[/red]')
+
+@cached_query('applemusic', 'search')
+def applemusic_search_track(track_name, offset=0):
     try:
         am = applemusic_init()
         if isinstance(am, str):
             return am
 
         req_start_time = time.time()
-        results = am.search(track_name, types=['songs'], limit=searchresult_maxlength)
+        results = am.search(track_name, types=['songs'], limit=search_page_size, offset=offset)
         req_end_time = time.time()
         req_time = req_end_time - req_start_time
         flexprint(f"applemusic request time: {req_time:.2f} seconds")
@@ -4093,14 +4535,15 @@ def applemusic_search_track(track_name):
             flexprint('applemusic_search_track error: ' + str(e))
         return []
 
-def applemusic_search_playlist(playlist_name):
+@cached_query('applemusic', 'search')
+def applemusic_search_playlist(playlist_name, offset=0):
     try:
         am = applemusic_init()
         if isinstance(am, str):
             return am
 
         req_start_time = time.time()
-        results = am.search(playlist_name, types=['playlists'], limit=searchresult_maxlength)
+        results = am.search(playlist_name, types=['playlists'], limit=search_page_size, offset=offset)
         req_end_time = time.time()
         req_time = req_end_time - req_start_time
         flexprint(f"applemusic request time: {req_time:.2f} seconds")
@@ -4118,17 +4561,18 @@ def applemusic_search_playlist(playlist_name):
             flexprint('applemusic_search_playlist error: ' + str(e))
         return []
 
-def spotify_search_artist(artist_name):
+@cached_query('spotify', 'search')
+def spotify_search_artist(artist_name, offset=0):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
-        limit=searchresult_maxlength
+        limit=search_page_size
         if limit > 50:
             limit = 50
 
-        results = spotify.search(artist_name, limit=limit, type='artist')
+        results = spotify.search(artist_name, limit=limit, offset=offset, type='artist')
         if 'artists' not in results or len(results['artists']) == 0:
             return []
 
@@ -4137,9 +4581,10 @@ def spotify_search_artist(artist_name):
     except Exception as e:
         return []
 
+@cached_query('spotify', 'search')
 def spotify_search_artist_album(artist_name, album_name):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
@@ -4158,9 +4603,10 @@ def spotify_search_artist_album(artist_name, album_name):
     except Exception as e:
         return None
 
+@cached_query('spotify', 'search')
 def spotify_search_artists_by_genre(genre_name):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
@@ -4177,17 +4623,18 @@ def spotify_search_artists_by_genre(genre_name):
     except Exception as e:
         return []
 
-def spotify_search_playlists_by_genre(genre_name):
+@cached_query('spotify', 'search')
+def spotify_search_playlists_by_genre(genre_name, offset=0):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
-        limit=searchresult_maxlength
+        limit=search_page_size
         if limit > 50:
             limit = 50
 
-        results = spotify.search('' + ' genre:' + genre_name, limit=limit, type='playlist')
+        results = spotify.search('' + ' genre:' + genre_name, limit=limit, offset=offset, type='playlist')
         if 'playlists' not in results or 'items' not in results['playlists'] or len(results['playlists']) == 0 or len(results['playlists']['items']) == 0:
             return []
 
@@ -4196,9 +4643,10 @@ def spotify_search_playlists_by_genre(genre_name):
     except Exception as e:
         return []
 
+@cached_query('spotify', 'tracks')
 def spotify_get_album_by_track_uri(track_uri):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
@@ -4207,9 +4655,10 @@ def spotify_get_album_by_track_uri(track_uri):
     except Exception as e:
         return None
 
+@cached_query('spotify', 'tracks')
 def spotify_get_tracks_by_album_uri(album_uri):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
@@ -4218,33 +4667,31 @@ def spotify_get_tracks_by_album_uri(album_uri):
     except Exception as e:
         return []
 
-def spotify_get_artist_albums(artist_id):
+@cached_query('spotify', 'albums')
+def spotify_get_artist_albums(artist_id, offset=0):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
-        limit=searchresult_maxlength
+        limit=search_page_size
         if limit > 50:
             limit = 50
 
-        results = spotify.artist_albums('spotify:artist:' + artist_id, album_type='album', limit=limit)	# limit not working here
+        results = spotify.artist_albums('spotify:artist:' + artist_id, album_type='album', limit=limit, offset=offset) # further pages are fetched by search_result_pages
         if 'items' not in results or len(results['items']) == 0:
             return []
 
         albums = results['items']
 
-        while results['next']:
-            results = spotify.next(results)
-            albums.extend(results['items'])
-
         return albums
     except Exception as e:
         return []
 
+@cached_query('spotify', 'playlists')
 def spotify_get_playlist_tracks(playlist_id):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
@@ -4265,9 +4712,10 @@ def spotify_get_playlist_tracks(playlist_id):
     except Exception as e:
         return []
 
+@cached_query('spotify', 'tracks')
 def spotify_get_album_tracks(album_id):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
@@ -4280,17 +4728,18 @@ def spotify_get_album_tracks(album_id):
     except Exception as e:
         return []
 
-def spotify_search_track(track_name):
+@cached_query('spotify', 'search')
+def spotify_search_track(track_name, offset=0):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
-        limit=searchresult_maxlength
+        limit=search_page_size
         if limit > 50:
             limit = 50
 
-        results = spotify.search(track_name, limit=limit, type='track')
+        results = spotify.search(track_name, limit=limit, offset=offset, type='track')
         if 'tracks' not in results or 'items' not in results['tracks'] or len(results['tracks']) == 0 or len(results['tracks']['items']) == 0:
             return []
         tracks = results['tracks']['items']
@@ -4302,17 +4751,18 @@ def spotify_search_track(track_name):
     except Exception as e:
         return []
 
-def spotify_search_playlist(playlist_name):
+@cached_query('spotify', 'search')
+def spotify_search_playlist(playlist_name, offset=0):
     try:
-        spotify = spotify_connect.auth()
+        spotify = spotify_connect.client()
         if isinstance(spotify, str):
             return spotify
 
-        limit=searchresult_maxlength
+        limit=search_page_size
         if limit > 50:
             limit = 50
 
-        results = spotify.search(playlist_name, limit=limit, type='playlist')
+        results = spotify.search(playlist_name, limit=limit, offset=offset, type='playlist')
         if 'playlists' not in results or 'items' not in results['playlists'] or len(results['playlists']) == 0 or len(results['playlists']['items']) == 0:
             return []
 
@@ -4351,10 +4801,35 @@ def is_json_str(raw):
         if errorlog is True: flexprint('[red]is json str error: ' + str(e) + '[/red]')
         return False
 
+def search_result_pages(fetch_page, offset, map_item = None, items = None):
+    # generator of the further result pages (the first page is returned to the coverplayer directly)
+    # fetch_page(offset) returns the next page, items is the list in meta which is used to find the clicked item
+    try:
+        if offset < search_page_size:
+            return # first page was not full, no more results
+        while offset < searchresult_maxlength:
+            page = fetch_page(offset)
+            if page is None or isinstance(page, str) or len(page) == 0:
+                return
+            fetched = len(page)
+            page = page[:searchresult_maxlength - offset]
+            if map_item is not None:
+                page = list(map(map_item, page))
+            if items is not None:
+                items.extend(page)
+            flexprint('search result page: offset ' + str(offset) + ', items: ' + str(len(page)))
+            yield page
+            if fetched < search_page_size:
+                return
+            offset += fetched
+    except Exception as e:
+        if errorlog is True: flexprint('[red]search result pages error: ' + str(e) + '[/red]')
+
 def on_search(is_stream, value, zone, type):
     try:
         control_id = None
         albums = None
+        pages = None # further result pages, streamed into the open list by the coverplayer
         is_webserver = False
         zonetype = ''
         if zone in channels.keys() and (channels[zone] == 'webserver' or channels[zone] == 'spotifyconnect'):
@@ -4378,14 +4853,17 @@ def on_search(is_stream, value, zone, type):
                         meta = {"stream": is_stream, "zonetype": zonetype, "type": 'artists', 'search': value}
                         return [meta, []]
                     if (len(artists) != 1):
-                        artists = list(map(lambda obj: {"name": obj['name'], "id": obj['id']}, artists))
+                        map_artist = lambda obj: {"name": obj['name'], "id": obj['id']}
+                        pages = search_result_pages(lambda offset: spotify_search_artist(value, offset), len(artists), map_artist)
+                        artists = list(map(map_artist, artists))
                         meta = {"stream": is_stream, "zonetype": zonetype, "type": 'artists', 'search': value}
-                        return [meta, artists]
+                        return [meta, artists, pages]
                     artist = artists[0]
                     value = artist['name']
                     albums = spotify_get_artist_albums(artist['id'])
                     if isinstance(albums, str):
                         return albums
+                    pages = search_result_pages(lambda offset: spotify_get_artist_albums(artist['id'], offset), len(albums))
                 if type == 'genre':
                     genretype = 'playlists'
                     if genretype=='artists':
@@ -4405,14 +4883,18 @@ def on_search(is_stream, value, zone, type):
                         if (len(playlists) == 0):
                             meta = {"stream": is_stream, "zonetype": zonetype, "type": 'playlists', 'search': value}
                             return [meta, []]
-                        playlists = list(map(lambda obj: {"name": obj['name'], "id": obj['id']}, playlists))
+                        map_playlist = lambda obj: {"name": obj['name'], "id": obj['id']}
+                        pages = search_result_pages(lambda offset: spotify_search_playlists_by_genre(value, offset), len(playlists), map_playlist)
+                        playlists = list(map(map_playlist, playlists))
                         meta = {"stream": is_stream, "zonetype": zonetype, "type": 'playlists', 'search': value}
-                        return [meta, playlists]
+                        return [meta, playlists, pages]
                 if type == 'track':
                     tracks = spotify_search_track(value)
                     if isinstance(tracks, str):
                         return tracks
-                    tracks = list(map(lambda obj: {"name": obj['name'], "id": obj['id'], "artist": obj['artists'][0]['name'] if ('artists' in obj and len(obj['artists']) > 0 and 'name' in obj['artists'][0]) else None}, tracks))
+                    map_track = lambda obj: {"name": obj['name'], "id": obj['id'], "artist": obj['artists'][0]['name'] if ('artists' in obj and len(obj['artists']) > 0 and 'name' in obj['artists'][0]) else None}
+                    pages = search_result_pages(lambda offset: spotify_search_track(value, offset), len(tracks), map_track)
+                    tracks = list(map(map_track, tracks))
                 if type == 'playlist':
                     playlists = spotify_search_playlist(value)
                     if isinstance(playlists, str):
@@ -4421,9 +4903,11 @@ def on_search(is_stream, value, zone, type):
                         meta = {"stream": is_stream, "zonetype": zonetype, "type": 'playlists', 'search': value}
                         return [meta, []]
                     if (len(playlists) != 1):
-                        playlists = list(map(lambda obj: {"name": obj['name'], "id": obj['id']}, playlists))
+                        map_playlist = lambda obj: {"name": obj['name'], "id": obj['id']}
+                        pages = search_result_pages(lambda offset: spotify_search_playlist(value, offset), len(playlists), map_playlist)
+                        playlists = list(map(map_playlist, playlists))
                         meta = {"stream": is_stream, "zonetype": zonetype, "type": 'playlists', 'search': value}
-                        return [meta, playlists]
+                        return [meta, playlists, pages]
                     playlists = list(map(lambda obj: {"name": obj['name'], "id": obj['id']}, playlists))
                     playlist = playlists[0]
                     value = playlist['name']
@@ -4454,11 +4938,15 @@ def on_search(is_stream, value, zone, type):
                         artists = replace_escaped_list(artists)
                     if (len(artists) != 1):
                         meta = {"stream": is_stream, "zonetype": zonetype, "type": 'artists', 'search': value.title()}
-                        return [meta, artists]
+                        if is_stream is True:
+                            pages = search_result_pages(lambda offset: applemusic_search_artist(value, offset), len(artists))
+                        return [meta, artists, pages]
                     artist = artists[0]
                     if is_stream is True:
                         albums = applemusic_get_albums_by_artist_name(artist['name'].replace('"','\\\"'))
+                        applemusic_prefetch_album_tracks(albums)
                         value = artist['name'].replace('"','\\\"')
+                        pages = search_result_pages(lambda offset: applemusic_get_albums_by_artist_name(value, offset), len(albums))
                     else:
                         raw = send_webserver_zone_control(control_id, True, 'albums', artist)
                         value = artist.replace('"','\\\"')
@@ -4518,7 +5006,8 @@ def on_search(is_stream, value, zone, type):
                         meta = {"stream": is_stream, "zonetype": zonetype, "type": 'playlists', 'search': value.title()}
                         if is_stream is True:
                             meta['playlists'] = playlists
-                        return [meta, playlists]
+                            pages = search_result_pages(lambda offset: applemusic_search_playlist(value, offset), len(playlists), None, playlists)
+                        return [meta, playlists, pages]
                     playlist = playlists[0]
                     flexprint('single playlist: ' + str(playlist))
                     if is_stream is True:
@@ -4545,12 +5034,13 @@ def on_search(is_stream, value, zone, type):
                     value = value.replace('"','\\"')
                     radios = applemusic_station(value)
                     meta = {"stream": is_stream, "zonetype": zonetype, "type": 'radios', 'search': value.title(), 'radios': radios}
-                    return [meta, radios]
+                    return [meta, radios, search_result_pages(lambda offset: applemusic_station(value, offset), len(radios), None, radios)]
                 if type == 'track':
                     value = value.replace('"','\\"')
                     flexprint('************ Apple Music track search value: ' + str(value))
                     if is_stream is True:
                         tracks = applemusic_search_track(value)
+                        pages = search_result_pages(lambda offset: applemusic_search_track(value, offset), len(tracks), None, tracks)
                     else:
                         raw = send_webserver_zone_control(control_id, True, 'tracks-with-artist', value)
                         if raw is None:
@@ -4562,7 +5052,7 @@ def on_search(is_stream, value, zone, type):
                         tracks = replace_escaped_list(tracks)
             if type == 'artist':
                 meta = {"stream": is_stream, "zonetype": zonetype, "type": 'albums', 'search': value, "artist": value}
-                return [meta, albums]
+                return [meta, albums, pages]
             if type == 'genre':
                 meta = {"stream": is_stream, "zonetype": zonetype, "type": 'artists', 'search': value, "genre": value}
                 return [meta, artists]
@@ -4571,7 +5061,7 @@ def on_search(is_stream, value, zone, type):
                 if zonetype == 'Apple Music' and is_stream is True:
                     meta['tracks'] = tracks
                 flexprint('track search: ' + str(tracks))
-                return [meta, tracks]
+                return [meta, tracks, pages]
         if is_webserver is False and control_id is not None and zone in channels.values():
             zonetype = 'Roon'
             outputs = roonapi.outputs
@@ -4683,15 +5173,17 @@ def on_itemclick(meta, search, itemname, zone):
                                 break                    
                         return ['selected-spotify-device', search, itemname]
                     else:
-                        spotify_devices = spotify_connect.devices()
+                        spotify_devices = spotify_connect.devices(True)
                         meta['spotify_devices'] = spotify_devices
                         return ['spotify-devicelist', itemname, spotify_devices]            
                 if meta['type'] == 'artists':
                     albums = spotify_get_artist_albums(itemname)
                     if isinstance(albums, str):
                         return albums
-                    albums = list(map(lambda obj: {"name": obj['name'], "id": obj['id']}, albums))
-                    return ['albums', search, albums]
+                    map_album = lambda obj: {"name": obj['name'], "id": obj['id']}
+                    pages = search_result_pages(lambda offset: spotify_get_artist_albums(itemname, offset), len(albums), map_album)
+                    albums = list(map(map_album, albums))
+                    return ['albums', search, albums, pages]
                 if meta['type'] == 'albums':
                     if 'searchtype' in meta and meta['searchtype']=='tracklist':
                         if 'trackId' in meta and meta['trackId']!='':
@@ -4754,8 +5246,12 @@ def on_itemclick(meta, search, itemname, zone):
                         return ['track', itemname]
             else:
                 if meta['type'] == 'artists':
+                    pages = None
                     if is_stream is True:
                         albums = applemusic_get_artist_relationship(itemname,'albums')
+                        if isinstance(albums, str) is False:
+                            applemusic_prefetch_album_tracks(albums)
+                            pages = search_result_pages(lambda offset: applemusic_get_artist_relationship(itemname, 'albums', offset), len(albums))
                     else:
                         raw = send_webserver_zone_control(control_id, True, 'albums', itemname)
                         if raw is None:
@@ -4764,7 +5260,7 @@ def on_itemclick(meta, search, itemname, zone):
                             return str(raw)
                         albums = json.loads(raw)
                         albums = replace_escaped_list(albums)
-                    return ['albums', search, albums]
+                    return ['albums', search, albums, pages]
                 if meta['type'] == 'genres':
                     raw = send_webserver_zone_control(control_id, True, 'artists-in-genre', itemname)
                     if raw is None:
@@ -4785,7 +5281,7 @@ def on_itemclick(meta, search, itemname, zone):
                             itemname = albums[0]['id']
                         else:
                             flexprint('[bold blue]tracklist => search for albums by albumname empty => try to search for artist name[/bold blue]')
-                            albums = applemusic_get_albums_by_artist_name(meta['artist'])
+                            albums = applemusic_get_albums_by_artist_name(meta['artist'], 0, searchresult_maxlength)
                             albums = [e for e in albums if e['name'] == meta['album'] and (meta['artist'].lower()) in (e['artistName'].lower())]
                             flexprint('[bold blue]tracklist => search for albums by artist name => albums found: ' + str(len(albums)) + '[/bold blue]')
                             if len(albums) > 0:
@@ -5001,13 +5497,26 @@ def textsize_width(txt, font=None):
     :param font: The font (from :py:mod:`luma.core.legacy.font`) to use.
     """
     try:
-        font = font or DEFAULT_FONT
-        src = [c for ascii_code in txt for c in font[ord(ascii_code)]]
-        return len(src)
+        widths = get_glyph_widths(font or DEFAULT_FONT)
+        return sum([widths[ord(ascii_code)] for ascii_code in txt])
     except Exception as e:
         if errorlog is True: flexprint('[red]on textsize_width error: ' + str(e) + '[/red]')
     return
 
+def get_glyph_widths(font):
+    # glyph columns are only counted once per font, measuring text is then a table lookup per character
+    entry = glyph_width_tables.get(id(font))
+    if entry is None or entry[0] is not font:
+        widths = []
+        for ascii_code in range(256):
+            try:
+                widths.append(len(font[ascii_code]))
+            except IndexError:
+                break
+        entry = (font, widths) # keep a reference to the font, so its id can not be reused
+        glyph_width_tables[id(font)] = entry
+    return entry[1]
+
 
 def transform_zone_data_to_string(displaystr, name, controlled, obj):
     try:
@@ -5021,12 +5530,7 @@ def transform_zone_data_to_string(displaystr, name, controlled, obj):
                 displaystr = vertical_longtext_split_and_append(convert_special_chars(playing_headline),displaystr)
             if show_zone is True:
                 sourcestr = get_message('Source') + ': ' + convert_special_chars(name)
-                if is_app_embedded is True or is_raspberry_pi is False:
-                    font = CP437_FONT_PROPORTIONAL
-                    w = textsize_width(sourcestr, font)
-                else:
-                    font = proportional(CP437_FONT)
-                    w, h = textsize(sourcestr, font)
+                w = textsize_width(sourcestr, text_font)
                 if w > hw_width:
                     displaystr.append(get_message('Source'))
                     displaystr = vertical_longtext_split_and_append(convert_special_chars(name),displaystr)
@@ -5034,10 +5538,7 @@ def transform_zone_data_to_string(displaystr, name, controlled, obj):
                     displaystr = vertical_longtext_split_and_append(sourcestr,displaystr)
 
                 zonestr = controlled + get_message('Zone') + ': ' + convert_special_chars(obj["zone"])
-                if is_app_embedded is True or is_raspberry_pi is False:
-                    w = textsize_width(zonestr, font)
-                else:
-                    w, h = textsize(zonestr, font)
+                w = textsize_width(zonestr, text_font)
                 if w > hw_width:
                     displaystr.append(controlled + get_message('Zone'))
                     displaystr = vertical_longtext_split_and_append(convert_special_chars(obj["zone"]),displaystr)
@@ -5089,6 +5590,8 @@ def update_websocket_queue_and_web_playouts_raw(result, name):
         if result.startswith('[') is False:
             result = "[" + result + "]"
         playout_changed = name not in web_playouts_raw or web_playouts_raw[name] != result
+        if name not in web_playouts_raw or compare_filtered_web_zonedata_is_equal(web_playouts_raw[name], result) is False:
+            mark_output_segment_dirty('web')
         if playout_changed is True:
             add_changed_data_to_websocket_queue()
             flexprint(datetime.now().strftime("%Y-%m-%d %H:%M:%S") + ' => web playout changed => add to websocket update queue')
@@ -5251,6 +5754,7 @@ def get_webserver_results_and_fast_updating_of_coverplayer_and_app(name,url,resu
                         update_websocket_queue_and_web_playouts_raw(result, name)
 
             web_playouts[name] = resultJson
+            web_playouts_time[name] = time.monotonic()
         else:
             flexprint('Webserver ' + name + ' is not available')
     except Exception as e:
@@ -5294,37 +5798,182 @@ def compare_filtered_web_zonedata_is_equal(old_raw, new_raw):
         if errorlog is True: flexprint('[red]compare filtered web zonedata is equal error: ' + str(e) + '[/red]')
         return False
 
-def compare_filtered_roon_zonedata_is_equal(old_raw, new_raw, remove_position):
-    try:
-        old = json.loads(old_raw)
-        new = json.loads(new_raw)
-        equal = True
+class ZoneState:
+    # playout state of a roon zone: compared by its precomputed hashes, serialized only once (lazy) if the websocket or REST info data needs it
+    __slots__ = ('hash', 'status', 'artist', 'album', 'track', 'shuffle', 'repeat', 'position', 'total', 'cover', 'image_key', 'content_hash', 'position_hash', '_data', '_raw')
+
+    def __init__(self, status, artist=None, album=None, track=None, shuffle=None, repeat=None, position=None, total=None, cover=None, image_key=None):
+        self.status = str(status)
+        self.artist = artist.replace('"', '”') if artist is not None else None # RIGHT DOUBLE QUOTATION MARK, like filterIllegalChars
+        self.album = album.replace('"', '”') if album is not None else None
+        self.track = track.replace('"', '”') if track is not None else None
+        self.shuffle = shuffle
+        self.repeat = repeat
+        self.position = position
+        self.total = total
+        self.cover = cover if cover else None
+        self.image_key = image_key
+        self.hash = hashlib.md5(str((image_key if image_key is not None else '') + self.artist + self.album + self.track).encode()).hexdigest() if self.artist is not None else None
+        self.content_hash = hash((self.hash, self.status, self.artist, self.album, self.track, self.total, self.cover)) # shuffle and repeat are not part of the playout
+        self.position_hash = hash((self.content_hash, self.position))
+        self._data = None
+        self._raw = None
+
+    @classmethod
+    def not_running(cls):
+        return cls('not running')
+
+    def same_content(self, other):
+        # equal without position, shuffle and repeat
+        return other is not None and self.content_hash == other.content_hash and self.status == other.status and self.artist == other.artist and self.album == other.album and self.track == other.track and self.total == other.total and self.cover == other.cover
+
+    def same_playout(self, other):
+        # equal without shuffle and repeat
+        return other is not None and self.position_hash == other.position_hash and self.position == other.position and self.same_content(other)
+
+    def to_dict(self):
+        if self._data is None:
+            if self.hash is None:
+                self._data = {"status": self.status}
+            else:
+                self._data = {"hash": self.hash, "status": self.status, "artist": self.artist, "album": self.album, "track": self.track, "shuffle": self.shuffle, "repeat": self.repeat, "position": self.position, "total": self.total}
+                if self.cover is not None:
+                    self._data["cover"] = self.cover
+        return self._data
+
+    def to_json(self):
+        if self._raw is None:
+            self._raw = json.dumps(self.to_dict(), ensure_ascii=False)
+        return self._raw
+
+    def __repr__(self):
+        return self.to_json()
+
+def roon_zone_fingerprint(zone):
+    now_playing = zone.get('now_playing') or {}
+    three_line = now_playing.get('three_line') or {}
+    settings = zone.get('settings') or {}
+    return (zone.get('display_name'), zone.get('state'), three_line.get('line1'), three_line.get('line2'), three_line.get('line3'), settings.get('shuffle'), settings.get('loop'), zone.get('seek_position'), now_playing.get('length'), now_playing.get('image_key'), zone.get('display_name') in channels.values())
+
+def subscribe_roon_zone_state(callback):
+    roon_zone_subscribers.append(callback)
+
+def reduce_roon_zone(zone):
+    # shared reducer of roon_state_callback and build_output: each zone event is processed (play modes, cover url, ZoneState) and stored only once,
+    # no matter which of both sees it first. Returns the ZoneState and the ZoneState before the event (the same object, if the event was processed already)
+    zone_id = zone['zone_id']
+    name = zone['display_name']
+    fingerprint = roon_zone_fingerprint(zone)
+    with roon_zone_lock:
+        reduced = roon_zone_reduced.get(zone_id)
+        if reduced is not None and reduced[0] == fingerprint:
+            return reduced[1], reduced[1]
+        last_reduced_state = reduced[1] if reduced is not None else None
+
+        state = zone['state']
+        shuffle = zone['settings']['shuffle']
+        repeat = zone['settings']['loop'] != 'disabled'
+        set_play_mode(zone_id, state == 'playing', False)
+        set_shuffle_mode(zone_id, shuffle, False)
+        set_repeat_mode(zone_id, repeat, False)
+
+        if name not in channels.values():
+            zone_state = ZoneState.not_running()
+        else:
+            playstr = zone['now_playing']['three_line']
+            image_key = zone['now_playing'].get('image_key')
+            cover_url = ''
+            if image_key and last_reduced_state is not None and last_reduced_state.image_key == image_key:
+                cover_url = last_reduced_state.cover # seek events of the same track
+            elif image_key:
+                cover_url = roonapi.get_image(image_key)
+            zone_state = ZoneState(state, playstr['line2'], playstr['line3'], playstr['line1'], shuffle, repeat, zone.get('seek_position'), zone['now_playing'].get('length'), cover_url, image_key)
+        roon_zone_reduced[zone_id] = (fingerprint, zone_state)
+
+        last_zone_state = roon_zone_states.get(name)
+        if zone_state.same_playout(last_zone_state) is False:
+            roon_zone_states[name] = zone_state # shuffle and repeat changes only are not stored, like the roon_playouts before
+        if last_reduced_state is not None and reduced[0][0] == name: # fingerprint starts with the zone name
+            last_zone_state = last_reduced_state # shuffle and repeat changes are passed to the subscribers (Coverplayer)
+
+    for callback in roon_zone_subscribers:
+        try:
+            callback(zone, zone_state, last_zone_state)
+        except Exception as e:
+            if errorlog is True: flexprint('[red]roon zone state subscriber error: ' + str(e) + '[/red]')
+    return zone_state, last_zone_state
 
-        keys = new.keys()
-        if 'shuffle' in keys:
-            del new['shuffle']
-        if 'repeat' in keys:
-            del new['repeat']
-        if remove_position is True and 'position' in keys:
-            del new['position']
-
-        keys = old.keys()
-        if 'shuffle' in keys:
-            del old['shuffle']
-        if 'repeat' in keys:
-            del old['repeat']
-        if remove_position is True and 'position' in keys:
-            del old['position']
-     
-        json_str_old = json.dumps(old)
-        json_str_new = json.dumps(new)
-        if json_str_old != json_str_new:
-            equal = False
-            
-        return equal
-    except Exception as e:
-        if errorlog is True: flexprint('[red]compare filtered roon zonedata is equal error: ' + str(e) + '[/red]')
-        return False
+def queue_roon_zone_state_change(zone, zone_state, last_zone_state):
+    # subscriber of the websocket clients
+    if zone_state.same_playout(last_zone_state) is False:
+        add_changed_data_to_websocket_queue()
+        flexprint(datetime.now().strftime("%Y-%m-%d %H:%M:%S") + ' => roon_playouts (' + zone['display_name'] + ', ' + zone_state.status + ') changed => add to websocket update queue')
+
+def mark_roon_zone_output_dirty(zone, zone_state, last_zone_state):
+    # subscriber of the led output: the roon segment contains state, zone, artist, album and track, but no position
+    if zone_state.same_content(last_zone_state) is False:
+        mark_output_segment_dirty('roon')
+
+def update_coverplayer_from_roon_zone(zone, zone_state, last_zone_state):
+    # subscriber of the Coverplayer: position and metadata of the actual control zone (build_output does the first update, with the callbacks)
+    global shuffle_on, shuffle_on_last, repeat_on, repeat_on_last, track_id_last, last_cover_url, is_playing_last, is_playing, last_cover_text_line_parts, playpos_last, playlen_last
+
+    try:
+        name = zone['display_name']
+        zone_id = zone['zone_id']
+        if display_cover is False or initialization_done is False or callbacks_initialized is False:
+            return
+        if control_id is None or control_id not in channels.keys() or name != channels[control_id]:
+            return
+        cover_url = zone_state.cover or ''
+        if zone_id not in roon_queues:
+            subscribe_roon_queue(zone_id)
+        elif cover_url != last_cover_url:
+            prefetch_roon_queue_covers(zone_id) # next covers, if the queue was not changed by the track change
+        cover_text_line_parts = get_roon_cover_text_line_parts(name, zone_state)
+
+        playing = zone_state.status == 'playing'
+        playpos = zone_state.position
+        playlen = zone_state.total
+        cover_changed = cover_url != last_cover_url
+        text_changed = last_cover_text_line_parts != '|'.join(cover_text_line_parts)
+        is_playing_changed = playing != is_playing_last
+        shuffle_changed = zone_state.shuffle != shuffle_on_last
+        repeat_changed = zone_state.repeat != repeat_on_last
+        playpos_changed = playpos_last != playpos
+        playlen_changed = playlen_last != playlen
+        anything_changed = cover_changed or text_changed or is_playing_changed or shuffle_changed or repeat_changed or playlen_changed
+
+        if (anything_changed is True or (anything_changed is False and playpos_changed is True)):
+            last_cover_url = cover_url
+            last_cover_text_line_parts = '|'.join(cover_text_line_parts)
+            playpos_last = playpos
+            playlen_last = playlen
+            is_playing_last = is_playing
+            shuffle_on_last = shuffle_on
+            repeat_on_last = repeat_on
+            track_id_last = track_id
+            is_playing = playing
+            sourcetype = 'local'
+            shuffle_on = zone_state.shuffle
+            repeat_on = zone_state.repeat
+            is_radio = False
+
+            flexprint('[bold red]Roonmatrix => Coverplayer.setpos (roon zone state) => playpos: ' + str(playpos) + ', playlen: ' + str(playlen) + ', is_playing: ' + str(is_playing) + ', shuffle: ' + str(shuffle_on) + ', repeat: ' + str(repeat_on) + ', track_id: ' + str(track_id) + '[/bold red]')
+            Coverplayer.setpos(playpos, playlen, cover_url, is_playing, sourcetype, is_radio, shuffle_on, repeat_on, track_id, cover_text_line_parts)
+    except Exception as e:
+        if errorlog is True: flexprint('[red]update coverplayer from roon zone error: ' + str(e) + '[/red]')
+
+def get_roon_cover_text_line_parts(name, zone_state):
+    cover_text_line_parts = []
+    cover_text_line_parts.append(get_message('Zone') + ': ' + name)
+    if zone_state.artist:
+        cover_text_line_parts.append(get_message('Artist') + ': ' + zone_state.artist)
+    if show_album is True and zone_state.album:
+        cover_text_line_parts.append(get_message('Album') + ': ' + zone_state.album)
+    if zone_state.track:
+        cover_text_line_parts.append(get_message('Track') + ': ' + zone_state.track)
+    return cover_text_line_parts
 
 def get_spotify_connect_name_from_channels():
     nameFound = None
@@ -5346,12 +5995,7 @@ def get_playing_apple_or_spotify(webservers_zones,displaystr):
         force = get_force_mode(displaystr)
         if webservers_show == True:
             webservers_zones = moveActualPlayerToFirstPosInWebserverZoneList(webservers_zones)
-            active_zones = get_active_zones_from_webserver_onlinecheck(True)
-            if with_async_request is True:
-                web_response = async_web_requests_with_timing(active_zones)
-                #web_response = async_web_requests_with_timing(webservers_zones)
-            else:
-                web_response = sync_web_requests_with_timing(active_zones)
+            web_response = get_webserver_zone_results(True)
             web_results = web_response[0]
             req_time = web_response[1]
     
@@ -5376,7 +6020,8 @@ def get_playing_apple_or_spotify(webservers_zones,displaystr):
                                     if playprops['playing'] is True:
                                         displaystr = transform_zone_data_to_string(displaystr, name, props['controlled'], obj)
 
-                                    has_changed = name not in web_playouts_raw or compare_filtered_web_zonedata_is_equal(web_playouts_raw[name],result) is False
+                                    has_changed = name in webserver_push_changes or name not in web_playouts_raw or compare_filtered_web_zonedata_is_equal(web_playouts_raw[name],result) is False
+                                    webserver_push_changes.discard(name) # web_playouts_raw is already updated by the push
                                     if has_changed:
                                         flexprint('webserver ' + name + ' => [red]has_changed[/red]: ' + str(has_changed))
                                         update_websocket_queue_and_web_playouts_raw(result, name)
@@ -5388,6 +6033,7 @@ def get_playing_apple_or_spotify(webservers_zones,displaystr):
                                             breakToo = True # flag to break outer for loop too
                                             break
                             web_playouts[name] = resultJson
+                            web_playouts_time[name] = time.monotonic()
                             if breakToo is True:
                                 break
                         else:
@@ -5407,7 +6053,10 @@ def get_playing_apple_or_spotify(webservers_zones,displaystr):
             if active_spotify_connect_zone is None:
                 name = get_spotify_connect_name_from_channels()
                 if name is not None:
-                    web_playouts[name] = [{"zone": "SpotifyConnect", "status": "not running"}]  
+                    if web_playouts_raw.get(name) != '[{"zone": "SpotifyConnect", "status": "not running"}]':
+                        mark_output_segment_dirty('web')
+                    web_playouts[name] = [{"zone": "SpotifyConnect", "status": "not running"}]
+                    web_playouts_time[name] = time.monotonic()
                     web_playouts_raw[name] = '[{"zone": "SpotifyConnect", "status": "not running"}]'    
             else:
                 name = active_spotify_connect_zone['name']
@@ -5433,6 +6082,7 @@ def get_playing_apple_or_spotify(webservers_zones,displaystr):
                             displaystr = remove_prepended_from_displaystr(displaystr)
                     flexprint('save web_playouts for ' + str(name) + ', obj: ' + str(obj))
                     web_playouts[name] = [obj]
+                    web_playouts_time[name] = time.monotonic()
     except Exception as e:
         if errorlog is True: 
             flexprint('==> get playing spotify connect error: ', str(e))
@@ -5445,7 +6095,6 @@ def get_playing_apple_or_spotify(webservers_zones,displaystr):
 def set_control_zone(waiting = True):
     try:
         clear_display('set_control_zone')
-        time.sleep(1)
 
         flexprint('control_id_update: ' + str(control_id_update))
         if control_id_update is None:
@@ -5457,8 +6106,7 @@ def set_control_zone(waiting = True):
 
         if debug is True: flexprint('set_control_zone message')
         if display_cover is False and is_raspberry_pi is True:
-            with canvas(device) as draw:
-                text(draw, (0, 0), get_message('control zone') + get_zone_control_shortname(': ') + get_zone_control_shortname(channel_name), fill="white", font=proportional(CP437_FONT))
+            matrix_renderer.draw_text((0, 0), get_message('control zone') + get_zone_control_shortname(': ') + get_zone_control_shortname(channel_name))
 
         if waiting is True:
             while do_set_zone_control == True:
@@ -5496,8 +6144,7 @@ def show_clock():
                 timestr = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
                 offset_x = ceil((led_modules - 15) / 2) * 8
 
-            with canvas(device) as draw:
-                text(draw, (offset_x, 0), timestr, fill="white", font=proportional(CP437_FONT))
+            matrix_renderer.draw_text((offset_x, 0), timestr)
             time.sleep(1 / clock_refresh_per_second)
             framecount += 1
             if framecount % clock_refresh_per_second == 0:
@@ -5514,34 +6161,28 @@ def show_clock():
     except Exception as e:
         if errorlog is True: flexprint('[red]show clock error: ' + str(e) + '[/red]')
 
-def split_word(word,lines):
-    try:
-        if is_raspberry_pi is False or is_app_embedded is True:
-            font = CP437_FONT_PROPORTIONAL
-            w = textsize_width(word, font)
-            hw_width = led_modules * 8
-        else:
-            font = proportional(CP437_FONT)
-            w, h = textsize(word, font)
-            hw_width = device.width
-
-        count = len(word)
-        while w > hw_width:
-            while count > 0 and w > hw_width:
-                count -= 1
-                part = word[:count]
-                if is_raspberry_pi is False or is_app_embedded is True:
-                    w = textsize_width(part, font)
-                else:
-                    w, h = textsize(part, font)
-            word = word[count:]
-            lines.append(part)
-            if is_raspberry_pi is False or is_app_embedded is True:
-                w = textsize_width(word, font)
-            else:
-                w, h = textsize(word, font)
-        if len(word) > 0:
-            lines.append(word)
+def get_linebreak_width():
+    if is_raspberry_pi is False or is_app_embedded is True:
+        return led_modules * 8
+    return device.width
+
+def split_word(word,lines,widths=None,hw_width=None):
+    # greedy split of a word wider than the display into parts, in one pass over the glyph widths
+    try:
+        widths = widths or get_glyph_widths(text_font)
+        hw_width = hw_width or get_linebreak_width()
+
+        part_start = 0
+        w = 0
+        for idx,char in enumerate(word):
+            char_w = widths[ord(char)]
+            if w + char_w > hw_width and idx > part_start:
+                lines.append(word[part_start:idx])
+                part_start = idx
+                w = 0
+            w += char_w
+        if len(word) > part_start:
+            lines.append(word[part_start:])
     except Exception as e:
         if errorlog is True: flexprint('[red]split word error: ' + str(e) + '[/red]')
     return lines
@@ -5550,50 +6191,40 @@ def vertical_longtext_split_and_append(text,lines):
     if display_cover is True:
         return lines
     try:
-        if is_raspberry_pi is False or is_app_embedded is True:
-            font = CP437_FONT_PROPORTIONAL
-            hw_width = led_modules * 8
-        else:
-            font = proportional(CP437_FONT)
-            hw_width = device.width
+        widths = get_glyph_widths(text_font)
+        hw_width = get_linebreak_width()
+        space_w = widths[32]
 
         if len(text) > 0:
             words = text.split(' ')
 
+            # cumulative line width, so every word is measured only once
             line = ''
+            line_w = 0
             for word in words:
-                line_before = line
-                if len(line) > 0:
-                    line += ' '
-                line += word
-                if is_raspberry_pi is False or is_app_embedded is True:
-                    w = textsize_width(line, font)
-                else:
-                    w, h = textsize(line, font)
-                if w > hw_width and line_before != '':
-                    if is_raspberry_pi is False or is_app_embedded is True:
-                        lb_w = textsize_width(line_before, font)
-                    else:
-                        lb_w, lb_h = textsize(line_before, font)
-                    if lb_w <= hw_width:
-                        lines.append(line_before)
+                word_w = sum([widths[ord(char)] for char in word])
+                w = word_w if line == '' else line_w + space_w + word_w
+                if w > hw_width and line != '':
+                    if line_w <= hw_width:
+                        lines.append(line)
                     else:
-                        lines = split_word(line_before,lines)
+                        lines = split_word(line,lines,widths,hw_width)
                         last_line = lines.pop()
-                        if is_raspberry_pi is False or is_app_embedded is True:
-                            lb_w = textsize_width(last_line + ' ' + word, font)
-                        else:
-                            lb_w, lb_h = textsize(last_line + ' ' + word, font)
-                        if lb_w <= hw_width:
+                        if textsize_width(last_line, text_font) + space_w + word_w <= hw_width:
                             last_line += (' ' + word)
                             word = ''
+                            word_w = 0
                         lines.append(last_line)
                     line = word
+                    line_w = word_w
+                else:
+                    line = word if line == '' else line + ' ' + word
+                    line_w = w
             if len(line) > 0:
-                if w <= hw_width:
+                if line_w <= hw_width:
                     lines.append(line)
                 else:
-                    lines = split_word(line,lines)
+                    lines = split_word(line,lines,widths,hw_width)
     except Exception as e:
         if errorlog is True: flexprint('[red]vertical longtext split and append error: ' + str(e) + '[/red]')
     return lines
@@ -5653,11 +6284,7 @@ def set_default_zone():
 
     try:
         if webservers_show == True:
-            for idx,data in enumerate(webservers_zones,1):
-                name = data['name']
-                url = data['url']
-                online = is_url_active(url,webserver_head_request_timeout)
-                update_webserver_channels(name, online)
+            get_webserver_zone_results(True)
 
         if spotify_connect_enabled():
             active_spotify_connect_zone = get_active_zone_from_spotify_connect_onlinecheck(False)
@@ -5679,10 +6306,62 @@ def set_default_zone():
     except Exception as e:
         if errorlog is True: flexprint('[red]set default zone error: ' + str(e) + '[/red]')
 
-def roon_state_callback(event, changed_ids):
-    global roon_playouts_raw, roon_playouts, interrupt_message, check_audioinfo, fetch_output_time, prepared_displaystr, prepared_vert_strlines, shuffle_on, shuffle_on_last, repeat_on, repeat_on_last, track_id, track_id_last, last_cover_url, is_playing_last, is_playing, last_cover_text_line_parts, playpos_last, playlen_last
+def prefetch_covers(urls):
+    if display_cover is True and cover_prefetch_count > 0 and len(urls) > 0:
+        Coverplayer.prefetch(urls[:cover_prefetch_count], 720, webserver_url_request_timeout)
+
+def subscribe_roon_queue(zone_id):
+    # subscribed once per zone, when it is the control zone of the Coverplayer
+    if display_cover is False or cover_prefetch_count <= 0 or zone_id in roon_queues:
+        return
+    try:
+        roon_queues[zone_id] = []
+        roonapi.register_queue_callback(partial(roon_queue_callback, zone_id), zone_id)
+        flexprint('subscribed roon queue of zone: ' + str(zone_id))
+    except Exception as e:
+        if errorlog is True: flexprint('[red]subscribe roon queue error: ' + str(e) + '[/red]')
 
+def roon_queue_callback(zone_id, data):
     try:
+        if not isinstance(data, dict):
+            return
+        items = roon_queues.get(zone_id, [])
+        if 'items' in data:
+            items = [item.get('image_key') for item in data['items']]
+        for change in data.get('changes', []):
+            if change['operation'] == 'remove':
+                del items[change['index']:change['index'] + change['count']]
+            elif change['operation'] == 'insert':
+                items[change['index']:change['index']] = [item.get('image_key') for item in change['items']]
+        roon_queues[zone_id] = items
+        prefetch_roon_queue_covers(zone_id)
+    except Exception as e:
+        if errorlog is True: flexprint('[red]roon queue callback error: ' + str(e) + '[/red]')
+
+def prefetch_roon_queue_covers(zone_id):
+    if zone_id != control_id or zone_id not in roonapi.zones:
+        return
+    now_playing = roonapi.zones[zone_id].get('now_playing', {})
+    image_keys = []
+    for image_key in roon_queues.get(zone_id, []):
+        if image_key and image_key != now_playing.get('image_key') and image_key not in image_keys:
+            image_keys.append(image_key)
+    prefetch_covers([roonapi.get_image(image_key) for image_key in image_keys[:cover_prefetch_count]])
+
+def roon_state_callback(event, changed_ids):
+    global interrupt_message, check_audioinfo, fetch_output_time, prepared_displaystr, prepared_vert_strlines
+
+    try:
+        # each zone event is reduced once, the subscribers (websocket, led output, Coverplayer) get it even if nothing is shown now
+        reduced_zones = {}
+        if event == 'zones_added' and roonapi is not None:
+            update_roon_channels() # new zones are reduced with their channel
+        for zone_id in changed_ids:
+            zone = roonapi.zones.get(zone_id) if roonapi is not None else None
+            if zone is not None and zone["state"] is not None and zone["state"] != "Unknown" and 'now_playing' in zone:
+                reduced_zones[zone_id] = reduce_roon_zone(zone)
+            elif event != 'zones_seek_changed':
+                mark_output_segment_dirty('roon') # zone added, removed or without playout
         if len(roon_servers) == 0:
             is_roon_server_active(core_ip, core_port)
         if callbacks_initialized is False:
@@ -5701,11 +6380,6 @@ def roon_state_callback(event, changed_ids):
 
                 state = "Unknown"
                 name = '-'
-                artistFiltered = ''
-                albumFiltered = ''
-                trackFiltered = ''
-                image_key = None
-                shuffle = False
 
                 if zone["state"] is None:
                     continue
@@ -5715,109 +6389,30 @@ def roon_state_callback(event, changed_ids):
                 flexprint('roon_state_callback (' + name + '): ' + state + ', lines: ' + str(zone["now_playing"]["three_line"] if 'now_playing' in zone else '-'))
                 if state == "Unknown" or 'now_playing' not in zone:
                     continue
+                elif zone_id not in reduced_zones:
+                    continue
                 else:
-                    playstr = zone["now_playing"]["three_line"]
-                    artist = json.dumps(playstr["line2"],ensure_ascii=False).encode('utf8')
-                    album = json.dumps(playstr["line3"],ensure_ascii=False).encode('utf8')
-                    track = json.dumps(playstr["line1"],ensure_ascii=False).encode('utf8')
-                    playing = state == "playing"
-                    shuffle = zone["settings"]["shuffle"]
-                    repeat = zone["settings"]["loop"] != 'disabled'
-                    playpos = zone.get("seek_position")
-                    playlen = zone["now_playing"].get("length")                                   
-                    set_play_mode(zone_id, playing, False)
-                    set_shuffle_mode(zone_id, shuffle, False)
-                    set_repeat_mode(zone_id, repeat, False)
-
-                    artistFiltered = filterIllegalChars(artist.decode())
-                    albumFiltered = filterIllegalChars(album.decode())
-                    trackFiltered = filterIllegalChars(track.decode())
-
-                    cover_url = ''
-                    image_key = zone["now_playing"].get("image_key")                    
-                    if image_key:
-                        cover_url = roonapi.get_image(image_key)
-
-                    if display_cover is True and control_id is not None and control_id in channels.keys() and name == channels[control_id]:
-                        cover_text_line_parts = []
-                        cover_text_line_parts.append(get_message('Zone') + ': ' + name)
-                        if artistFiltered != '':
-                            cover_text_line_parts.append(get_message('Artist') + ': ' + artistFiltered[1:-1] if (len(artistFiltered) > 1 and artistFiltered[0:1]=='"' and artistFiltered[-1:]=='"') else artistFiltered)
-                        if show_album is True and albumFiltered != '':
-                            cover_text_line_parts.append(get_message('Album') + ': ' + albumFiltered[1:-1] if (len(albumFiltered) > 1 and albumFiltered[0:1]=='"' and albumFiltered[-1:]=='"') else albumFiltered)
-                        if trackFiltered != '':
-                            cover_text_line_parts.append(get_message('Track') + ': ' + trackFiltered[1:-1] if (len(trackFiltered) > 1 and trackFiltered[0:1]=='"' and trackFiltered[-1:]=='"') else trackFiltered)
-
-                        cover_changed = cover_url != last_cover_url
-                        text_changed = last_cover_text_line_parts != '|'.join(cover_text_line_parts)
-                    
-                        is_playing_changed = playing != is_playing_last
-                        shuffle_changed = shuffle != shuffle_on_last
-                        repeat_changed = repeat != repeat_on_last
-                        track_id_changed = track_id != track_id_last
-                        playpos_changed = playpos_last != playpos
-                        playlen_changed = playlen_last != playlen
-                        anything_changed = cover_changed or text_changed or is_playing_changed or shuffle_changed or repeat_changed or playlen_changed
-                    
-                        if (anything_changed is True or (anything_changed is False and playpos_changed is True)):
-                            last_cover_url = cover_url
-                            last_cover_text_line_parts = '|'.join(cover_text_line_parts)
-                            #zonestatus_list = get_zone_names()
-                            #zones_online = zonestatus_list[0]
-                            #zones_playing = zonestatus_list[1]
-                            playpos_last = playpos
-                            playlen_last = playlen
-                            is_playing_last = is_playing
-                            shuffle_on_last = shuffle_on
-                            repeat_on_last = repeat_on
-                            track_id_last = track_id
-                            is_playing = playing
-                            sourcetype = 'local'
-                            shuffle_on = shuffle
-                            repeat_on = repeat
-                            is_radio = False
-                                    
-                            flexprint('[bold red]Roonmatrix => Coverplayer.setpos (roon_state_callback) => playpos: ' + str(playpos) + ', playlen: ' + str(playlen) + ', is_playing: ' + str(is_playing) + ', shuffle: ' + str(shuffle_on) + ', repeat: ' + str(repeat_on) + ', track_id: ' + str(track_id) + '[/bold red]')
-                            Coverplayer.setpos(playpos, playlen, cover_url, is_playing, sourcetype, is_radio, shuffle_on, repeat_on, track_id, cover_text_line_parts)
+                    zone_state, last_zone_state = reduced_zones[zone_id]
 
                 coverplayer_allowed = display_cover is True and initialization_done is True and fetch_output_in_progress is False and output_in_progress is True
                 if matrix_allowed is False and coverplayer_allowed is False:
                     return # update Coverplayer metadata but update displaystr only if output is in progress
 
                 if name not in channels.values():
-                    playing = '{"status": "not running"}'
-
-                    if name not in roon_playouts_raw or roon_playouts_raw[name] != playing:
-                        roon_playouts_raw[name] = playing
-                        roon_playouts[name] = json.loads(playing)
-                        add_changed_data_to_websocket_queue()
-                        flexprint(datetime.now().strftime("%Y-%m-%d %H:%M:%S") + ' => roon_playouts changed (callback, not running) => add to websocket update queue')
                     continue
                 else:
-                    hash_id = hashlib.md5(str((image_key if image_key is not None else '') + artistFiltered + albumFiltered + trackFiltered).encode()).hexdigest()
-                    if cover_url and len(cover_url) > 0:
-                        playing = '{"hash": "' + hash_id + '", "status": "' + str(state) + '", "artist": ' + artistFiltered + ', "album": ' + albumFiltered + ', "track": ' + trackFiltered + ', "shuffle": ' + str(shuffle).lower() + ', "repeat": ' + str(repeat).lower() + ', "position": ' + str(playpos).replace('None','null') + ', "total": ' + str(playlen).replace('None','null') + ', "cover": "' + cover_url + '"}'
-                    else:
-                        playing = '{"hash": "' + hash_id + '", "status": "' + str(state) + '", "artist": ' + artistFiltered + ', "album": ' + albumFiltered + ', "track": ' + trackFiltered + ', "shuffle": ' + str(shuffle).lower() + ', "repeat": ' + str(repeat).lower() + ', "position": ' + str(playpos).replace('None','null') + ', "total": ' + str(playlen).replace('None','null') + '}'
-                    flexprint('### playing (update): ' + str(playing))
-                    playing_data_with_position_has_changed = name not in roon_playouts_raw or compare_filtered_roon_zonedata_is_equal(roon_playouts_raw[name], playing, False) is False
-                    if playing_data_with_position_has_changed is True:            
-                        roon_playouts_raw[name] = playing
-                        roon_playouts[name] = json.loads(playing)
-                        add_changed_data_to_websocket_queue()
-                        flexprint(datetime.now().strftime("%Y-%m-%d %H:%M:%S") + ' => roon_playouts (callback, running) changed => add to websocket update queue')
+                    flexprint('### playing (update): ' + str(zone_state))
+                    playing_data_has_changed = zone_state.same_content(last_zone_state) is False
 
                     # state variants: loading, playing, paused, stopped, not running
                     if state == 'playing':
-                        playing_data_has_changed = name not in roon_playouts_raw or compare_filtered_roon_zonedata_is_equal(roon_playouts_raw[name], playing, True) is False
                         flexprint('roon_state_callback => state: ' + str(state) + ', control_id: ' + str(control_id) + ', name :' + str(name) + ', playing_data_has_changed: ' + str(playing_data_has_changed))
                         if ((force_active_roon_zone_only is False or (control_id in channels.keys() and name == channels[control_id])) and playing_data_has_changed is True):
                             allowed = display_cover is True or (output_in_progress is True and fetch_output_time is not None and (fetch_output_time - datetime.now()).total_seconds() > 2) # added @ 06.12.2025: if display_cover is True, no check of other requirements
                             flexprint('roon_state_callback => allowed: ' + str(allowed) + ', force_roon_update: ' + str(force_roon_update))
                             if allowed is True and force_roon_update is True:
-                                flexprint("roon playout detected for zone: %s playing: %s => interrupt message" % (name, playing))
+                                flexprint("roon playout detected for zone: %s playing: %s => interrupt message" % (name, zone_state))
                                 interrupt_message = True
-                                time.sleep(1)
                                 if do_set_zone_control is False:
                                     clear_display('roon_state_callback')
                                 fetch_output_time = None
@@ -5834,13 +6429,47 @@ def roon_state_callback(event, changed_ids):
             flexprint('[red]==> roon state callback ERROR: [/red]', str(e))
             #flexprint(traceback.format_exc())
 
+def next_webcheck_delay():
+    # one-shot check shortly after the predicted end of the playing tracks, slow heartbeat if nothing is playing
+    delay = None
+    now = time.monotonic()
+    for name, objs in list(web_playouts.items()):
+        for obj in objs:
+            try:
+                if obj.get('status') != 'playing':
+                    continue
+                if delay is None:
+                    delay = webcheck_update_interval
+                total = float(obj.get('total') or 0)
+                if total <= 0:
+                    continue # radio stream without track length
+                remaining = total - float(obj.get('position') or 0) - (now - web_playouts_time.get(name, now))
+                if remaining + webcheck_drift > 0:
+                    delay = min(delay, remaining + webcheck_drift)
+            except Exception as e:
+                if errorlog is True: flexprint('[red]next webcheck delay error: ' + str(e) + '[/red]')
+    if delay is None:
+        return webcheck_update_interval * webcheck_idle_factor
+    return max(delay, 1)
+
+def restart_webcheck_timer(delay):
+    global webcheck_timer
+    try:
+        if webcheck_timer is not None:
+            webcheck_timer.cancel()
+        webcheck_timer = Timer(delay, check_webserver_for_playouts)
+        webcheck_timer.start()
+    except Exception as e:
+        if errorlog is True: flexprint('[red]restart webcheck timer error: ' + str(e) + '[/red]')
+
 def check_webserver_for_playouts():
-    global interrupt_message, fetch_output_time, prepared_displaystr, prepared_vert_strlines, webcheck_timer
+    global interrupt_message, fetch_output_time, prepared_displaystr, prepared_vert_strlines, webcheck_timer, webcheck_polling
 
     try:
         matrix_allowed = display_cover is False and initialization_done is True and not (custom_message != '' and custom_message_option == 'exclusive') and fetch_output_in_progress is False and output_in_progress is True and do_set_zone_control is False
         coverplayer_allowed = display_cover is True and initialization_done is True and fetch_output_in_progress is False and output_in_progress is True
         flexprint('[bold blue]### check_webserver_for_playouts start @ ' + datetime.now().strftime("%H:%M:%S") + ' => matrix_allowed: ' + str(matrix_allowed) + ', coverplayer_allowed: ' + str(coverplayer_allowed) + '[/bold blue]')
+        webcheck_polling = matrix_allowed is True or coverplayer_allowed is True
         if matrix_allowed is True or coverplayer_allowed is True:
             if vertical_output == True:
                 lines = get_playing_apple_or_spotify(webservers_zones,['force>'])
@@ -5852,7 +6481,6 @@ def check_webserver_for_playouts():
             if allowed is True and not (vertical_output == False and displaystr[:6] == 'force>') and not (vertical_output == True and lines[0] == 'force>'):
                 flexprint('webserver playout detected => interrupt message')
                 interrupt_message = True
-                time.sleep(1)
                 if do_set_zone_control is False:
                     clear_display('check_webserver_for_playouts')
                 fetch_output_time = None
@@ -5863,9 +6491,12 @@ def check_webserver_for_playouts():
                     prepared_displaystr = str(prepared_vert_strlines) if len(prepared_vert_strlines) > 0 else ''
                 refresh_output_data()
 
-        webcheck_timer = Timer(webcheck_update_interval, check_webserver_for_playouts) # check webserver playouts in interval of seconds (webcheck_update_interval)
+        delay = next_webcheck_delay()
+        if webcheck_timer is not None and webcheck_timer is not threading.current_thread():
+            webcheck_timer.cancel() # restarted while this check was running, only one timer chain
+        webcheck_timer = Timer(delay, check_webserver_for_playouts) # check webserver playouts after the predicted track end, at the latest in interval of seconds (webcheck_update_interval)
         webcheck_timer.start()
-        flexprint('webserver playout check => timer restart (matrix_allowed: ' + str(matrix_allowed) + ', coverplayer_allowed: ' + str(coverplayer_allowed) + ')')
+        flexprint('webserver playout check => timer restart in ' + str(round(delay, 1)) + ' sec (matrix_allowed: ' + str(matrix_allowed) + ', coverplayer_allowed: ' + str(coverplayer_allowed) + ')')
     except Exception as e:
         if errorlog is True: 
             flexprint('[red]==> check_webserver_for_playouts ERROR: [/red]', str(e))
@@ -5882,7 +6513,6 @@ def force_custom_message():
 
             flexprint('custom message with force option detected => interrupt message')
             interrupt_message = True
-            time.sleep(1)
             if do_set_zone_control is False:
                 clear_display('interrupt playout for custom message')
             fetch_output_time = None
@@ -6280,6 +6910,8 @@ def reconnect_roon_api_if_zone_is_stopped(roon_zones):
             if 'state' in zone and zone["state"] is not None and zone["state"]=='stopped' and 'now_playing' not in zone:
                 stopped_zone_found = True
                 break
+        if stopped_zone_found is True:
+            mark_output_segment_dirty('roon') # no callback for a hanging zone, its cached line could be outdated
         #if stopped_zone_found is True:
         #    flexprint('[red]zone in stopped state found => reconnect roon api[/red]')
         #    roonapi.stop()
@@ -6293,17 +6925,19 @@ def reconnect_roon_api_if_zone_is_stopped(roon_zones):
 
 def init_spotify_connect():
     global spotify_connect
+    if spotify_connect is not None:
+        spotify_connect.stop()
     spotify_connect = None
     if spotify_client_id!='' and spotify_client_secret!='':
         try:
-            spotify_connect = SpotifyConnect(is_app_embedded = is_app_embedded, display_cover = display_cover, log = log, force_ipv4_only = ipv4_only, enable_spotify_connect = enable_spotify_connect, client_id = spotify_client_id, client_secret = spotify_client_secret, spotify_connect_auth_url_callback = spotify_connect_web_auth)
+            spotify_connect = SpotifyConnect(is_app_embedded = is_app_embedded, display_cover = display_cover, log = log, force_ipv4_only = ipv4_only, enable_spotify_connect = enable_spotify_connect, client_id = spotify_client_id, client_secret = spotify_client_secret, spotify_connect_auth_url_callback = spotify_connect_web_auth, cover_prefetch_callback = prefetch_covers, cover_prefetch_count = cover_prefetch_count)
         except Exception as e:
             flexprint("spotify_connect error:", e)
 
 def init_coverplayer():
     if display_cover is True:
         try:
-            Coverplayer.config(coverplayer_lang, webserver_url_request_timeout, display_auto_wakeup)
+            Coverplayer.config(coverplayer_lang, webserver_url_request_timeout, display_auto_wakeup, configs_dir + 'cover_cache/')
             Coverplayer.set_keyboard_codes([row1keyb, row2keyb, row3keyb, row4keyb, row1keyb_shift, row2keyb_shift, row4keyb_shift, row1keyb_alt, row2keyb_alt, row3keyb_alt, row4keyb_alt], alternative_layout)
             Coverplayer.disable_spotify(spotify_client_id=='' or spotify_client_secret=='')
             Coverplayer.disable_applemusic(applemusic_team_id=='' or applemusic_key_id=='' or applemusic_secret_key=='')
@@ -6391,8 +7025,48 @@ def log_startinfo():
         flexprint('=======================================================================================')
         flexprint('')
 
+def get_output_segment(key, max_age=None):
+    # cached output segment of a source, None if it is dirty, too old or caching is not possible (coverplayer needs a full build for its updates)
+    segment = output_segments.get(key)
+    if segment is None or display_cover is True:
+        return None
+    if (datetime.now() - segment['time']).total_seconds() > (max_age or output_segment_max_age):
+        return None
+    return segment
+
+def get_output_segment_generation(key):
+    with output_segment_lock:
+        return output_segment_generations.get(key, 0)
+
+def set_output_segment(key, buildstr, buildlines, generation=None):
+    # generation: of the source when building the segment started, the segment is not stored if the source was marked dirty in the meantime
+    with output_segment_lock:
+        if generation is not None and output_segment_generations.get(key, 0) != generation:
+            flexprint('### ' + key + ' segment changed while building => not cached')
+            return False
+        output_segments[key] = {'str': buildstr, 'lines': list(buildlines), 'time': datetime.now()}
+        return True
+
+def mark_output_segment_dirty(*keys):
+    # mark segments of changed sources dirty (all segments, if called without keys)
+    with output_segment_lock:
+        for key in (keys or set(output_segments.keys()) | set(output_segment_generations.keys())):
+            output_segments.pop(key, None)
+            output_segment_generations[key] = output_segment_generations.get(key, 0) + 1
+
+def append_output_segment(buildstr, buildlines, segment_str, segment_lines):
+    if segment_str != '':
+        if buildstr != '':
+            buildstr += separator
+        buildstr += segment_str
+    if len(segment_lines) > 0:
+        if len(buildlines) > 0:
+            buildlines.append('')
+        buildlines += segment_lines
+    return buildstr, buildlines
+
 def build_output():
-    global callbacks_initialized, prepared_displaystr, prepared_vert_strlines, audio_playing, last_idle_time, roon_servers, roonapi, build_seconds, fetch_output_done, roon_playouts_raw, roon_playouts, last_cover_url, last_cover_text_line_parts, is_playing, is_playing_last, shuffle_on, shuffle_on_last, repeat_on, repeat_on_last, track_id, track_id_last, last_zones_playing, playpos_last, playlen_last, app_displaystr, roon_zones, last_zones_online, upcoming_control_zone
+    global callbacks_initialized, prepared_displaystr, prepared_vert_strlines, audio_playing, last_idle_time, roon_servers, roonapi, build_seconds, fetch_output_done, last_cover_url, last_cover_text_line_parts, is_playing, is_playing_last, shuffle_on, shuffle_on_last, repeat_on, repeat_on_last, track_id, track_id_last, last_zones_playing, playpos_last, playlen_last, app_displaystr, roon_zones, last_zones_online, upcoming_control_zone, output_segment_settings, roon_connected_last
     # global fetch_output_time
 
     try:
@@ -6430,7 +7104,14 @@ def build_output():
     flexprint('')
 
     try:
+        # output is joined from cached segments, only sources marked dirty (by callbacks and timers) are rebuilt
+        segment_settings = (vertical_output, show_zone, show_album, show_vertical_music_label, playing_headline, separator, control_id, led_modules)
+        if output_segment_settings != segment_settings:
+            output_segment_settings = segment_settings
+            mark_output_segment_dirty()
+
         if roon_show == True:
+            # liveness and reconnect checks on each build (roonapi sends no callback if the core disconnects), only the zone lines are cached
             roon_active = is_roon_server_active(core_ip, core_port) if (core_ip != '' and core_port != '') else False
             if core_ip == '' or core_port == '':
                 roon_discover()
@@ -6440,17 +7121,24 @@ def build_output():
             roon_discover_first_test()
 
             flexprint('roon_active: ' + str(roon_active) + ', core_ip: ' + str(core_ip) + ', core_port: ' + str(core_port) + ', roonapi: ' + str(roonapi is not None))
-            if roon_active is True and core_ip != '' and core_port != '' and roonapi is not None:
+            roon_connected = roon_active is True and core_ip != '' and core_port != '' and roonapi is not None
+            if roon_connected is True:
                 update_roon_channels()
                 roon_zones = reconnect_roon_api_if_zone_is_stopped(list(roonapi.zones.values()))
-
+            if roon_connected is False or roon_connected != roon_connected_last:
+                mark_output_segment_dirty('roon') # core is gone or back again
+            roon_connected_last = roon_connected
+
+        roon_generation = get_output_segment_generation('roon')
+        roon_segment = get_output_segment('roon')
+        if roon_show == True and roon_segment is not None:
+            buildstr = roon_segment['str']
+            buildlines = list(roon_segment['lines'])
+            flexprint('### roon segment unchanged => cached output')
+        elif roon_show == True:
+            if roon_connected is True:
                 for zone in roon_zones:
                     state = "Unknown"
-                    artistFiltered = ''
-                    albumFiltered = ''
-                    trackFiltered = ''
-                    image_key = None
-                    shuffle = False
                     
                     if zone["state"] is not None:
                         state = zone["state"] # state variants: loading, playing, paused, stopped, not running
@@ -6464,39 +7152,19 @@ def build_output():
                     if state == "Unknown" or 'now_playing' not in zone:
                         continue
                     else:
-                        playstr = zone["now_playing"]["three_line"]
-                        artist = json.dumps(playstr["line2"],ensure_ascii=False).encode('utf8')
-                        album = json.dumps(playstr["line3"],ensure_ascii=False).encode('utf8')
-                        track = json.dumps(playstr["line1"],ensure_ascii=False).encode('utf8')
+                        zone_state, last_zone_state = reduce_roon_zone(zone) # the subscribers (websocket, led output, Coverplayer) get the event, if roon_state_callback has not processed it already
                         playing = state == "playing"
                         shuffle = zone["settings"]["shuffle"]
                         repeat = zone["settings"]["loop"] != 'disabled'
                         playpos = zone.get("seek_position")
-                        playlen = zone["now_playing"].get("length")                                   
-                        zone_id = zone['zone_id']
-                        set_play_mode(zone_id, state == "playing", False)
-                        set_shuffle_mode(zone_id, shuffle, False)
-                        set_repeat_mode(zone_id, repeat, False)
-
-                        artistFiltered = filterIllegalChars(artist.decode())
-                        albumFiltered = filterIllegalChars(album.decode())
-                        trackFiltered = filterIllegalChars(track.decode())
-
-                        cover_url = ''
-                        image_key = zone["now_playing"].get("image_key")
-                        if image_key:
-                            cover_url = roonapi.get_image(image_key)
+                        playlen = zone["now_playing"].get("length")
+                        cover_url = zone_state.cover or ''
 
+                        # first Coverplayer update (with the callbacks) and updates without a zone event (control zone selected or online again),
+                        # zone changes are already shown by the update_coverplayer_from_roon_zone subscriber
                         if display_cover is True:
                             if control_id is not None and control_id in channels.keys() and zone["display_name"] == channels[control_id]:
-                                cover_text_line_parts = []
-                                cover_text_line_parts.append(get_message('Zone') + ': ' + zone["display_name"])
-                                if artistFiltered != '':
-                                    cover_text_line_parts.append(get_message('Artist') + ': ' + artistFiltered[1:-1] if (len(artistFiltered) > 1 and artistFiltered[0:1]=='"' and artistFiltered[-1:]=='"') else artistFiltered)
-                                if show_album is True and albumFiltered != '':
-                                    cover_text_line_parts.append(get_message('Album') + ': ' + albumFiltered[1:-1] if (len(albumFiltered) > 1 and albumFiltered[0:1]=='"' and albumFiltered[-1:]=='"') else albumFiltered)
-                                if trackFiltered != '':
-                                    cover_text_line_parts.append(get_message('Track') + ': ' + trackFiltered[1:-1] if (len(trackFiltered) > 1 and trackFiltered[0:1]=='"' and trackFiltered[-1:]=='"') else trackFiltered)
+                                cover_text_line_parts = get_roon_cover_text_line_parts(zone["display_name"], zone_state)
 
                                 if ((upcoming_control_zone is not None and control_zone in zones_online and is_active_roon_zone(zone)) or cover_url != last_cover_url or last_cover_text_line_parts != '|'.join(cover_text_line_parts) or playing != is_playing_last or shuffle != shuffle_on_last or repeat != repeat_on_last or track_id != track_id_last):
                                     upcoming_control_zone = None
@@ -6519,13 +7187,6 @@ def build_output():
                                     callbacks_initialized = True
 
                     if zone["display_name"] not in channels.values():
-                        playing = '{"status": "not running"}'
-
-                        if zone["display_name"] not in roon_playouts_raw or roon_playouts_raw[zone["display_name"]] != playing:
-                            roon_playouts_raw[zone["display_name"]] = playing
-                            roon_playouts[zone["display_name"]] = json.loads(playing)
-                            add_changed_data_to_websocket_queue()
-                            flexprint(datetime.now().strftime("%Y-%m-%d %H:%M:%S") + ' => roon_playouts (build output, not running) changed => add to websocket update queue')
                         continue
                     else:
                         flexprint('actual control_id: ' + str(control_id) + ', control_zone: ' + str(control_zone))
@@ -6535,19 +7196,12 @@ def build_output():
                             zone_name = ''
                         zone_name += zone["display_name"]
 
-                        hash_id = hashlib.md5(str((image_key if image_key is not None else '') + artistFiltered + albumFiltered + trackFiltered).encode()).hexdigest()
-                        if cover_url and len(cover_url) > 0:
-                            playing = '{"hash": "' + str(hash_id) + '", "status": "' + str(state) + '", "artist": ' + artistFiltered + ', "album": ' + albumFiltered + ', "track": ' + trackFiltered + ', "shuffle": ' + str(shuffle).lower() + ', "repeat": ' + str(repeat).lower() + ', "position": ' + str(playpos).replace('None','null') + ', "total": ' + str(playlen).replace('None','null') + ', "cover": "' + cover_url + '"}'
-                        else:
-                            playing = '{"hash": "' + str(hash_id) + '", "status": "' + str(state) + '", "artist": ' + artistFiltered + ', "album": ' + albumFiltered + ', "track": ' + trackFiltered + ', "shuffle": ' + str(shuffle).lower() + ', "repeat": ' + str(repeat).lower() + ', "position": ' + str(playpos).replace('None','null') + ', "total": ' + str(playlen).replace('None','null') + '}'
-                        flexprint('### playing: ' + str(playing))
+                        flexprint('### playing: ' + str(zone_state))
 
-                        playing_data_with_position_has_changed = zone["display_name"] not in roon_playouts_raw or compare_filtered_roon_zonedata_is_equal(roon_playouts_raw[zone["display_name"]], playing, False) is False
-                        if playing_data_with_position_has_changed:
-                            roon_playouts_raw[zone["display_name"]] = playing
-                            roon_playouts[zone["display_name"]] = json.loads(playing)
-                            add_changed_data_to_websocket_queue()
-                            flexprint(datetime.now().strftime("%Y-%m-%d %H:%M:%S") + ' => roon_playouts (build output, running) changed => add to websocket update queue')
+                        # led output of the reduced zone state (quoted like the json values)
+                        artistFiltered = json.dumps(zone_state.artist, ensure_ascii=False)
+                        albumFiltered = json.dumps(zone_state.album, ensure_ascii=False)
+                        trackFiltered = json.dumps(zone_state.track, ensure_ascii=False)
 
                         if state == "playing":
                             roonstr = ''
@@ -6562,7 +7216,7 @@ def build_output():
                                 tup = (artistFiltered,albumFiltered,trackFiltered,state)
                             else:
                                 roonstr += get_message('Artist') + ': {} / ' + get_message('Track') + ': {}'
-                                tup = (artist.decode(),trackFiltered,state)
+                                tup = (artistFiltered,trackFiltered,state)
 
                             if buildstr != '':
                                 buildstr += separator
@@ -6576,13 +7230,10 @@ def build_output():
                                 buildlines = vertical_longtext_split_and_append(convert_special_chars(playing_headline),buildlines)
                             if show_zone is True:
                                 zonestr = get_message('Zone') + ': ' + convert_special_chars(zone_name)
+                                w = textsize_width(zonestr, text_font)
                                 if is_raspberry_pi is False or is_app_embedded is True:
-                                    font = CP437_FONT_PROPORTIONAL
-                                    w = textsize_width(zonestr, font)
                                     hw_width = led_modules * 8
                                 else:
-                                    font = proportional(CP437_FONT)
-                                    w, h = textsize(zonestr, font)
                                     hw_width = device.width
                                 if w > hw_width:
                                     buildlines.append(get_message('Zone'))
@@ -6603,11 +7254,23 @@ def build_output():
                             else:
                                 buildlines = vertical_longtext_split_and_append('=> ' + convert_special_chars(trackFiltered).replace('"',''),buildlines)
 
+                set_output_segment('roon', buildstr, buildlines, roon_generation)
+            mark_output_segment_dirty('web') # webserver zones are appended to the roon zones
+
         if webservers_show is True or spotify_connect_enabled() is True:
-            if vertical_output == True:
-                buildlines = get_playing_apple_or_spotify(webservers_zones,buildlines)
+            # webserver changes are only detected by the webserver check timer, the cached segment is used only while it is polling
+            web_generation = get_output_segment_generation('web')
+            web_segment = get_output_segment('web') if webcheck_timer is not None and webcheck_polling is True else None
+            if web_segment is not None:
+                buildstr = web_segment['str']
+                buildlines = list(web_segment['lines'])
+                flexprint('### web segment unchanged => cached output')
             else:
-                buildstr = get_playing_apple_or_spotify(webservers_zones,buildstr)
+                if vertical_output == True:
+                    buildlines = get_playing_apple_or_spotify(webservers_zones,buildlines)
+                else:
+                    buildstr = get_playing_apple_or_spotify(webservers_zones,buildstr)
+                set_output_segment('web', buildstr, buildlines, web_generation)
             flexprint('### buildstr after webserver: ' + buildstr)
 
         if buildstr != '' or len(buildlines) > 0:
@@ -6640,10 +7303,14 @@ def build_output():
             buildlines += weatherlines
 
         if show_nonaudio_content == True and rss_show == True:
-            if vertical_output == True:
-                buildlines = get_rss_feed(buildlines)
-            else:
-                buildstr = get_rss_feed(buildstr)
+            rss_segment = get_output_segment('rss', rss_update_interval)
+            if rss_segment is None:
+                if vertical_output == True:
+                    set_output_segment('rss', '', get_rss_feed([]))
+                else:
+                    set_output_segment('rss', get_rss_feed(''), [])
+                rss_segment = output_segments['rss']
+            buildstr, buildlines = append_output_segment(buildstr, buildlines, rss_segment['str'], rss_segment['lines'])
 
         if show_nonaudio_content == True and datetime_show == True:
             if buildstr != '':
@@ -6694,6 +7361,12 @@ def build_output():
 
 # --- MAIN PART ---
 
+# versioned info state for the websocket clients (updated by callbacks and timers, so it has to exist before they start)
+info_state = InfoStateStore()
+subscribe_roon_zone_state(queue_roon_zone_state_change) # the websocket clients, led output and Coverplayer get each roon zone event once
+subscribe_roon_zone_state(mark_roon_zone_output_dirty)
+subscribe_roon_zone_state(update_coverplayer_from_roon_zone)
+
 # get optional platform property (in-app)
 platform = 'raspberry-pi' if is_raspberry_pi is True else 'unknown'
 if 'platform' in environ:
@@ -6884,6 +7557,7 @@ init_gpio()
 # init LED matrix (roonmatrix device only)
 if display_cover is False and is_raspberry_pi is True:
     device = init_matrix()
+    matrix_renderer = MatrixRenderer(device)
 
 # wait for internet connection
 while True:
@@ -7042,6 +7716,8 @@ try:
             webcheck_timer.cancel()
         if weather_timer is not None:
             weather_timer.cancel()
+        if web_request_loop is not None:
+            web_request_loop.close()
         executor.shutdown(wait=False)
         raise Exception('exit python script')
             
@@ -24,12 +24,52 @@ import logging
 import urllib3
 import spotipy
 import traceback
+import threading
+import time
 from os import environ
 import spotipy.oauth2 as oauth2
+from spotipy.cache_handler import CacheFileHandler, MemoryCacheHandler
+
+class CachedTokenFile(CacheFileHandler):
+    # token cache file which is read only once, the token is kept in memory and written to the file on changes
+    def __init__(self, cache_path):
+        super().__init__(cache_path=cache_path)
+        self.token_info = None
+        self.token_loaded = False
+
+    def get_cached_token(self):
+        if self.token_loaded is False:
+            self.token_info = super().get_cached_token()
+            self.token_loaded = True
+        return self.token_info
+
+    def save_token_to_cache(self, token_info):
+        self.token_info = token_info
+        self.token_loaded = True
+        super().save_token_to_cache(token_info)
 
 class SpotifyConnect:
-    def __init__(self, is_app_embedded = False, display_cover = True, log = True, force_ipv4_only = True, enable_spotify_connect = False, client_id = "", client_secret = "", spotify_connect_auth_url_callback = None):
+    def __init__(self, is_app_embedded = False, display_cover = True, log = True, force_ipv4_only = True, enable_spotify_connect = False, client_id = "", client_secret = "", spotify_connect_auth_url_callback = None, cover_prefetch_callback = None, cover_prefetch_count = 0):
         self.spotify = None
+        self.spotify_lock = threading.Lock()
+        self.token_timer = None # refreshes the token shortly before it expires
+        self.token_failures = 0 # failed background refreshes in a row (exponential backoff)
+        self.token_backoff_max = 900 # max seconds between two failed background refreshes
+        self.stopped = False
+        self.pool_size = 8 # keep-alive connections of the shared session
+        self.cover_prefetch_callback = cover_prefetch_callback # called with the cover urls of the next tracks in the queue
+        self.cover_prefetch_count = cover_prefetch_count # number of next tracks to prefetch the cover for (0: off)
+        self.prefetched_track_id = None
+        self.state_lock = threading.Lock()
+        self.state_time = 0 # time of the last successful playback poll, the position is extrapolated from it
+        self.next_poll_time = 0 # time of the next playback poll (0: expired)
+        self.playback = None # last current_playback result, shared by devices() and current_or_last_played_track()
+        self.recent_item = None # last played track if there is no playback
+        self.device_list = []
+        self.devices_time = 0
+        self.poll_interval = 5 # seconds between two playback polls while playing
+        self.poll_interval_paused = 20 # seconds between two playback polls while paused or inactive
+        self.devices_interval = 60 # seconds between two device list requests (the active device is taken from the playback)
         self.is_app_embedded = is_app_embedded
         self.is_raspberry_pi = self.is_running_on_raspberry_pi()
         self.display_cover = display_cover
@@ -112,6 +152,50 @@ class SpotifyConnect:
             if self.errorlog is True: self.flexprint("[bold red]Spotify Connect Connection test failed:[/bold red]", e)
             return False
     
+    def client(self):
+        # long-lived authenticated client for the searches (auth only if there is no client yet)
+        with self.spotify_lock:
+            if self.spotify is not None:
+                return self.spotify
+            return self.auth()
+
+    def schedule_token_refresh(self):
+        try:
+            if self.token_timer is not None:
+                self.token_timer.cancel()
+                self.token_timer = None
+            if self.stopped is True:
+                return
+            token_info = self.auth_manager.cache_handler.get_cached_token()
+            if not token_info or 'expires_at' not in token_info:
+                return
+            delay = max(token_info['expires_at'] - int(time.time()) - 50, 5) # spotipy refreshes tokens which expire within 60 seconds
+            if self.token_failures > 0:
+                delay = max(delay, min(30 * 2 ** (self.token_failures - 1), self.token_backoff_max)) # revoked refresh token or network down
+            self.token_timer = threading.Timer(delay, self.refresh_token)
+            self.token_timer.daemon = True
+            self.token_timer.start()
+        except Exception as e:
+            if self.errorlog is True: self.flexprint(f"[red]Spotify Connect schedule token refresh error:[/red] {e}")
+
+    def refresh_token(self):
+        # refresh in the background, so a search never waits for the token request
+        try:
+            self.auth_manager.get_access_token(as_dict=False)
+            self.token_failures = 0
+            if self.debug is True: self.flexprint('Spotify Connect token refreshed in background')
+        except Exception as e:
+            self.token_failures += 1
+            if self.errorlog is True: self.flexprint(f"[red]Spotify Connect refresh token error ({self.token_failures}. try):[/red] {e}")
+        self.schedule_token_refresh()
+
+    def stop(self):
+        # stops the background token refresh, called before the instance is replaced
+        self.stopped = True
+        if self.token_timer is not None:
+            self.token_timer.cancel()
+            self.token_timer = None
+
     def auth(self):
         # Initializes Spotipy.
         # - enable_spotify_connect => True: use oAuth2 Spotify Connect, False: use ClientCredentials (read-only access)
@@ -129,7 +213,9 @@ class SpotifyConnect:
 
         session = requests.Session()
         if self.force_ipv4_only:
-            session.mount("https://", IPv4OnlyAdapter())
+            session.mount("https://", IPv4OnlyAdapter(pool_maxsize=self.pool_size))
+        else:
+            session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=self.pool_size))
 
         if self.is_raspberry_pi is True:
             cache_path = "/home/"+ ('coverplayer' if self.display_cover is True else 'rmuser') +"/FTP/.spotify-cache"
@@ -162,7 +248,7 @@ class SpotifyConnect:
                 client_secret=self.client_secret,
                 redirect_uri="http://127.0.0.1:8888/callback",
                 scope=self.scope,
-                cache_path=cache_path,
+                cache_handler=CachedTokenFile(cache_path),
                 open_browser=False,
             )
 
@@ -189,7 +275,8 @@ class SpotifyConnect:
             try:
                 self.auth_manager = oauth2.SpotifyClientCredentials(
                     client_id=self.client_id,
-                    client_secret=self.client_secret
+                    client_secret=self.client_secret,
+                    cache_handler=MemoryCacheHandler()
                 )
                 self.flexprint("[green]Spotify Client Credentials authentication successfully done[/green]")
             except Exception as e:
@@ -197,6 +284,7 @@ class SpotifyConnect:
                 return
 
         self.spotify = spotipy.Spotify(auth_manager=self.auth_manager, requests_session=session)
+        self.schedule_token_refresh()
         return self.spotify
 
     def auth_response(self, redirect_response):
@@ -213,12 +301,53 @@ class SpotifyConnect:
     def get_spotify_connect_auth_state(self):
         return self.spotify_connect_auth_success
 
-    def devices(self):
+    def expire_state(self):
+        # the next caller polls the playback state again (after playback controls)
+        self.next_poll_time = 0
+
+    def next_poll_interval(self, playback):
+        # poll slowly while paused, while playing poll again right after the predicted end of the track
+        if not playback or not playback.get("is_playing") or not playback.get("item"):
+            return self.poll_interval_paused
+        remaining = (playback["item"]["duration_ms"] - (playback.get("progress_ms") or 0)) / 1000
+        return max(min(self.poll_interval, remaining + 0.5), 1)
+
+    def poll_state(self, force = False):
+        # one current_playback request per poll interval, shared by all callers
+        with self.state_lock:
+            now = time.monotonic()
+            if force is False and now < self.next_poll_time:
+                return
+            try:
+                playback = self.spotify.current_playback()
+                if playback and playback.get("item"):
+                    self.recent_item = None
+                else:
+                    recent = self.spotify.current_user_recently_played(limit=1)
+                    self.recent_item = recent["items"][0]["track"] if (recent and recent.get("items")) else None
+                device = playback.get("device") if playback else None
+                known = device is None or any(d['id'] == device.get('id') for d in self.device_list)
+                if force is True or known is False or now - self.devices_time >= self.devices_interval:
+                    devices = self.spotify.devices()
+                    self.device_list = devices.get("devices", []) if "devices" in devices else []
+                    self.devices_time = now
+                else:
+                    for d in self.device_list:
+                        d['is_active'] = device is not None and d['id'] == device.get('id') and device.get('is_active') is True
+                self.playback = playback
+                self.state_time = now
+                self.next_poll_time = now + self.next_poll_interval(playback)
+            except Exception as e:
+                if self.errorlog is True: self.flexprint(f"[red]Spotify Connect poll state error:[/red] {e}")
+                self.next_poll_time = now + self.poll_interval # keep the last state and its time (position extrapolation), try again later
+
+    def devices(self, force = False):
         try:
             if self.spotify is None:
                 return []
-            devices = self.spotify.devices()
-            return devices.get("devices", []) if "devices" in devices else []
+            self.poll_state(force)
+            with self.state_lock:
+                return [dict(d) for d in self.device_list] # copies, callers add their own keys (sourcetype)
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]Spotify Connect devices error:[/red] {e}")
             return []
@@ -227,14 +356,11 @@ class SpotifyConnect:
         try:
             if self.spotify is None:
                 return
+            self.poll_state()
             item = None
-            playback = self.spotify.current_playback()
+            playback = self.playback
             if not playback or not playback.get("item"):
-                recent = self.spotify.current_user_recently_played(limit=1)
-                if not recent or not recent.get("items"):
-                    return None
-                else:
-                    item = recent["items"][0]["track"]
+                item = self.recent_item
             else:
                 item = playback["item"]
             if item is None:
@@ -245,14 +371,40 @@ class SpotifyConnect:
             status = "playing" if (playback is not None and 'is_playing' in playback and playback['is_playing']) else "paused"
             shuffle = "true" if (playback is not None and 'shuffle_state' in playback and playback['shuffle_state']) else "false"
             repeat = "true" if (playback is not None and 'repeat_state' in playback and playback['repeat_state'] != 'off') else "false"
-            position = int(playback['progress_ms'] / 1000) if (playback is not None and 'progress_ms' in playback) else 0
+            position = int(playback['progress_ms'] / 1000) if (playback is not None and playback.get('progress_ms') is not None) else 0
+            if playback is not None and playback.get('is_playing'):
+                position = min(position + int(time.monotonic() - self.state_time), int(item['duration_ms'] / 1000)) # the playback state may be a few seconds old
             total = int(item['duration_ms'] / 1000)
+
+            if playback is not None and item['uri'] != self.prefetched_track_id:
+                self.prefetched_track_id = item['uri']
+                self.prefetch_queue_covers()
         
             return {"zone": "SpotifyConnect", "status": status, "artist": artist, "album": item["album"]["name"], "track": item["name"], "shuffle": shuffle, "repeat": repeat, "position": position, "total": total, "sourcetype": "stream", "id": item['uri'], "cover": cover}
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]Spotify Connect current or last played track error:[/red] {e}")
             return
 
+    def prefetch_queue_covers(self):
+        # the queue is requested once per track change, in the background
+        if self.cover_prefetch_callback is None or self.cover_prefetch_count <= 0 or self.enable_spotify_connect is False:
+            return
+
+        def prefetch():
+            try:
+                queue = self.spotify.queue()
+                urls = []
+                for item in (queue.get("queue") or [])[:self.cover_prefetch_count]:
+                    images = item['album']['images'] if 'album' in item else item.get('images', []) # episodes have no album
+                    if len(images) > 0 and 'url' in images[0]:
+                        urls.append(images[0]['url'])
+                if len(urls) > 0:
+                    self.cover_prefetch_callback(urls)
+            except Exception as e:
+                if self.errorlog is True: self.flexprint(f"[red]Spotify Connect prefetch queue covers error:[/red] {e}")
+
+        threading.Thread(target=prefetch, daemon=True).start()
+
     # playback controls
     def play(self, device_id=None, context_uri=None, uris=None, offset=None):
         try:
@@ -265,6 +417,7 @@ class SpotifyConnect:
                 self.spotify.start_playback(device_id=device_id, context_uri=context_uri, offset=offset)
             else:
                 self.spotify.start_playback(device_id=device_id)
+            self.expire_state()
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]Spotify Connect play error:[/red] {e}")
 
@@ -275,6 +428,7 @@ class SpotifyConnect:
         if device_id is not None:
             try:
                 self.spotify.transfer_playback(device_id = device_id, force_play = force_play)
+                self.expire_state()
             except Exception as e:
                 self.flexprint("Spotify Connect transfer_playback error: " + str(e))
     
@@ -284,6 +438,7 @@ class SpotifyConnect:
         self.flexprint('SpotifyConnect => pause with device_id: ' + str(device_id))
         try:
             self.spotify.pause_playback(device_id=device_id)
+            self.expire_state()
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]Spotify Connect pause error:[/red] {e}")
 
@@ -293,6 +448,7 @@ class SpotifyConnect:
         self.flexprint('SpotifyConnect => next with device_id: ' + str(device_id))
         try:
             self.spotify.next_track(device_id=device_id)
+            self.expire_state()
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]Spotify Connect next error:[/red] {e}")
 
@@ -302,6 +458,7 @@ class SpotifyConnect:
         self.flexprint('SpotifyConnect => previous with device_id: ' + str(device_id))
         try:
             self.spotify.previous_track(device_id=device_id)
+            self.expire_state()
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]Spotify Connect previous error:[/red] {e}")
 
@@ -323,6 +480,7 @@ class SpotifyConnect:
         self.flexprint('SpotifyConnect => shuffle with state: ' + str(state) + ' and device_id: ' + str(device_id))
         try:
             self.spotify.shuffle(state, device_id=device_id)
+            self.expire_state()
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]Spotify Connect shuffle error:[/red] {e}")
 
@@ -333,5 +491,6 @@ class SpotifyConnect:
         self.flexprint('SpotifyConnect => repeat with mode: ' + str(mode) + ' and device_id: ' + str(device_id))
         try:
             self.spotify.repeat(mode, device_id=device_id)
+            self.expire_state()
         except Exception as e:
             if self.errorlog is True: self.flexprint(f"[red]Spotify Connect repeat error:[/red] {e}")
@@ -150,66 +150,73 @@ if debug is True:
     print('DIR: ' + str(DIR))
 
 maxCoverFiles = 50
-coverfiles = [f for f in os.listdir(DIR) if f.startswith('coverAppleMusic_')]
-coverfiles.sort(key=lambda x: os.stat(os.path.join(DIR, x)).st_mtime, reverse=True)
-if (len(coverfiles) > maxCoverFiles):
-    for filename in coverfiles[maxCoverFiles:]:
-        os.remove(os.path.join(DIR, filename))	# remove covers but not a number of newest ones (maxCoverFiles)
-        if debug is True:
-            print('remove cover with filename: ' + str(filename))
-
-return_str = ''
-output_list = []
-if debug is True:
-    print('applescript call now...')
-output = tell_iTunes.call('Playing')
 
-if debug is True:
-    print('applescript called => output: ' + str(output))
-
-for line in output:
-    output = line.split('%-%')
-    zone_name = output[0]
-    status = output[1].encode('utf8')
-    cover = ''
-    if status.decode().startswith('status::'):
-        rmstr = '"zone": "{}", "status": "{}"'
-        tup = (zone_name,status.decode()[8:])
-    else:   
-        artist = output[2].encode('utf8')
-        album = output[3].encode('utf8')
-        track = output[4].encode('utf8')
-        shuffle = output[5].encode('utf8')
-        repeat = output[6].encode('utf8')
-        position = output[7].encode('utf8')
-        total = output[8].encode('utf8')
-        sourcetype = output[9].encode('utf8')
-        songId = output[10]
-        
-        if len(output) > 11 and output[11]!='':
-            if zone_name.startswith('Spotify'):
-                if output[11].startswith('http') is False:
-                    cover = ''
+def remove_old_covers():
+    coverfiles = [f for f in os.listdir(DIR) if f.startswith('coverAppleMusic_')]
+    coverfiles.sort(key=lambda x: os.stat(os.path.join(DIR, x)).st_mtime, reverse=True)
+    if (len(coverfiles) > maxCoverFiles):
+        for filename in coverfiles[maxCoverFiles:]:
+            os.remove(os.path.join(DIR, filename))	# remove covers but not a number of newest ones (maxCoverFiles)
+            if debug is True:
+                print('remove cover with filename: ' + str(filename))
+
+def get_playing():
+    # list of playout objects (one for Apple Music and one for Spotify), used by this script and by now_playing_agent.py
+    remove_old_covers()
+
+    playing = []
+    if debug is True:
+        print('applescript call now...')
+    output = tell_iTunes.call('Playing')
+
+    if debug is True:
+        print('applescript called => output: ' + str(output))
+
+    for line in output:
+        output = line.split('%-%')
+        zone_name = output[0]
+        status = output[1].encode('utf8')
+        cover = ''
+        if status.decode().startswith('status::'):
+            playing.append({"zone": zone_name, "status": status.decode()[8:]})
+        else:   
+            artist = output[2].encode('utf8')
+            album = output[3].encode('utf8')
+            track = output[4].encode('utf8')
+            shuffle = output[5].encode('utf8')
+            repeat = output[6].encode('utf8')
+            position = output[7].encode('utf8')
+            total = output[8].encode('utf8')
+            sourcetype = output[9].encode('utf8')
+            songId = output[10]
+            
+            if len(output) > 11 and output[11]!='':
+                if zone_name.startswith('Spotify'):
+                    if output[11].startswith('http') is False:
+                        cover = ''
+                    else:
+                        cover = output[11].encode('utf8')
                 else:
-                    cover = output[11].encode('utf8')
-            else:
-                filename = output[11].replace(':','')
-                if os.path.exists(DIR + filename):
-                    fnparts = filename.rsplit('.',1)
-                    stringToHash = artist.decode() + '-' + album.decode() + '-' + track.decode()
-                    hash = hashlib.md5(stringToHash.encode('utf8'))
-                    newFilename = fnparts[0] + '_' + hash.hexdigest() + '.' + fnparts[1]
-                    if os.path.exists(DIR + newFilename) is False:
-                        os.rename(DIR + filename, DIR + newFilename)
-                    cover = ('covers/' + newFilename).encode('utf8')
-
-        if cover!='':
-            rmstr = '"zone": "{}", "status": "{}", "artist": "{}", "album": "{}", "track": "{}", "shuffle": "{}", "repeat": "{}", "position": "{}", "total": "{}", "sourcetype": "{}", "id": "{}", "cover": "{}"'
-            tup = (zone_name,status.decode(),artist.decode(),album.decode(),track.decode(),shuffle.decode(),repeat.decode(),position.decode(),total.decode(),sourcetype.decode(),songId,cover.decode())
-        else:
-            rmstr = '"zone": "{}", "status": "{}", "artist": "{}", "album": "{}", "track": "{}", "shuffle": "{}", "repeat": "{}", "position": "{}", "total": "{}", "sourcetype": "{}", "id": "{}"'
-            tup = (zone_name,status.decode(),artist.decode(),album.decode(),track.decode(),shuffle.decode(),repeat.decode(),position.decode(),total.decode(),sourcetype.decode(),songId)
-        
-    output_list.append('{' + rmstr.format(*tup) + '}')
-return_str = ','.join(output_list)
-print('[' + return_str + ']')
+                    filename = output[11].replace(':','')
+                    if os.path.exists(DIR + filename):
+                        fnparts = filename.rsplit('.',1)
+                        stringToHash = artist.decode() + '-' + album.decode() + '-' + track.decode()
+                        hash = hashlib.md5(stringToHash.encode('utf8'))
+                        newFilename = fnparts[0] + '_' + hash.hexdigest() + '.' + fnparts[1]
+                        if os.path.exists(DIR + newFilename) is False:
+                            os.rename(DIR + filename, DIR + newFilename)
+                        cover = ('covers/' + newFilename).encode('utf8')
+
+            obj = {"zone": zone_name, "status": status.decode(), "artist": artist.decode(), "album": album.decode(), "track": track.decode(), "shuffle": shuffle.decode(), "repeat": repeat.decode(), "position": position.decode(), "total": total.decode(), "sourcetype": sourcetype.decode(), "id": songId}
+            if cover!='':
+                obj["cover"] = cover.decode()
+            playing.append(obj)
+    return playing
+
+if __name__ == '__main__':
+    # values are written unescaped, the php script escapes double quotes inside of values itself
+    output_list = []
+    for obj in get_playing():
+        output_list.append('{' + ', '.join(['"{}": "{}"'.format(key, value) for key, value in obj.items()]) + '}')
+    return_str = ','.join(output_list)
+    print('[' + return_str + ']')
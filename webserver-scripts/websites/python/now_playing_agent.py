@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+__author__  = 'Stephan Wilhelm @2026'
+__doc__     = '''
+Long running agent which pushes the track information of Apple Music and Spotify to one or more roonmatrix devices,
+instead of the devices polling now_playing.php (which starts python and applescript on every request)
+
+The applescript of now_playing.py is compiled only once, the players are watched by their distributed notifications,
+and every state change is sent to the device endpoint /now_playing/ (REST server of the device, port 8000).
+As heartbeat the state is sent again every --interval seconds (keeps the device from polling this webserver zone).
+
+start it from the roonmatrix website folder (it saves the covers to the covers subfolder, like now_playing.php):
+cd ~/websites/roonmatrix && python ~/websites/python/now_playing_agent.py --name MyComputer --device http://roonmatrix.local:8000
+
+--name must be the same as the name of this webserver zone in the roonmatrix config ([WEBSERVERS] zones)
+'''
+
+import argparse
+import json
+import os
+import sys
+import time
+from urllib.request import Request, urlopen
+
+from Foundation import NSDistributedNotificationCenter, NSObject, NSRunLoop, NSDate # pyobjc, required by py-applescript too
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import now_playing
+
+player_notifications = [
+    'com.apple.Music.playerInfo',
+    'com.spotify.client.PlaybackStateChanged'
+]
+
+class NowPlayingAgent(NSObject):
+    def initWithName_devices_timeout_(self, name, devices, timeout):
+        self = self.init()
+        self.name = name
+        self.devices = devices
+        self.timeout = timeout
+        self.last_state = None
+        self.last_push = 0
+        return self
+
+    def playerInfoChanged_(self, notification):
+        self.push(False)
+
+    def push(self, heartbeat):
+        try:
+            playing = now_playing.get_playing()
+        except Exception as e:
+            print('applescript error: ' + str(e))
+            return
+
+        state = json.dumps([{k: v for k, v in obj.items() if k != 'position'} for obj in playing]) # position is sent with state changes and heartbeats only
+        if heartbeat is False and state == self.last_state:
+            return
+        self.last_state = state
+        self.last_push = time.time()
+
+        payload = json.dumps({"name": self.name, "playing": playing}).encode('utf8')
+        for device in self.devices:
+            try:
+                req = Request(device.rstrip('/') + '/now_playing/', data=payload, headers={'Content-Type': 'application/json'})
+                urlopen(req, timeout=self.timeout).read()
+            except Exception as e:
+                print('push to device ' + device + ' failed: ' + str(e))
+
+def main():
+    parser = argparse.ArgumentParser(description='push now playing state of Apple Music and Spotify to roonmatrix devices')
+    parser.add_argument('--name', required=True, help='name of this webserver zone in the roonmatrix config')
+    parser.add_argument('--device', required=True, action='append', help='url of the roonmatrix device REST server, e.g. http://roonmatrix.local:8000 (repeat for more devices)')
+    parser.add_argument('--interval', type=int, default=30, help='seconds between two heartbeats (default: 30)')
+    parser.add_argument('--timeout', type=int, default=3, help='request timeout in seconds (default: 3)')
+    args = parser.parse_args()
+
+    agent = NowPlayingAgent.alloc().initWithName_devices_timeout_(args.name, args.device, args.timeout)
+    center = NSDistributedNotificationCenter.defaultCenter()
+    for notification in player_notifications:
+        center.addObserver_selector_name_object_(agent, 'playerInfoChanged:', notification, None)
+
+    agent.push(True)
+    while True:
+        NSRunLoop.currentRunLoop().runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(1))
+        if time.time() - agent.last_push >= args.interval:
+            agent.push(True)
+
+if __name__ == '__main__':
+    main()